@@ -1,10 +1,10 @@
-import boto3
 import os
 import json
 def get_s3_client():
     """
     Returns a boto3 S3 client. Uses LocalStack if USE_LOCALSTACK=1 is set in the environment.
     """
+    import boto3  # deferred: boto3 is slow to import and only needed for uploads
     if os.environ.get('USE_LOCALSTACK') == '1':
         return boto3.client(
             's3',
@@ -16,12 +16,14 @@ def get_s3_client():
     else:
         return boto3.client('s3')
 from PySide6.QtWidgets import (
-    QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSpacerItem, QSizePolicy, QGridLayout, QScrollArea, QDialog, QDialogButtonBox, QMessageBox
+    QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSpacerItem, QSizePolicy, QDialog, QDialogButtonBox, QMessageBox, QMenu
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QResizeEvent
-from Project.project_card import ProjectCard
+from PySide6.QtGui import QPixmap
+from HomePageFolder.project_grid import ProjectGridView
 from Project.project_page import ProjectPage
+from Project.portfolio_catalog import list_projects, update_project
+from config.status import STATUS_OPTIONS
 
 class NewProjectDialog(QDialog):
     def __init__(self, parent=None):
@@ -121,6 +123,26 @@ class HomePage(QWidget):
         search_box.setPlaceholderText("Search projects")
         search_box.setMaximumWidth(200)
 
+        # Sort and filter work on the portfolio catalog, no project files are read
+        self.sort_key = "name"
+        self.sort_descending = False
+        self.status_filter = None
+        self.search_text = ""
+        sort_menu = QMenu(sort_btn)
+        for label, key, descending in [("Name", "name", False),
+                                       ("Last modified", "last_modified", True),
+                                       ("Open findings", "open_findings", True),
+                                       ("Elevations", "elevations", True)]:
+            sort_menu.addAction(label, lambda key=key, descending=descending: self.set_sort(key, descending))
+        sort_btn.setMenu(sort_menu)
+        filter_menu = QMenu(filter_btn)
+        filter_menu.addAction("All projects", lambda: self.set_status_filter(None))
+        filter_menu.addSeparator()
+        for status in STATUS_OPTIONS:
+            filter_menu.addAction(f"With '{status}' findings", lambda status=status: self.set_status_filter(status))
+        filter_btn.setMenu(filter_menu)
+        search_box.textChanged.connect(self.set_search_text)
+
         top_layout.addWidget(new_project_btn)
         top_layout.addWidget(generate_reports_btn)
         top_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -128,22 +150,9 @@ class HomePage(QWidget):
         top_layout.addWidget(filter_btn)
         top_layout.addWidget(search_box)
 
-        # --- Project grid area with side margins ---
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        grid_outer = QWidget()
-        grid_outer_layout = QHBoxLayout(grid_outer)
-        grid_outer_layout.setContentsMargins(40, 0, 40, 0)  # 40px margin left/right, adjust as needed
-
-        grid_container = QWidget()
-        self.grid_layout = QGridLayout(grid_container)
-        self.grid_layout.setSpacing(24)
-        self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.grid_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        grid_container.setLayout(self.grid_layout)
-
-        grid_outer_layout.addWidget(grid_container)
-        scroll.setWidget(grid_outer)
+        # --- Project grid area (virtualized, side margins are part of the view) ---
+        self.grid_view = ProjectGridView()
+        self.grid_view.project_clicked.connect(self.open_project_page)
 
         # Store project data (not widgets)
         self.projects = []
@@ -153,7 +162,7 @@ class HomePage(QWidget):
         # --- Assemble main layout ---
         main_layout.addWidget(header_widget)
         main_layout.addWidget(top_widget)
-        main_layout.addWidget(scroll, 1)
+        main_layout.addWidget(self.grid_view, 1)
         main_layout.setStretch(0, 0)
         main_layout.setStretch(1, 0)
         main_layout.setStretch(2, 1)
@@ -161,39 +170,36 @@ class HomePage(QWidget):
         new_project_btn.clicked.connect(self.handle_new_project)
 
     def showEvent(self, event):
-        # Reload projects from disk every time the homepage is shown
-        self.projects = []
+        # Reload projects from the catalog every time the homepage is shown; loading it
+        # picks up project folders added, changed or removed outside the app
         self.load_projects_from_storage()
         self.refresh_grid()
         super().showEvent(event)
 
     def load_projects_from_storage(self):
-        storage_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'storage'))
-        if not os.path.exists(storage_dir):
-            return
-        for foldername in os.listdir(storage_dir):
-            folder_path = os.path.join(storage_dir, foldername)
-            if os.path.isdir(folder_path):
-                project_json = os.path.join(folder_path, "project.json")
-                if os.path.exists(project_json):
-                    try:
-                        with open(project_json) as f:
-                            project_data = json.load(f)
-                        name = project_data.get('name', foldername)
-                        subtitle = project_data.get('subtitle', '')
-                        members = project_data.get('members', 0)
-                        code = project_data.get('subtitle', '') or project_data.get('code', '')
-                        file_path = project_json
-                        self.projects.append({
-                            "name": name,
-                            "subtitle": subtitle,
-                            "members": members,
-                            "code": code,
-                            "file_path": file_path,
-                            "folder": folder_path
-                        })
-                    except Exception as e:
-                        print(f"[WARN] Could not load project {foldername}: {e}")
+        # One read of the portfolio catalog (see Project/portfolio_catalog.py)
+        try:
+            self.projects = list_projects(self.search_text, self.sort_key,
+                                          self.sort_descending, self.status_filter)
+        except Exception as e:
+            print(f"[WARN] Could not load portfolio catalog: {e}")
+            self.projects = []
+
+    def set_sort(self, key, descending=False):
+        self.sort_key = key
+        self.sort_descending = descending
+        self.load_projects_from_storage()
+        self.refresh_grid()
+
+    def set_status_filter(self, status):
+        self.status_filter = status
+        self.load_projects_from_storage()
+        self.refresh_grid()
+
+    def set_search_text(self, text):
+        self.search_text = text
+        self.load_projects_from_storage()
+        self.refresh_grid()
 
     def handle_new_project(self):
         dialog = NewProjectDialog(self)
@@ -216,6 +222,7 @@ class HomePage(QWidget):
             }
             with open(local_path, 'w') as f:
                 json.dump(project_data, f, indent=2)
+            update_project(project_folder)
             # Add to UI
             self.add_project_card(name, code, 0)
             # Upload project.json to S3 (bucket must exist)
@@ -243,31 +250,8 @@ class HomePage(QWidget):
         self.refresh_grid()
 
     def refresh_grid(self):
-        # Remove all widgets from the grid
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-
-        grid_width = self.grid_layout.geometry().width() or self.width()
-        card_width = 260 + 24
-        columns = max(1, (grid_width // card_width))
-
-        for idx, proj in enumerate(self.projects):
-            row = idx // columns
-            col = idx % columns
-            # Pass the full project dict to ProjectCard and connect with full data
-            card = ProjectCard(
-                proj["name"],
-                proj["subtitle"],
-                proj["members"],
-                proj.get("code", "")
-            )
-            # Attach the full project dict to the card for click events
-            card.project_data = proj
-            card.project_clicked.connect(self.open_project_page)
-            self.grid_layout.addWidget(card, row, col)
+        # Cards are created lazily by the grid view for the visible projects only
+        self.grid_view.model().set_projects(self.projects)
 
     def open_project_page(self, project_data):
         # Always reload project.json from disk to ensure elevations are up to date
@@ -292,7 +276,3 @@ class HomePage(QWidget):
             if hasattr(mw, "show_homepage"):
                 project_page.back_to_home.connect(mw.show_homepage)
             mw.setCentralWidget(project_page)
-
-    def resizeEvent(self, event: QResizeEvent):
-        super().resizeEvent(event)
-        self.refresh_grid()
\ No newline at end of file
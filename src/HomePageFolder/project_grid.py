@@ -0,0 +1,168 @@
+"""
+Virtualized project grid for the HomePage.
+
+ProjectListModel holds the project dicts; ProjectGridView lays the cards out
+with the same flow geometry as layout/flowlayout.py (cards have one fixed
+size, so a card's position follows from its index). Only the cards in view
+exist: they are kept in a pool and reused for other projects while
+scrolling, and resizing only moves them, after a short debounce.
+"""
+
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QPoint, QSize, QTimer
+from PySide6.QtWidgets import QAbstractScrollArea
+from Project.project_card import ProjectCard
+from layout.flowlayout import uniform_flow_columns, uniform_flow_rect, uniform_flow_height
+
+PROJECT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+CARD_SIZE = QSize(260, 100)
+CARD_SPACING = 24
+SIDE_MARGIN = 40
+RESIZE_DEBOUNCE_MS = 60
+
+
+class ProjectListModel(QAbstractListModel):
+    """Project dicts as shown on the HomePage"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._projects = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._projects)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._projects):
+            return None
+        project = self._projects[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return project.get("name", "")
+        if role == PROJECT_ROLE:
+            return project
+        return None
+
+    def set_projects(self, projects):
+        self.beginResetModel()
+        self._projects = list(projects)
+        self.endResetModel()
+
+    def append_project(self, project):
+        row = len(self._projects)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._projects.append(project)
+        self.endInsertRows()
+
+    def project_at(self, row):
+        return self._projects[row]
+
+
+class ProjectGridView(QAbstractScrollArea):
+    """Scrollable flow grid of ProjectCards that only creates the visible cards"""
+    project_clicked = Signal(dict)
+
+    def __init__(self, model=None, parent=None):
+        super().__init__(parent)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QAbstractScrollArea.Shape.NoFrame)
+        self.verticalScrollBar().setSingleStep(CARD_SIZE.height() // 2)
+        self.verticalScrollBar().valueChanged.connect(self._update_cards)
+        self._columns = 1
+        self._visible = {}  # row -> ProjectCard
+        self._pool = []  # hidden cards ready for reuse
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self._resize_timer.timeout.connect(self.relayout)
+        self._model = None
+        self.setModel(model or ProjectListModel(self))
+
+    def model(self):
+        return self._model
+
+    def setModel(self, model):
+        if self._model is not None:
+            self._model.modelReset.disconnect(self._on_model_reset)
+            self._model.rowsInserted.disconnect(self._on_model_reset)
+            self._model.rowsRemoved.disconnect(self._on_model_reset)
+            self._model.dataChanged.disconnect(self._on_model_reset)
+        self._model = model
+        model.modelReset.connect(self._on_model_reset)
+        model.rowsInserted.connect(self._on_model_reset)
+        model.rowsRemoved.connect(self._on_model_reset)
+        model.dataChanged.connect(self._on_model_reset)
+        self._on_model_reset()
+
+    # --- geometry ---
+    def _origin(self):
+        return QPoint(SIDE_MARGIN, 0)
+
+    def relayout(self):
+        """Recompute columns and scroll range for the current width, then place cards"""
+        width = max(0, self.viewport().width() - 2 * SIDE_MARGIN)
+        self._columns = uniform_flow_columns(width, CARD_SIZE.width(), CARD_SPACING)
+        content_height = uniform_flow_height(self._model.rowCount(), self._columns,
+                                             CARD_SIZE.height(), CARD_SPACING)
+        bar = self.verticalScrollBar()
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(0, content_height - self.viewport().height()))
+        self._update_cards()
+
+    def _visible_rows(self):
+        count = self._model.rowCount()
+        if count == 0:
+            return range(0)
+        row_height = CARD_SIZE.height() + CARD_SPACING
+        top = self.verticalScrollBar().value()
+        first_line = max(0, top // row_height)
+        last_line = (top + self.viewport().height()) // row_height
+        return range(first_line * self._columns, min(count, (last_line + 1) * self._columns))
+
+    def _update_cards(self, *args):
+        rows = self._visible_rows()
+        # Recycle cards that scrolled out of view
+        for row in [row for row in self._visible if row not in rows]:
+            card = self._visible.pop(row)
+            card.hide()
+            self._pool.append(card)
+        offset = self.verticalScrollBar().value()
+        for row in rows:
+            card = self._visible.get(row)
+            if card is None:
+                card = self._take_card()
+                card.set_project(self._model.project_at(row))
+                self._visible[row] = card
+            rect = uniform_flow_rect(row, self._columns, CARD_SIZE, CARD_SPACING, self._origin())
+            card.move(rect.x(), rect.y() - offset)
+            card.show()
+
+    def _take_card(self):
+        if self._pool:
+            return self._pool.pop()
+        card = ProjectCard("", parent=self.viewport())
+        card.project_clicked.connect(self.project_clicked)
+        return card
+
+    def _on_model_reset(self, *args):
+        # Rows may now show other projects: give every visible card back to the pool
+        for card in self._visible.values():
+            card.hide()
+            self._pool.append(card)
+        self._visible.clear()
+        self.relayout()
+
+    # --- events ---
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.oldSize().width() == event.size().width():
+            # Height only: no reflow, just fill the newly exposed area
+            self.relayout()
+        else:
+            self._resize_timer.start()
+
+    def scrollContentsBy(self, dx, dy):
+        # Cards are positioned in _update_cards, driven by the scroll bar
+        pass
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.relayout()
@@ -8,6 +8,7 @@ import json
 import shutil
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from Project.models import ChatMessage
 
 class ChatDataManager:
     def __init__(self, project_name: str):
@@ -45,6 +46,8 @@ class ChatDataManager:
         try:
             with open(chat_file, 'w', encoding='utf-8') as f:
                 json.dump(chat_messages, f, indent=2, ensure_ascii=False, default=str)
+            from Project.derived_writer import get_derived_writer
+            get_derived_writer().schedule_chat(self.project_name, pin_id, chat_messages)
             print(f"[INFO] Saved chat data for pin {pin_id}")
             return True
         except Exception as e:
@@ -55,15 +58,15 @@ class ChatDataManager:
         """Add a text message to pin's chat"""
         chat_messages = self.load_pin_chat(pin_id)
         
-        new_message = {
-            "type": "text",
-            "text": message,
-            "author": author,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        new_message = ChatMessage(
+            type="text",
+            text=message,
+            author=author,
+            timestamp=datetime.now().isoformat(),
+            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
         
-        chat_messages.append(new_message)
+        chat_messages.append(new_message.to_dict())
         return self.save_pin_chat(pin_id, chat_messages)
     
     def add_photo_message(self, pin_id: int, photo_path: str, caption: str = "", author: str = "User") -> Optional[str]:
@@ -89,18 +92,18 @@ class ChatDataManager:
             # Add to chat messages
             chat_messages = self.load_pin_chat(pin_id)
             
-            new_message = {
-                "type": "photo",
-                "path": new_photo_path,
-                "original_path": photo_path,
-                "filename": new_filename,
-                "caption": caption,
-                "author": author,
-                "timestamp": datetime.now().isoformat(),
-                "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            new_message = ChatMessage(
+                type="photo",
+                path=new_photo_path,
+                original_path=photo_path,
+                filename=new_filename,
+                caption=caption,
+                author=author,
+                timestamp=datetime.now().isoformat(),
+                date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            )
             
-            chat_messages.append(new_message)
+            chat_messages.append(new_message.to_dict())
             
             if self.save_pin_chat(pin_id, chat_messages):
                 return new_photo_path
@@ -195,14 +198,14 @@ class ChatDataManager:
                 for msg in existing_chat:
                     if isinstance(msg, str):
                         # Old format: just text strings
-                        new_chat_messages.append({
-                            "type": "text",
-                            "text": msg,
-                            "author": "User",
-                            "timestamp": datetime.now().isoformat(),
-                            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "migrated": True
-                        })
+                        new_chat_messages.append(ChatMessage(
+                            type="text",
+                            text=msg,
+                            author="User",
+                            timestamp=datetime.now().isoformat(),
+                            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            extra={"migrated": True}
+                        ).to_dict())
                     elif isinstance(msg, dict):
                         # Already in new format or partial format
                         if 'type' not in msg:
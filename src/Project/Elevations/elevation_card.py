@@ -2,9 +2,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtCore import Qt, Signal
 from styles import ELEVATION_CARD_STYLE
-
-# For PDF preview
-import fitz  # PyMuPDF
+from Project.thumbnails import get_thumbnail, ELEVATION_THUMBNAIL_SIZE
 
 
 class ElevationCard(QWidget):
@@ -24,11 +22,17 @@ class ElevationCard(QWidget):
         preview.setFixedHeight(110)
         if preview_path and isinstance(preview_path, str):
             ext = preview_path.lower().split('.')[-1]
+            # Pre-rendered preview of the drawing (see Project/thumbnails.py)
+            thumbnail = get_thumbnail(preview_path, ELEVATION_THUMBNAIL_SIZE) if ext == 'pdf' else None
             if ext in ('png', 'jpg', 'jpeg'):
                 pixmap = QPixmap(preview_path).scaled(200, 110, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                 preview.setPixmap(pixmap)
+            elif thumbnail:
+                pixmap = QPixmap(thumbnail).scaled(200, 110, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                preview.setPixmap(pixmap)
             elif ext == 'pdf':
                 try:
+                    import fitz  # PyMuPDF, imported on first use to keep startup fast
                     doc = fitz.open(preview_path)
                     if doc.page_count > 0:
                         page = doc.load_page(0)
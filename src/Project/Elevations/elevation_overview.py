@@ -1,18 +1,20 @@
 from json import tool
 from config.status import STATUS_COLORS
 from Templates.template_loader import get_template_loader, load_default_template_if_needed
-from PySide6.QtCore import Signal, QPointF, Qt, QPoint, QSize, QRect, QLineF
+from PySide6.QtCore import Signal, QPointF, Qt, QPoint, QSize, QRect, QRectF, QLineF
 from PySide6.QtWidgets import (
     QDialog, QLineEdit, QTextEdit, QComboBox, QDialogButtonBox, QFormLayout,
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QFrame, QSizePolicy,
     QMenu, QListWidget, QListWidgetItem, QFileDialog
 )
 from PySide6.QtGui import QPixmap, QImage, QPainter, QColor, QIcon, QAction, QPen
-import fitz  # PyMuPDF
 from Project.Elevations.finding_card import FindingCard
 from Project.Elevations.findings_logic import add_pin_to_master_findings
 from Project.master_findings import add_finding_from_pin
 from Project.Elevations.chat_data_manager import ChatDataManager
+from Project.Elevations.pin_collection import PinCollection
+from Project.annotations import AnnotationStore, ShapeGridIndex
+from Project.models import Point
 
 from PySide6.QtCore import Signal
 
@@ -21,83 +23,30 @@ class ElevationOverviewWidget(QWidget):
     back_to_project = Signal()  # Signal to notify when back button is pressed
 
 
-    def __init__(self, pdf_path=None, findings=None, sidebar=None, parent=None, project_name=None, elevation_name=None):
+    def __init__(self, pdf_path=None, findings=None, sidebar=None, parent=None, project_name=None, elevation_name=None, elevation_id=None):
         super().__init__(parent)
         self.pdf_path = pdf_path
         self.project_name = project_name  # Store project name for pin persistence
         self.elevation_name = elevation_name  # Store elevation name for proper pin filtering
+        self.elevation_id = elevation_id  # Stable id from project.json, stamped on new pins
         
         # Initialize chat data manager
         if self.project_name:
             self.chat_manager = ChatDataManager(self.project_name)
         else:
             self.chat_manager = None
-        # --- Load pins from pins.json using findings_logic ---
+        # --- Load this elevation's pins using findings_logic ---
         try:
-            from Project.Elevations.findings_logic import load_pins
-            all_pins = load_pins(self.project_name)
-            # Filter pins to only show those for the current elevation
+            from Project.Elevations.findings_logic import load_elevation_pins
             import os
             # Use provided elevation_name if available, otherwise fall back to PDF basename
             current_elevation = self.elevation_name if self.elevation_name else (os.path.basename(self.pdf_path) if self.pdf_path else "Unknown Elevation")
-            current_pdf_path = self.pdf_path
             print(f"[DEBUG] Current elevation: '{current_elevation}'")
-            print(f"[DEBUG] PDF path: '{current_pdf_path}'")
-            print(f"[DEBUG] All pins: {[(pin.get('name'), repr(pin.get('elevation'))) for pin in all_pins]}")
-            
-            # Enhanced filtering with better matching logic
-            filtered_pins = []
-            for pin in all_pins:
-                pin_elevation = pin.get('elevation', '').strip()
-                
-                # Normalize names for comparison (remove extension, case insensitive, trim)
-                def normalize_name(name):
-                    if not name:
-                        return ""
-                    # Remove file extension, convert to lowercase, strip whitespace
-                    name_clean = os.path.splitext(os.path.basename(name))[0].lower().strip()
-                    return name_clean
-                
-                pin_elevation_normalized = normalize_name(pin_elevation)
-                current_elevation_normalized = normalize_name(current_elevation)
-                
-                matches = False
-                match_reason = ""
-                
-                # 1. Normalized name match (most robust)
-                if pin_elevation_normalized == current_elevation_normalized and pin_elevation_normalized:
-                    matches = True
-                    match_reason = f"normalized match: '{pin_elevation_normalized}'"
-                
-                # 2. Exact elevation name match (case sensitive)
-                elif pin_elevation == current_elevation:
-                    matches = True
-                    match_reason = f"exact match: '{pin_elevation}'"
-                
-                # 3. Full PDF path match (if pin stores full path)
-                elif pin_elevation == current_pdf_path:
-                    matches = True
-                    match_reason = f"full path match: '{pin_elevation}'"
-                
-                # 4. Basename match
-                elif os.path.basename(pin_elevation) == current_elevation:
-                    matches = True
-                    match_reason = f"basename match: '{os.path.basename(pin_elevation)}'"
-                
-                if matches:
-                    filtered_pins.append(pin)
-                    print(f"[DEBUG] Pin '{pin.get('name')}' MATCHES - {match_reason}")
-                else:
-                    print(f"[DEBUG] Pin '{pin.get('name')}' NO MATCH: pin='{pin_elevation}' ({pin_elevation_normalized}) vs current='{current_elevation}' ({current_elevation_normalized})")
-            
-            self.findings = filtered_pins  # Load findings from stored pins
+            print(f"[DEBUG] PDF path: '{self.pdf_path}'")
+            # Only this elevation's partition is read, no per-pin name matching
+            self.findings = load_elevation_pins(self.project_name, current_elevation, self.pdf_path,
+                                                self.elevation_id)
             print(f"[DEBUG] Final filtered findings: {[pin.get('name') for pin in self.findings]}")
-            
-            # If no pins match elevation filtering, show all pins for debugging (in development)
-            if len(filtered_pins) == 0 and len(all_pins) > 0:
-                print(f"[DEBUG] No pins matched elevation filter, showing all {len(all_pins)} pins for debugging")
-                self.findings = all_pins  # Show all pins for debugging
-                
         except Exception as e:
             print(f"[ERROR] Failed to load pins: {e}")
             self.findings = []
@@ -128,31 +77,33 @@ class ElevationOverviewWidget(QWidget):
         main_layout.addWidget(self.toolbar)
 
         # --- Center: PDF Viewer with pin/draw overlay ---
-        self.pdf_viewer = PDFPinViewer(self.pdf_path, chat_manager=self.chat_manager)
+        from Project.Elevations.pin_scene_viewer import PDFPinSceneViewer, scene_viewer_enabled
+        viewer_class = PDFPinSceneViewer if scene_viewer_enabled() else PDFPinViewer
+        self.pdf_viewer = viewer_class(self.pdf_path, chat_manager=self.chat_manager)
         self.pdf_viewer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.pdf_viewer.pin_created.connect(self.on_pin_created)
         self.pdf_viewer.pin_updated.connect(self.on_pin_updated)
-        # Pass loaded pins to PDFPinViewer
-        # Convert pin['pos'] dicts to QPointF for PDFPinViewer
-        from PySide6.QtCore import QPointF
-        def dict_to_qpointf(pos):
-            if isinstance(pos, dict) and 'x' in pos and 'y' in pos:
-                return QPointF(pos['x'], pos['y'])
-            return pos
+        # Pass loaded pins to PDFPinViewer (positions are Points, read with pos.x()/pos.y())
+        from Project.models import point_xy, with_points
         # Filter out duplicate pins (same pos and elevation)
         unique_pins = []
         seen = set()
         for pin in self.findings:
-            pos = pin.get('pos')
-            elevation = pin.get('elevation')
-            key = (round(pos.x(), 6) if hasattr(pos, 'x') else pos['x'], round(pos.y(), 6) if hasattr(pos, 'y') else pos['y'], elevation)
+            x, y = point_xy(pin.get('pos'))
+            key = (round(x, 6), round(y, 6), pin.get('elevation'))
             if key not in seen:
                 seen.add(key)
-                pin_copy = pin.copy()
-                pin_copy['pos'] = dict_to_qpointf(pin_copy['pos'])
-                unique_pins.append(pin_copy)
+                unique_pins.append(pin.copy())
+        with_points(unique_pins)
         self.pdf_viewer.pins = unique_pins
         self.findings = unique_pins
+        # Annotation shapes are loaded with the pins, when the elevation is opened
+        if self.project_name:
+            import os
+            self.pdf_viewer.load_shapes(AnnotationStore.for_elevation(
+                self.project_name,
+                self.elevation_name or (os.path.basename(self.pdf_path) if self.pdf_path else "Unknown Elevation"),
+                self.pdf_path, self.elevation_id))
         main_layout.addWidget(self.pdf_viewer, 10)
 
         # --- Right: Findings List Sidebar ---
@@ -167,7 +118,8 @@ class ElevationOverviewWidget(QWidget):
         header.setStyleSheet("font-weight: bold; font-size: 18px; margin-bottom: 8px;")
         findings_layout.addWidget(header)
 
-        self.finding_cards = []
+        self.finding_cards = {}  # pin_id -> FindingCard
+        self._card_fields = {}  # pin_id -> fields the card was built from
         self.findings_layout = findings_layout  # Save for later use
         
         # Add View Photos button
@@ -191,79 +143,98 @@ class ElevationOverviewWidget(QWidget):
         if self.sidebar is not None:
             self.finding_added.connect(self.sidebar.refresh)
 
+        # Apply pin changes published by save_pins to this elevation from memory
+        import os
+        from Project.Elevations.findings_logic import elevation_partition_keys
+        from Project.project_cache import get_project_cache
+        self._partition_keys = elevation_partition_keys(
+            self.elevation_name or (os.path.basename(self.pdf_path) if self.pdf_path else "Unknown Elevation"),
+            self.pdf_path, self.elevation_id)
+        self._cache_notifier = get_project_cache().qt_notifier() if self.project_name else None
+        if self._cache_notifier is not None:
+            self._cache_notifier.changed.connect(self._on_project_data_changed)
+
 
 
 
     def reload_findings(self):
         """Reload findings from storage to ensure consistency."""
         try:
-            from Project.Elevations.findings_logic import load_pins
+            from Project.Elevations.findings_logic import load_elevation_pins
             import os
-            all_pins = load_pins(self.project_name)
             current_elevation = self.elevation_name if self.elevation_name else (os.path.basename(self.pdf_path) if self.pdf_path else "Unknown Elevation")
-            
-            # Apply the same filtering logic as in __init__
-            filtered_pins = []
-            for pin in all_pins:
-                pin_elevation = pin.get('elevation', '').strip()
-                
-                # Normalize names for comparison (same logic as __init__)
-                def normalize_name(name):
-                    if not name:
-                        return ""
-                    name_clean = os.path.splitext(os.path.basename(name))[0].lower().strip()
-                    return name_clean
-                
-                pin_elevation_normalized = normalize_name(pin_elevation)
-                current_elevation_normalized = normalize_name(current_elevation)
-                
-                matches = False
-                
-                # Apply same matching criteria as __init__
-                if pin_elevation_normalized == current_elevation_normalized and pin_elevation_normalized:
-                    matches = True
-                elif pin_elevation == current_elevation:
-                    matches = True
-                elif pin_elevation == self.pdf_path:
-                    matches = True
-                elif os.path.basename(pin_elevation) == current_elevation:
-                    matches = True
-                
-                if matches:
-                    filtered_pins.append(pin)
-            
-            self.findings = filtered_pins
-            
-            # If no pins match elevation filtering, show all pins for debugging (in development)
-            if len(filtered_pins) == 0 and len(all_pins) > 0:
-                print(f"[DEBUG] No pins matched elevation filter during reload, showing all {len(all_pins)} pins for debugging")
-                self.findings = all_pins  # Show all pins for debugging
-                
+            self.findings = load_elevation_pins(self.project_name, current_elevation, self.pdf_path,
+                                                self.elevation_id)
             self.refresh_findings_sidebar()
             print(f"[DEBUG] Reloaded {len(self.findings)} findings")
         except Exception as e:
             print(f"[ERROR] Failed to reload findings: {e}")
 
+    def _on_project_data_changed(self, project_name, filename):
+        """Update this elevation's pins when one of its partitions changed"""
+        if project_name != self.project_name:
+            return
+        from Project.pin_partitions import partition_key, partition_key_from_cache_name
+        key = partition_key_from_cache_name(filename)
+        if key is None or key not in self._partition_keys:
+            return
+        import copy
+        from Project.models import with_points
+        from Project.project_cache import get_project_cache
+        data = get_project_cache().peek(project_name, filename)
+        if data is None:
+            # Changed outside the app: nothing in memory to apply
+            self.reload_findings()
+            return
+        groups = {k: [] for k in self._partition_keys}
+        for pin in self.findings:
+            pin_key = partition_key(pin)
+            if pin_key != key and pin_key in groups:
+                groups[pin_key].append(pin)
+        groups[key] = with_points(copy.deepcopy(data))
+        self.findings = [pin for k in self._partition_keys for pin in groups[k]]
+        self.refresh_findings_sidebar()
+
+    @staticmethod
+    def _finding_card_key(finding):
+        pin_id = finding.get('pin_id')
+        return pin_id if pin_id is not None else ('unsaved', id(finding))
+
     def refresh_findings_sidebar(self):
-        print("[DEBUG] refresh_findings_sidebar called. findings:", self.findings)
-        # Remove all cards except header, stretch, and add_btn
-        for i in reversed(range(1, self.findings_layout.count() - 2)):
-            widget = self.findings_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        self.finding_cards.clear()
-        print(f"[DEBUG] Number of findings: {len(self.findings)}")
+        """Bring the finding cards in line with self.findings, touching only cards that changed"""
+        wanted = {}
         for finding in self.findings:
-            print("[DEBUG] Adding FindingCard for:", finding)
-            card = FindingCard(
-                title=finding.get('name', 'Untitled Finding'),
-                status=finding.get('status', None),
-                material=finding.get('material', ''),
-                defect=finding.get('defect', '')
-            )
+            wanted.setdefault(self._finding_card_key(finding), finding)
+
+        # Remove cards of pins that are gone
+        for key in [key for key in self.finding_cards if key not in wanted]:
+            card = self.finding_cards.pop(key)
+            self._card_fields.pop(key, None)
+            self.findings_layout.removeWidget(card)
+            card.setParent(None)
+            card.deleteLater()
+
+        # Cards go between the View Photos button and the stretch, in findings order
+        position = self.findings_layout.indexOf(self.photos_btn) + 1
+        for key, finding in wanted.items():
+            fields = (finding.get('name', 'Untitled Finding'), finding.get('status', None),
+                      finding.get('material', ''), finding.get('defect', ''))
+            card = self.finding_cards.get(key)
+            if card is not None and self._card_fields.get(key) != fields:
+                self.findings_layout.removeWidget(card)
+                card.setParent(None)
+                card.deleteLater()
+                card = None
+            if card is None:
+                card = FindingCard(title=fields[0], status=fields[1], material=fields[2], defect=fields[3])
+                self.findings_layout.insertWidget(position, card)
+                self.finding_cards[key] = card
+                self._card_fields[key] = fields
+            elif self.findings_layout.indexOf(card) != position:
+                self.findings_layout.removeWidget(card)
+                self.findings_layout.insertWidget(position, card)
             card.mousePressEvent = self._make_finding_card_click_handler(finding)
-            self.findings_layout.insertWidget(self.findings_layout.count() - 2, card)
-            self.finding_cards.append(card)
+            position += 1
 
     def _make_finding_card_click_handler(self, finding):
         def handler(event):
@@ -300,12 +271,15 @@ class ElevationOverviewWidget(QWidget):
         
         # Ensure pin has elevation field set before saving
         pin['elevation'] = elevation_name
+        if self.elevation_id:
+            pin['elevation_id'] = self.elevation_id
         
         # Add pin to master findings and storage
         add_pin_to_master_findings(pin, elevation_name=elevation_name, project_name=self.project_name)
         
-        # Reload findings from storage to ensure consistency
-        self.reload_findings()
+        # The saved partition reaches the sidebar through _on_project_data_changed
+        if self._cache_notifier is None:
+            self.reload_findings()
         self.finding_added.emit()
         self.select_tool('mouse')
 
@@ -313,43 +287,18 @@ class ElevationOverviewWidget(QWidget):
         # Update pin in master findings and storage
         import os
         elevation_name = self.elevation_name if self.elevation_name else (os.path.basename(self.pdf_path) if self.pdf_path else "Unknown Elevation")
+        if self.elevation_id and not pin.get('elevation_id'):
+            pin['elevation_id'] = self.elevation_id
         add_pin_to_master_findings(pin, elevation_name=elevation_name, project_name=self.project_name)
         
-        # Reload findings from storage to ensure consistency
-        self.reload_findings()
+        # The saved partition reaches the sidebar through _on_project_data_changed
+        if self._cache_notifier is None:
+            self.reload_findings()
 
-        # --- Right: Findings List Sidebar ---
-        self.findings_sidebar = QFrame()
-        self.findings_sidebar.setFixedWidth(260)
-        self.findings_sidebar.setStyleSheet("background: #fafbfc; border-left: 1.5px solid #bbb;")
-        findings_layout = QVBoxLayout(self.findings_sidebar)
-        findings_layout.setContentsMargins(8, 8, 8, 8)
-        findings_layout.setSpacing(8)
-
-        header = QLabel("Findings List")
-        header.setStyleSheet("font-weight: bold; font-size: 18px; margin-bottom: 8px;")
-        findings_layout.addWidget(header)
-
-        self.finding_cards = []
-        for finding in self.findings:
-            card = QFrame()
-            card.setStyleSheet("background: #fff; border: 1px solid #ddd; border-radius: 6px; padding: 8px;")
-            card_layout = QVBoxLayout(card)
-            card_layout.setContentsMargins(8, 8, 8, 8)
-            card_layout.addWidget(QLabel(finding.get('title', 'Untitled Finding')))
-            findings_layout.addWidget(card)
-            self.finding_cards.append(card)
-
-        findings_layout.addStretch(1)
-        add_btn = QPushButton("+ New Task")
-        add_btn.setStyleSheet("background: #e3e3e3; border-radius: 6px; padding: 8px; font-weight: bold;")
-        findings_layout.addWidget(add_btn)
-
-
-
-        # Set default tool to mouse
-        self.pdf_viewer.set_mode('mouse')
-        self.toolbar.mouse_btn.setChecked(True)
+        # Set default tool to mouse (after a dialog edit; a dragged pin keeps the move tool)
+        if self.pdf_viewer.mode != 'move':
+            self.pdf_viewer.set_mode('mouse')
+            self.toolbar.mouse_btn.setChecked(True)
 
     # Sidebar toggle removed: sidebar always hidden
 
@@ -398,6 +347,9 @@ class ElevationOverviewWidget(QWidget):
         
         dialog.exec()
 
+SHAPE_INDEX_CELL = 64  # base pixmap pixels per shape index cell
+SHAPE_HIT_MARGIN = 10  # how near a line counts as on it (see _point_in_shape)
+
 class PDFPinViewer(QLabel):
     from PySide6.QtCore import Signal
     pin_created = Signal(dict)  # Emitted when a new pin is created
@@ -408,8 +360,10 @@ class PDFPinViewer(QLabel):
         self.setStyleSheet("background: #eee; border: 1px solid #bbb; font-size: 18px;")
         self.pdf_path = pdf_path
         self.chat_manager = chat_manager
-        self.pins = []
-        self.shapes = []  # List of dicts: {type, start, end}
+        self.pin_collection = PinCollection()
+        self.shapes = []  # List of dicts: {type, start, end, id}, points in base pixmap pixels
+        self.shape_index = ShapeGridIndex(SHAPE_INDEX_CELL)  # shape list index by position
+        self.annotation_store = None  # AnnotationStore the shapes are saved to
         self.current_shape = None
         self.mode = 'pin'  # or 'draw' or 'pan' or 'move'
         self.draw_shape = 'line'  # 'line', 'circle', 'square'
@@ -422,8 +376,78 @@ class PDFPinViewer(QLabel):
         self.moving_object = None  # {'type': 'pin'/'shape', 'index': int, 'offset': QPoint}
         self.placing_pin = False
         self.temp_pin = None
+        self.cluster_markers = []  # (x, y, radius) on screen of the clusters drawn last
         self.display_pdf()
 
+    @property
+    def pins(self):
+        """The pin dicts shown; assigning a list rebuilds the pin collection"""
+        return self.pin_collection.pins
+
+    @pins.setter
+    def pins(self, pins):
+        self.pin_collection.set_pins(pins)
+
+    # --- Annotation shapes ---
+    def load_shapes(self, store):
+        """Show the shapes of store (an AnnotationStore) and save drawn shapes to it"""
+        self.annotation_store = store
+        self.shapes = []
+        self.shape_index.clear()
+        if self.base_pixmap:
+            width, height = self.base_pixmap.width(), self.base_pixmap.height()
+            for record in store.shapes():
+                start, end = record['start'], record['end']
+                self.shapes.append({
+                    'type': record['type'], 'id': record['id'],
+                    'start': QPoint(round(start['x'] * width), round(start['y'] * height)),
+                    'end': QPoint(round(end['x'] * width), round(end['y'] * height)),
+                })
+                self._index_shape(len(self.shapes) - 1)
+        self.update()
+
+    def _index_shape(self, i):
+        s, e = self.shapes[i]['start'], self.shapes[i]['end']
+        self.shape_index.insert(i, s.x(), s.y(), e.x(), e.y(), margin=SHAPE_HIT_MARGIN)
+
+    def _save_shape(self, i):
+        """Write shape i (new or changed) to the annotation store"""
+        if self.annotation_store is None or not self.base_pixmap:
+            return
+        shape = self.shapes[i]
+        width, height = self.base_pixmap.width(), self.base_pixmap.height()
+        start = (shape['start'].x() / width, shape['start'].y() / height)
+        end = (shape['end'].x() / width, shape['end'].y() / height)
+        if shape.get('id') is None:
+            shape['id'] = self.annotation_store.add(shape['type'], start, end)
+        else:
+            self.annotation_store.update(shape['id'], shape['type'], start, end)
+
+    def _shape_at(self, x, y):
+        """Index of the topmost shape at (x, y) in base pixmap units, or None"""
+        point = QPoint(int(x), int(y))
+        for i in sorted(self.shape_index.query(x, y), reverse=True):
+            if self._point_in_shape(point, self.shapes[i]):
+                return i
+        return None
+
+    def _visible_clusters(self):
+        """Pin clusters to draw at the current zoom, or None to draw every pin"""
+        if self.mode == 'move' or self.placing_pin:
+            return None
+        return self.pin_collection.clusters(self.scale, self.base_pixmap.width(), self.base_pixmap.height())
+
+    def _hit_cluster(self, pos):
+        """Screen center of the cluster marker at the screen position pos, or None"""
+        for cx, cy, radius in self.cluster_markers:
+            if (cx - pos.x()) ** 2 + (cy - pos.y()) ** 2 <= radius * radius:
+                return QPointF(cx, cy)
+        return None
+
+    def _hit_pin(self, x, y):
+        """Index of the pin at (x, y) in base pixmap units, or None"""
+        return self.pin_collection.hit_test(x, y, self.base_pixmap.width(), self.base_pixmap.height(), 18)
+
     def set_mode(self, mode, shape=None):
         self.mode = mode
         if mode == 'draw' and shape:
@@ -443,9 +467,26 @@ class PDFPinViewer(QLabel):
         self.scale *= factor
         self.update()
 
+    def zoom_to(self, factor, center):
+        """Zoom by factor and pan so the screen point center ends up in the middle of the view"""
+        label_size = self.size()
+        pixmap_size = self.scaled_pixmap_size()
+        x_offset = (label_size.width() - pixmap_size.width()) // 2 + self.offset.x()
+        y_offset = (label_size.height() - pixmap_size.height()) // 2 + self.offset.y()
+        # center in base pixmap units
+        x = (center.x() - x_offset) / self.scale
+        y = (center.y() - y_offset) / self.scale
+        self.scale *= factor
+        pixmap_size = self.scaled_pixmap_size()
+        width, height = label_size.width(), label_size.height()
+        self.offset = QPoint(round(width / 2 - x * self.scale) - (width - pixmap_size.width()) // 2,
+                             round(height / 2 - y * self.scale) - (height - pixmap_size.height()) // 2)
+        self.update()
+
     def display_pdf(self):
         if self.pdf_path and self.pdf_path.lower().endswith('.pdf'):
             try:
+                import fitz  # PyMuPDF, imported on first use to keep startup fast
                 doc = fitz.open(self.pdf_path)
                 if doc.page_count > 0:
                     page = doc.load_page(0)
@@ -473,27 +514,27 @@ class PDFPinViewer(QLabel):
         y = (event.y() - y_offset) / self.scale
         rel_x = x / self.base_pixmap.width() if self.base_pixmap else 0
         rel_y = y / self.base_pixmap.height() if self.base_pixmap else 0
-        click_point = QPointF(rel_x, rel_y)
+        self.pin_collection.sync()
+        cluster_center = self._hit_cluster(event.pos()) if event.button() == Qt.LeftButton else None
+        if self.mode in ('mouse', 'pin') and cluster_center is not None:
+            # Clicking a cluster zooms in on it until it splits into its pins
+            self.zoom_to(2.0, cluster_center)
+            return
         if self.mode == 'mouse':
-            for pin in self.pins:
-                px = pin['pos'].x() * self.base_pixmap.width()
-                py = pin['pos'].y() * self.base_pixmap.height()
-                if (QPointF(px, py) - QPointF(x, y)).manhattanLength() < 18:
-                    self.open_pin_dialog(pin, new_pin=False)
-                    return
+            index = self._hit_pin(x, y)
+            if index is not None:
+                self.open_pin_dialog(self.pins[index], new_pin=False)
             return
         if self.mode == 'pin' and event.button() == Qt.LeftButton:
-            for pin in self.pins:
-                px = pin['pos'].x() * self.base_pixmap.width()
-                py = pin['pos'].y() * self.base_pixmap.height()
-                if (QPointF(px, py) - QPointF(x, y)).manhattanLength() < 18:
-                    self.open_pin_dialog(pin, new_pin=False)
-                    return
+            index = self._hit_pin(x, y)
+            if index is not None:
+                self.open_pin_dialog(self.pins[index], new_pin=False)
+                return
             if self.point_in_pixmap(event.pos()):
                 # Start drag-to-place for new pin
                 self.placing_pin = True
-                self.temp_pin = {"pos": click_point, "chat": []}
-                self.pins.append(self.temp_pin)
+                self.temp_pin = {"pos": Point(rel_x, rel_y), "chat": []}
+                self.pin_collection.append(self.temp_pin)
                 self.update()
         elif self.mode == 'draw' and event.button() == Qt.LeftButton:
             if self.point_in_pixmap(event.pos()):
@@ -503,20 +544,20 @@ class PDFPinViewer(QLabel):
                     'end': QPoint(int(x), int(y))
                 }
         elif self.mode == 'move' and event.button() == Qt.LeftButton:
-            for i, pin in enumerate(self.pins):
-                px = pin['pos'].x() * self.base_pixmap.width()
-                py = pin['pos'].y() * self.base_pixmap.height()
-                if (QPointF(px, py) - QPointF(x, y)).manhattanLength() < 18:
-                    self.moving_object = {'type': 'pin', 'index': i, 'offset': QPoint(int(x - px), int(y - py))}
-                    return
-            for i in reversed(range(len(self.shapes))):
+            i = self._hit_pin(x, y)
+            if i is not None:
+                px = self.pin_collection.xs[i] * self.base_pixmap.width()
+                py = self.pin_collection.ys[i] * self.base_pixmap.height()
+                self.moving_object = {'type': 'pin', 'index': i, 'offset': QPoint(int(x - px), int(y - py))}
+                return
+            i = self._shape_at(x, y)
+            if i is not None:
                 shape = self.shapes[i]
-                if self._point_in_shape(QPoint(int(x), int(y)), shape):
-                    s = shape['start']
-                    e = shape['end']
-                    offset = QPoint(int(x - s.x()), int(y - s.y()))
-                    self.moving_object = {'type': 'shape', 'index': i, 'offset': offset, 'drag_start': QPoint(int(x), int(y)), 'orig_start': s, 'orig_end': e}
-                    return
+                s = shape['start']
+                e = shape['end']
+                offset = QPoint(int(x - s.x()), int(y - s.y()))
+                self.moving_object = {'type': 'shape', 'index': i, 'offset': offset, 'drag_start': QPoint(int(x), int(y)), 'orig_start': s, 'orig_end': e}
+                return
         elif self.mode == 'pan' and event.button() == Qt.LeftButton:
             self.setCursor(Qt.ClosedHandCursor)
             self.last_pan_point = event.pos()
@@ -532,6 +573,9 @@ class PDFPinViewer(QLabel):
             pin['status'] = dlg.get_status()
             pin['material'] = dlg.get_material()
             pin['defect'] = dlg.get_defect()
+            index = self.pin_collection.index(pin)
+            if index is not None:
+                self.pin_collection.refresh(index)
             self.pin_updated.emit(pin)
             self.update()
             return True
@@ -550,18 +594,11 @@ class PDFPinViewer(QLabel):
         self.hovered_pin_index = None
         self.hovered_shape_index = None
         # Pin hover
-        for i, pin in enumerate(self.pins):
-            px = pin['pos'].x() * self.base_pixmap.width()
-            py = pin['pos'].y() * self.base_pixmap.height()
-            if (QPointF(px, py) - QPointF(x, y)).manhattanLength() < 18:
-                self.hovered_pin_index = i
-                break
-        # Shape hover (check last to first for topmost)
-        for i in reversed(range(len(self.shapes))):
-            shape = self.shapes[i]
-            if self._point_in_shape(QPoint(int(x), int(y)), shape):
-                self.hovered_shape_index = i
-                break
+        if self.base_pixmap:
+            self.pin_collection.sync()
+            self.hovered_pin_index = self._hit_pin(x, y)
+        # Shape hover (topmost shape near the cursor)
+        self.hovered_shape_index = self._shape_at(x, y)
         if prev_hover != self.hovered_pin_index or prev_shape_hover != self.hovered_shape_index:
             self.update()
 
@@ -576,7 +613,7 @@ class PDFPinViewer(QLabel):
                 idx = self.moving_object['index']
                 rel_x = x / self.base_pixmap.width()
                 rel_y = y / self.base_pixmap.height()
-                self.pins[idx]['pos'] = QPointF(rel_x, rel_y)
+                self.pin_collection.set_position(idx, rel_x, rel_y)
                 self.update()
                 parent = self.parent()
                 while parent is not None and not hasattr(parent, 'findings'):
@@ -605,7 +642,9 @@ class PDFPinViewer(QLabel):
             if self.point_in_pixmap(event.pos()):
                 rel_x = x / self.base_pixmap.width()
                 rel_y = y / self.base_pixmap.height()
-                self.temp_pin['pos'] = QPointF(rel_x, rel_y)
+                index = self.pin_collection.index(self.temp_pin)
+                if index is not None:
+                    self.pin_collection.set_position(index, rel_x, rel_y)
                 self.update()
         elif self.mode == 'pan' and self.last_pan_point:
             delta = event.pos() - self.last_pan_point
@@ -619,8 +658,13 @@ class PDFPinViewer(QLabel):
         if self.mode == 'draw' and self.current_shape:
             self.shapes.append(self.current_shape)
             self.current_shape = None
+            self._index_shape(len(self.shapes) - 1)
+            self._save_shape(len(self.shapes) - 1)
             self.update()
         elif self.mode == 'move' and self.moving_object:
+            if self.moving_object['type'] == 'shape':
+                self._index_shape(self.moving_object['index'])
+                self._save_shape(self.moving_object['index'])
             self.moving_object = None
             self.update()
         elif self.mode == 'pin' and self.placing_pin and self.temp_pin is not None:
@@ -632,8 +676,7 @@ class PDFPinViewer(QLabel):
             result = self.open_pin_dialog(pin, new_pin=True)
             if not result:
                 # If dialog cancelled, remove the pin
-                if pin in self.pins:
-                    self.pins.remove(pin)
+                self.pin_collection.remove(pin)
                 self.update()
             else:
                 self.pin_created.emit(pin)
@@ -674,7 +717,7 @@ class PDFPinViewer(QLabel):
                 proj_x = x1 + t * dx
                 proj_y = y1 + t * dy
                 dist = ((x0 - proj_x) ** 2 + (y0 - proj_y) ** 2) ** 0.5
-            if dist < 10:
+            if dist < SHAPE_HIT_MARGIN:
                 return True
         elif shape['type'] in ('square', 'circle'):
             rect = QRect(s, e).normalized()
@@ -685,7 +728,6 @@ class PDFPinViewer(QLabel):
     def paintEvent(self, event):
         super().paintEvent(event)
         if self.base_pixmap:
-            from config.status import STATUS_COLORS
             painter = QPainter(self)
             painter.setRenderHint(QPainter.Antialiasing)
             pixmap_size = self.scaled_pixmap_size()
@@ -701,21 +743,62 @@ class PDFPinViewer(QLabel):
                 self._draw_shape(painter, shape, x_offset, y_offset, highlight)
             if self.current_shape:
                 self._draw_shape(painter, self.current_shape, x_offset, y_offset, False)
-            # Draw pins
-            for i, pin in enumerate(self.pins):
-                px = pin['pos'].x() * pixmap_size.width()
-                py = pin['pos'].y() * pixmap_size.height()
-                pin_x = int(px) + x_offset
-                pin_y = int(py) + y_offset
-                status = pin.get('status', None)
-                color = STATUS_COLORS.get(status, '#FF4500')  # fallback to orange-red
-                if i == self.hovered_pin_index:
-                    painter.setBrush(QColor(color).lighter(130))
-                    painter.setPen(QPen(QColor(30, 30, 30), 4))  # dark border
-                else:
-                    painter.setBrush(QColor(color))
-                    painter.setPen(QPen(QColor(color)))
-                painter.drawEllipse(QPoint(pin_x, pin_y), 10, 10)
+            # Draw pins, one status (color) at a time; when zoomed out, pins
+            # sharing a grid cell are drawn as one cluster marker
+            pins = self.pin_collection
+            pins.sync()
+            xs, ys = pins.screen_positions(pixmap_size.width(), pixmap_size.height(), x_offset, y_offset)
+            hovered = self.hovered_pin_index
+            clusters = self._visible_clusters()
+            self.cluster_markers = []
+            if clusters is None:
+                groups = pins.status_groups()
+            else:
+                by_code = {}
+                for cluster in clusters:
+                    if len(cluster) == 1:
+                        i = next(iter(cluster.indices))
+                        by_code.setdefault(pins.codes[i], []).append(i)
+                groups = sorted(by_code.items())
+            for code, indices in groups:
+                color = QColor(pins.status_colors[code])  # orange-red for unknown statuses
+                painter.setBrush(color)
+                painter.setPen(QPen(color))
+                for i in indices:
+                    if i != hovered:
+                        painter.drawEllipse(QPointF(xs[i], ys[i]), 10, 10)
+            for cluster in clusters or ():
+                if len(cluster) > 1:
+                    cx, cy = cluster.center()
+                    self._draw_cluster(painter, cluster, cx * pixmap_size.width() + x_offset,
+                                       cy * pixmap_size.height() + y_offset)
+            if hovered is not None and hovered < len(pins):
+                color = QColor(pins.status_colors[pins.codes[hovered]])
+                painter.setBrush(color.lighter(130))
+                painter.setPen(QPen(QColor(30, 30, 30), 4))  # dark border
+                painter.drawEllipse(QPointF(xs[hovered], ys[hovered]), 10, 10)
+
+    def _draw_cluster(self, painter, cluster, x, y):
+        """Cluster marker: a ring split by status, with the pin count in the middle"""
+        import math
+        count = len(cluster)
+        radius = 12 + min(12, 3 * math.log2(count))
+        rect = QRectF(x - radius, y - radius, 2 * radius, 2 * radius)
+        painter.setPen(Qt.NoPen)
+        start = 90 * 16  # 12 o'clock, in 1/16th degrees
+        drawn = 0
+        for code, n in sorted(cluster.status_counts.items()):
+            drawn += n
+            end = 90 * 16 - round(360 * 16 * drawn / count)  # clockwise
+            painter.setBrush(QColor(self.pin_collection.status_colors[code]))
+            painter.drawPie(rect, start, end - start)
+            start = end
+        painter.setBrush(QColor(255, 255, 255, 235))
+        painter.setPen(QPen(QColor(30, 30, 30), 1))
+        inner = radius * 0.62
+        painter.drawEllipse(QPointF(x, y), inner, inner)
+        painter.drawText(QRectF(x - inner, y - inner, 2 * inner, 2 * inner), Qt.AlignCenter, str(count))
+        self.cluster_markers.append((x, y, radius))
 
     def _draw_shape(self, painter, shape, x_offset, y_offset, highlight=False):
         pen = QPen(QColor(0, 0, 255), 2)
@@ -757,22 +840,9 @@ class PinTaskDialog(QDialog):
 
         # For new pins, generate a temporary pin_id immediately so photos can be attached
         if self.new_pin and not pin_id and self.chat_manager:
-            # Get next available pin_id using the same logic as findings_logic
-            import os
-            import json
-            pins_file = os.path.join(self.chat_manager.project_dir, 'pins.json')
-            if os.path.exists(pins_file):
-                try:
-                    with open(pins_file, 'r', encoding='utf-8') as f:
-                        existing_pins = json.load(f)
-                    next_id = max([p.get('pin_id', 0) for p in existing_pins], default=100) + 1
-                except:
-                    next_id = 101  # First pin if file corrupted
-            else:
-                next_id = 101  # First pin
-            
-            # Use the standard next ID - concurrent dialogs are rare in single-user application
-            
+            # Reserve the id from the project's allocator so it cannot collide with create_pin
+            from Project.id_allocator import next_pin_id
+            next_id = next_pin_id(self.chat_manager.project_name)
             self.pin['pin_id'] = next_id
             pin_id = next_id
             print(f"[DEBUG] Assigned temporary pin_id {pin_id} to new pin")
@@ -889,14 +959,12 @@ class PinTaskDialog(QDialog):
                 ]
         
         self.status_combo.addItem("")
+        # Try template colors first, then master list, then fallback to STATUS_COLORS
+        template_colors = template_loader.get_status_colors_dict()
+        master_colors = template_loader.get_master_list_statuses()
         for status in status_options:
             # Create a colored circle icon
-            # Try template colors first, then master list, then fallback to STATUS_COLORS
-            template_colors = template_loader.get_status_colors_dict()
-            color = template_colors.get(status)
-            if not color:
-                master_colors = template_loader.get_master_list_statuses()
-                color = master_colors.get(status) or STATUS_COLORS.get(status, "#cccccc")
+            color = template_colors.get(status) or master_colors.get(status) or STATUS_COLORS.get(status, "#cccccc")
             pixmap = QPixmap(16, 16)
             pixmap.fill(Qt.transparent)
             painter = QPainter(pixmap)
@@ -1042,6 +1110,7 @@ class PinTaskDialog(QDialog):
             self.mini_map.clear()
             return
         try:
+            import fitz  # PyMuPDF
             doc = fitz.open(self.pdf_path)
             if doc.page_count > 0:
                 page = doc.load_page(0)
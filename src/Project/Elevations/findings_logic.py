@@ -2,8 +2,10 @@
 # Abstracts pin info and adds it to the master findings list
 
 import os
+import copy
 import json
 from Project.master_findings import add_finding_from_pin, save_master_findings
+from Project.models import point_xy, pos_to_dict, with_points
 
 import pathlib
 def get_project_storage_dir(project_name):
@@ -28,11 +30,8 @@ def get_pins_path(project_name):
 
 
 # --- Pin Storage Logic ---
-def load_pins(project_name):
-    """Load pins from the shared pins.json file."""
-    if not project_name or not isinstance(project_name, str):
-        raise ValueError("project_name must be a non-empty string.")
-    pins_path = get_pins_path(project_name)
+def _read_pins_file(pins_path):
+    """Read and validate pins from disk, with positions left as {'x', 'y'} dicts."""
     # Validate pins.json contents before loading
     if not os.path.exists(pins_path):
         with open(pins_path, "w", encoding="utf-8") as fp:
@@ -50,15 +49,6 @@ def load_pins(project_name):
                 pos = pin.get("pos")
                 if not isinstance(pos, dict) or "x" not in pos or "y" not in pos:
                     raise ValueError("Pin 'pos' must be a dict with 'x' and 'y'")
-            # Convert pin['pos'] dicts to QPointF for UI use
-            try:
-                from PySide6.QtCore import QPointF
-                for pin in pins:
-                    pos = pin.get('pos')
-                    if isinstance(pos, dict) and 'x' in pos and 'y' in pos:
-                        pin['pos'] = QPointF(pos['x'], pos['y'])
-            except ImportError:
-                pass
             return pins
         except (json.JSONDecodeError, ValueError) as e:
             print(f"[ERROR] Invalid pins.json: {e}. Resetting to empty array.")
@@ -66,30 +56,154 @@ def load_pins(project_name):
                 json.dump([], fpw)
             return []
 
+def get_shared_pins(project_name):
+    """
+    Return the project's pins from the process-wide project cache.
+    The list and its pins are shared with every other caller: do not mutate them
+    (use load_pins for an editable copy). Positions are {'x', 'y'} dicts.
+    """
+    if not project_name or not isinstance(project_name, str):
+        raise ValueError("project_name must be a non-empty string.")
+    from Project.project_cache import get_project_cache
+    return get_project_cache().get(project_name, "pins.json", get_pins_path(project_name), _read_pins_file)
+
+def load_pins(project_name):
+    """Load an editable copy of the pins from the shared pins.json file."""
+    pins = copy.deepcopy(get_shared_pins(project_name))
+    return with_points(pins)
+
 def save_pins(pins, project_name):
     """Save pins to the shared pins.json file."""
     if not project_name or not isinstance(project_name, str):
         raise ValueError("project_name must be a non-empty string.")
     pins_path = get_pins_path(project_name)
-    # Convert QPointF to dict for all pins before saving
-    for pin in pins:
-        pos = pin.get("pos")
-        # Only convert if it's a QPointF (avoid double conversion)
-        try:
-            from PySide6.QtCore import QPointF
-            if isinstance(pos, QPointF):
-                pin["pos"] = {"x": pos.x(), "y": pos.y()}
-        except ImportError:
-            # If PySide6 not available, skip conversion
-            pass
+    # Store positions (Points, or QPointFs set by the viewer) as {'x', 'y'} dicts;
+    # the caller's pins are left as they are
+    text = json.dumps([dict(pin, pos=pos_to_dict(pin["pos"])) if "pos" in pin else pin for pin in pins],
+                      separators=(",", ":"))
+    from Project import project_aggregates
+    base_source = project_aggregates.file_signature(pins_path)
+    # Written compactly: large projects parse much faster without the indentation
     with open(pins_path, "w", encoding="utf-8") as fp:
-        json.dump(pins, fp, indent=2)
+        fp.write(text)
+    source = project_aggregates.file_signature(pins_path)
+    # Keep the cache in step with disk: parse the text back, so the cache shares
+    # nothing (chat, photos) with the caller's pins
+    pins = json.loads(text)
+    from Project.project_cache import get_project_cache
+    cache = get_project_cache()
+    cache.put(project_name, "pins.json", pins_path, pins)
+    # Rewrite the per-elevation partitions that changed and publish them, so open
+    # elevations can apply the change from memory (see ElevationOverviewWidget)
+    from Project.pin_partitions import write_partitions, get_partition_path, partition_cache_name
+    project_dir = get_project_storage_dir(project_name)
+    previous = {}
+    changed = write_partitions(project_dir, pins, pins_path, previous, base_source)
+    for key, group in changed.items():
+        cache.put(project_name, partition_cache_name(key), get_partition_path(project_dir, key),
+                  [dict(pin) for pin in group])
+    # The counts (and the portfolio catalog entry) and the search index are
+    # adjusted by the changed partitions in the background
+    from Project.derived_writer import get_derived_writer
+    get_derived_writer().schedule_pins(project_name, project_dir, pins_path, pins,
+                                       base_source, source, changed, previous)
+
+def _load_partition_index(project_name):
+    """Partition index for the project, rebuilt from pins.json if missing or stale."""
+    from Project import pin_partitions
+    from Project.project_cache import get_project_cache
+    project_dir = get_project_storage_dir(project_name)
+    pins_path = get_pins_path(project_name)
+    index_path = pin_partitions.get_index_path(project_dir)
+    cache = get_project_cache()
+    index = cache.get(project_name, pin_partitions.INDEX_FILENAME, index_path,
+                      lambda path: pin_partitions.load_index(project_dir))
+    if not pin_partitions.is_index_fresh(index, pins_path):
+        # First open after an upgrade, or pins.json was edited outside the app
+        pin_partitions.write_partitions(project_dir, get_shared_pins(project_name), pins_path)
+        index = cache.get(project_name, pin_partitions.INDEX_FILENAME, index_path,
+                          lambda path: pin_partitions.load_index(project_dir))
+    return index
+
+def get_elevation_pin_ids(project_name, elevation_id):
+    """Pin ids on an elevation, looked up in the partition index (no pin is read)."""
+    index = _load_partition_index(project_name) or {}
+    return list(index.get("partitions", {}).get(elevation_id, {}).get("pin_ids", []))
+
+def elevation_partition_keys(elevation_name, pdf_path=None, elevation_id=None):
+    """
+    Partition keys that may hold an elevation's pins: its stable elevation_id,
+    then keys computed from the elevation name and drawing file name for pins
+    not yet stamped with an id.
+    """
+    from Project import pin_partitions
+    keys = [elevation_id] if elevation_id else []
+    for name in (elevation_name, pdf_path):
+        key = pin_partitions.elevation_key(name)
+        if name and key not in keys:
+            keys.append(key)
+    return keys
+
+def load_elevation_pins(project_name, elevation_name, pdf_path=None, elevation_id=None):
+    """
+    Load an editable copy of the pins of a single elevation.
+    Reads only that elevation's partition (see Project/pin_partitions.py) instead
+    of every pin in the project. Pins are looked up by their stable elevation_id;
+    pins not yet stamped with one are matched by the elevation key computed from
+    the elevation name and from the drawing file name.
+    """
+    if not project_name or not isinstance(project_name, str):
+        raise ValueError("project_name must be a non-empty string.")
+    from Project import pin_partitions
+    from Project.project_cache import get_project_cache
+    index = _load_partition_index(project_name)
+    partitions = (index or {}).get("partitions", {})
+    project_dir = get_project_storage_dir(project_name)
+    cache = get_project_cache()
+    pins = []
+    for key in elevation_partition_keys(elevation_name, pdf_path, elevation_id):
+        if key not in partitions:
+            continue
+        partition = cache.get(project_name, pin_partitions.partition_cache_name(key),
+                              pin_partitions.get_partition_path(project_dir, key),
+                              lambda path, key=key: pin_partitions.read_partition(project_dir, key))
+        pins.extend(copy.deepcopy(partition))
+    return with_points(pins)
+
+def assign_elevation_ids(project_name, folders):
+    """
+    Stamp pins that predate elevation ids with the id of their elevation.
+    folders is the project's folder list (see Project/elevation_registry.py);
+    pins are matched by elevation key against each elevation's name and drawing.
+    Returns the number of pins updated.
+    """
+    from Project.elevation_registry import elevation_ids_by_key
+    from Project.pin_partitions import elevation_key
+    ids_by_key = elevation_ids_by_key(folders)
+    pins = get_shared_pins(project_name)
+    if all(pin.get("elevation_id") for pin in pins):
+        return 0
+    updated = 0
+    new_pins = []
+    for pin in pins:
+        pin = dict(pin)
+        if not pin.get("elevation_id"):
+            elevation_id = ids_by_key.get(elevation_key(pin.get("elevation")))
+            if elevation_id:
+                pin["elevation_id"] = elevation_id
+                updated += 1
+        new_pins.append(pin)
+    if updated:
+        save_pins(new_pins, project_name)
+        print(f"[INFO] Assigned elevation ids to {updated} pins in project {project_name}")
+    return updated
 
 # --- Pin Creation and Linking ---
-def create_pin(pin_data, elevation_name=None, project_name=None):
+def create_pin(pin_data, elevation_name=None, project_name=None, elevation_id=None):
     """
-    Create a new pin, assign a unique pin_id, and store it in the project's pins.json.
-    Optionally set elevation_name.
+    Create a new pin, assign a unique pin_id from the project's id allocator
+    (see Project/id_allocator.py), and store it in the project's pins.json.
+    Optionally set elevation_name and elevation_id.
     Returns the pin dict with pin_id.
     Raises ValueError if project_name is None.
     """
@@ -99,12 +213,14 @@ def create_pin(pin_data, elevation_name=None, project_name=None):
     for field in required_fields:
         if field not in pin_data or pin_data[field] in (None, "", []):
             raise ValueError(f"Pin data missing required field: '{field}'")
+    from Project.id_allocator import next_pin_id
     pins = load_pins(project_name)
-    next_id = max([p.get("pin_id", 0) for p in pins], default=100) + 1
     pin = pin_data.copy()
-    pin["pin_id"] = next_id
+    pin["pin_id"] = next_pin_id(project_name)
     if elevation_name:
         pin["elevation"] = elevation_name
+    if elevation_id:
+        pin["elevation_id"] = elevation_id
     pins.append(pin)
     save_pins(pins, project_name)
     return pin
@@ -117,7 +233,8 @@ def add_pin_to_project_findings(pin, elevation_name=None, project_name=None):
     Also links the finding to the pin by storing pin_id in the finding and finding_id in the pin.
     Requires project_name to store pins in the correct folder.
     Raises ValueError if project_name is None.
-    Prevents duplicate pins by checking position and elevation.
+    Prevents duplicate pins by checking position and elevation; a pin that is
+    already stored (same pin_id on the same elevation) is updated, position included.
     """
     if not project_name or not isinstance(project_name, str):
         raise ValueError("project_name must be a non-empty string.")
@@ -126,33 +243,26 @@ def add_pin_to_project_findings(pin, elevation_name=None, project_name=None):
     pins = load_pins(project_name)
     pin_pos = pin.get("pos")
     current_elevation = elevation_name or pin.get("elevation")
+    current_elevation_id = pin.get("elevation_id")
     
-    # Convert QPointF to comparable values
-    try:
-        from PySide6.QtCore import QPointF
-        if isinstance(pin_pos, QPointF):
-            pos_x, pos_y = pin_pos.x(), pin_pos.y()
-        else:
-            pos_x, pos_y = pin_pos.get("x", 0), pin_pos.get("y", 0)
-    except ImportError:
-        pos_x, pos_y = pin_pos.get("x", 0), pin_pos.get("y", 0)
+    pos_x, pos_y = point_xy(pin_pos)
     
     # Check for existing pin at same location and elevation
     for existing_pin in pins:
         existing_pos = existing_pin.get("pos")
-        existing_elevation = existing_pin.get("elevation")
+        if current_elevation_id and existing_pin.get("elevation_id"):
+            same_elevation = existing_pin.get("elevation_id") == current_elevation_id
+        else:
+            same_elevation = existing_pin.get("elevation") == current_elevation
         
-        # Compare positions (with small tolerance for floating point)
+        # Compare ids, then positions (with small tolerance for floating point)
         try:
-            if isinstance(existing_pos, dict):
-                ex_x, ex_y = existing_pos.get("x", 0), existing_pos.get("y", 0)
-            else:
-                ex_x, ex_y = existing_pos.x(), existing_pos.y()
-                
-            if (abs(ex_x - pos_x) < 1e-6 and abs(ex_y - pos_y) < 1e-6 and 
-                existing_elevation == current_elevation):
+            ex_x, ex_y = point_xy(existing_pos)
+            same_pin = pin.get("pin_id") is not None and existing_pin.get("pin_id") == pin.get("pin_id")
+            if (same_pin or (abs(ex_x - pos_x) < 1e-6 and abs(ex_y - pos_y) < 1e-6)) and same_elevation:
                 # Pin already exists, update it instead of creating duplicate
                 existing_pin.update({
+                    'pos': pin_pos if pin_pos is not None else existing_pos,
                     'name': pin.get('name', existing_pin.get('name')),
                     'status': pin.get('status', existing_pin.get('status')),
                     'material': pin.get('material', existing_pin.get('material')),
@@ -167,7 +277,7 @@ def add_pin_to_project_findings(pin, elevation_name=None, project_name=None):
     
     # No duplicate found, create new pin if it doesn't have pin_id
     if "pin_id" not in pin:
-        pin = create_pin(pin, elevation_name, project_name)
+        pin = create_pin(pin, elevation_name, project_name, current_elevation_id)
         print(f"[INFO] Created new pin with ID {pin['pin_id']}")
     
     # Prepare pin data for finding creation
@@ -204,6 +314,108 @@ def add_pin_to_project_findings(pin, elevation_name=None, project_name=None):
     print(f"[INFO] Linked pin {pin['pin_id']} to finding {finding_id} in project {project_name}")
     return finding
 
+# --- Bulk Import ---
+MAX_REPORTED_ERRORS = 1000
+
+def import_pins(project_name, records, elevation_name=None, elevation_id=None,
+                create_findings=True, skip_duplicates=True, skip_invalid=False, dry_run=False):
+    """
+    Add many pins (and their findings) to a project with one save.
+    records is an iterable of dicts (see Project/bulk_pins.py for the fields);
+    it is consumed one record at a time, so it can stream from a large file.
+    Every record is validated first. With skip_invalid=False any invalid record
+    cancels the import; otherwise invalid records are left out. Records at the
+    position of an existing (or earlier imported) pin on the same elevation are
+    skipped if skip_duplicates. Pins that only name their elevation get the
+    elevation's id from project.json, so they match pins stamped with it. Ids are reserved in one block from the
+    project's id allocator, then pins.json and findings.json are each written
+    once; if writing the findings fails the previous pins are restored.
+    Returns {"imported", "skipped", "invalid", "errors": [(record number, message)],
+    "pin_ids", "finding_ids"}; with dry_run nothing is written and "imported"
+    is the number of pins that would be.
+    """
+    if not project_name or not isinstance(project_name, str):
+        raise ValueError("project_name must be a non-empty string.")
+    from Project.bulk_pins import record_to_pin, pin_position_key
+    from Project.elevation_registry import elevation_ids_by_key, load_project_folders
+    from Project.pin_partitions import elevation_key
+    try:
+        ids_by_key = elevation_ids_by_key(load_project_folders(project_name))
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Could not read the elevations of project {project_name}: {e}")
+        ids_by_key = {}
+    existing_pins = get_shared_pins(project_name)
+    seen = {pin_position_key(pin, ids_by_key) for pin in existing_pins} if skip_duplicates else set()
+    new_pins = []
+    errors = []
+    skipped = invalid = 0
+    for number, record in enumerate(records, start=1):
+        try:
+            pin = record_to_pin(record, elevation_name, elevation_id)
+        except ValueError as e:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append((number, str(e)))
+            continue
+        if not pin.get("elevation_id"):
+            elevation_id = ids_by_key.get(elevation_key(pin.get("elevation")))
+            if elevation_id:
+                pin["elevation_id"] = elevation_id
+        if skip_duplicates:
+            key = pin_position_key(pin)
+            if key in seen:
+                skipped += 1
+                continue
+            seen.add(key)
+        new_pins.append(pin)
+
+    result = {"imported": 0, "skipped": skipped, "invalid": invalid, "errors": errors,
+              "pin_ids": [], "finding_ids": []}
+    if invalid and not skip_invalid:
+        return result
+    if dry_run or not new_pins:
+        result["imported"] = len(new_pins)  # dry run: the number that would be imported
+        return result
+
+    from Project.id_allocator import reserve_pin_ids, reserve_finding_ids
+    from Project.project_findings import get_shared_findings, build_finding, save_project_findings
+    pin_ids = reserve_pin_ids(project_name, len(new_pins))
+    finding_ids = reserve_finding_ids(project_name, len(new_pins)) if create_findings else None
+    new_findings = []
+    for i, pin in enumerate(new_pins):
+        pin["pin_id"] = pin_ids[i]
+        if finding_ids is not None:
+            pin["finding_id"] = finding_ids[i]
+            new_findings.append(build_finding(finding_ids[i], pin))
+
+    # existing_pins is the shared cached list: build a new list, don't extend it
+    save_pins(list(existing_pins) + new_pins, project_name)
+    if new_findings:
+        findings = list(get_shared_findings(project_name)) + new_findings
+        if not save_project_findings(project_name, findings):
+            save_pins(list(existing_pins), project_name)
+            raise IOError(f"Could not save findings for project {project_name}; import rolled back")
+
+    result.update(imported=len(new_pins), pin_ids=list(pin_ids),
+                  finding_ids=list(finding_ids or []))
+    print(f"[INFO] Imported {len(new_pins)} pins into project {project_name} "
+          f"({skipped} duplicates skipped, {invalid} invalid)")
+    return result
+
+def import_pins_from_file(project_name, path, fmt=None, **options):
+    """import_pins over a CSV or JSON file, read as it is imported. fmt defaults from the extension."""
+    from Project.bulk_pins import detect_format, iter_records
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as fp:
+        return import_pins(project_name, iter_records(fp, fmt), **options)
+
+def export_pins_to_file(project_name, path, fmt=None):
+    """Write the project's pins to a CSV or JSON Lines file. Returns the number of pins written."""
+    from Project.bulk_pins import detect_format, write_pins
+    fmt = fmt or detect_format(path)
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        return write_pins(get_shared_pins(project_name), fp, fmt)
+
 # Keep the old function name for backward compatibility, but redirect to new function
 def add_pin_to_master_findings(pin, elevation_name=None, project_name=None):
     """Legacy function name - redirects to add_pin_to_project_findings"""
@@ -212,6 +424,10 @@ def add_pin_to_master_findings(pin, elevation_name=None, project_name=None):
 # --- Explanation ---
 # This module:
 # - Stores all pins in pins.json, each with a unique pin_id
+# - Mirrors pins into per-elevation partitions so one drawing can be opened without
+#   loading every pin (see Project/pin_partitions.py and load_elevation_pins)
+# - Keeps per-project pin counts up to date (see Project/project_aggregates.py)
 # - When a finding is created from a pin, links them by storing pin_id in the finding and finding_id in the pin
+# - Imports many pins with their findings in one save (import_pins, see Project/bulk_pins.py)
 # - Provides functions to load/save pins and findings
 # - Keeps business logic separate from UI, making the codebase easier to maintain and extend
\ No newline at end of file
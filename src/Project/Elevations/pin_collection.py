@@ -0,0 +1,255 @@
+"""
+Array-backed pin collection for PDFPinViewer.
+
+The viewer's pins stay the pin dicts the rest of the app passes around (the
+pin dialogs edit them, pin_created/pin_updated emit them), but painting and
+hit testing read contiguous columns kept next to them instead of indexing
+pin['pos'] and pin['status'] per pin:
+
+    xs, ys   array('d') of normalized 0..1 positions
+    codes    array('H') of status codes; status_names[code] / status_colors[code]
+
+Positions are mapped to screen space one column at a time
+(screen_positions), and pins are painted grouped by status so each color is
+set once per frame. Code that changes a pin's position or status goes
+through set_position / refresh so the columns stay in step.
+
+When zoomed out, pins are clustered on a grid whose cells are about
+CLUSTER_CELL_PX screen pixels wide. Zoom is split into bands (zoom_band)
+and each band's grid is built once, on first use, then kept up to date as
+pins are added, moved or change status; removing pins drops the grids.
+Pins are only clustered below CLUSTER_MAX_SCALE, the viewer's default
+scale: at the default scale and zoomed in they are drawn one by one.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from config.status import get_status_color
+from Project.models import Point, point_xy
+
+CLUSTER_CELL_PX = 40
+CLUSTER_MAX_SCALE = 1.0
+BANDS_PER_OCTAVE = 2
+
+
+def zoom_band(scale: float) -> int:
+    """Zoom band of a viewer scale (BANDS_PER_OCTAVE bands per doubling)"""
+    return math.floor(math.log2(max(scale, 1e-6)) * BANDS_PER_OCTAVE)
+
+
+class PinCluster:
+    """The pins of one grid cell: indices, position sums and pins per status code"""
+    __slots__ = ("indices", "sum_x", "sum_y", "status_counts")
+
+    def __init__(self):
+        self.indices: Set[int] = set()
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.status_counts: Dict[int, int] = {}
+
+    def __len__(self):
+        return len(self.indices)
+
+    def center(self) -> Tuple[float, float]:
+        """Normalized centroid of the cluster's pins"""
+        count = len(self.indices)
+        return self.sum_x / count, self.sum_y / count
+
+    def add(self, index: int, x: float, y: float, code: int):
+        self.indices.add(index)
+        self.sum_x += x
+        self.sum_y += y
+        self.status_counts[code] = self.status_counts.get(code, 0) + 1
+
+    def discard(self, index: int, x: float, y: float, code: int):
+        self.indices.discard(index)
+        self.sum_x -= x
+        self.sum_y -= y
+        self.status_counts[code] -= 1
+        if not self.status_counts[code]:
+            del self.status_counts[code]
+
+
+class _ClusterGrid:
+    """Clusters of one zoom band: cell -> PinCluster, and each pin's cell"""
+    __slots__ = ("cell_w", "cell_h", "cells", "cell_of")
+
+    def __init__(self, cell_w: float, cell_h: float):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.cells: Dict[Tuple[int, int], PinCluster] = {}
+        self.cell_of: List[Tuple[int, int]] = []
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell_w), int(y // self.cell_h)
+
+    def add(self, index: int, x: float, y: float, code: int):
+        cell = self.cell(x, y)
+        cluster = self.cells.get(cell)
+        if cluster is None:
+            cluster = self.cells[cell] = PinCluster()
+        cluster.add(index, x, y, code)
+        if index == len(self.cell_of):
+            self.cell_of.append(cell)
+        else:
+            self.cell_of[index] = cell
+
+    def discard(self, index: int, x: float, y: float, code: int):
+        cell = self.cell_of[index]
+        cluster = self.cells[cell]
+        cluster.discard(index, x, y, code)
+        if not cluster.indices:
+            del self.cells[cell]
+
+
+class PinCollection:
+    """Pin dicts plus columnar positions and status codes"""
+    __slots__ = ("pins", "xs", "ys", "codes", "status_names", "status_colors", "_status_codes", "_groups",
+                 "_grids")
+
+    def __init__(self, pins: Optional[List[Dict[str, Any]]] = None):
+        self.status_names: List[Optional[str]] = []
+        self.status_colors: List[str] = []
+        self._status_codes: Dict[Optional[str], int] = {}
+        self.set_pins(pins if pins is not None else [])
+
+    def set_pins(self, pins: List[Dict[str, Any]]):
+        """Use pins (kept by reference) and rebuild the columns"""
+        self.pins = pins
+        self.xs = array("d")
+        self.ys = array("d")
+        self.codes = array("H")
+        self._grids: Dict[Tuple[int, float, float], _ClusterGrid] = {}
+        for pin in pins:
+            self._append_columns(pin)
+        self._groups = None
+
+    def __len__(self):
+        return len(self.pins)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.pins)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.pins[index]
+
+    # --- Editing ---
+    def append(self, pin: Dict[str, Any]):
+        self.pins.append(pin)
+        self._append_columns(pin)
+        self._groups = None
+
+    def remove(self, pin: Dict[str, Any]) -> Optional[int]:
+        """Remove pin (by identity); returns its former index"""
+        index = self.index(pin)
+        if index is not None:
+            del self.pins[index]
+            del self.xs[index]
+            del self.ys[index]
+            del self.codes[index]
+            self._groups = None
+            self._grids = {}  # every later index shifts
+        return index
+
+    def index(self, pin: Dict[str, Any]) -> Optional[int]:
+        if self.pins and self.pins[-1] is pin:  # the pin being placed
+            return len(self.pins) - 1
+        for i, other in enumerate(self.pins):
+            if other is pin:
+                return i
+        return None
+
+    def set_position(self, index: int, x: float, y: float):
+        """Move pin index to normalized (x, y)"""
+        self.pins[index]["pos"] = Point(x, y)
+        self._update(index, x, y, self.codes[index])
+
+    def refresh(self, index: int):
+        """Re-read the position and status of pin index after it was edited"""
+        pin = self.pins[index]
+        x, y = point_xy(pin.get("pos"))
+        code = self.status_code(pin.get("status"))
+        if self.codes[index] != code:
+            self._groups = None
+        self._update(index, x, y, code)
+
+    def _update(self, index: int, x: float, y: float, code: int):
+        for grid in self._grids.values():
+            grid.discard(index, self.xs[index], self.ys[index], self.codes[index])
+            grid.add(index, x, y, code)
+        self.xs[index] = x
+        self.ys[index] = y
+        self.codes[index] = code
+
+    def sync(self):
+        """Rebuild the columns if pins was changed behind the collection's back"""
+        if len(self.xs) != len(self.pins):
+            self.set_pins(self.pins)
+
+    def _append_columns(self, pin: Dict[str, Any]):
+        x, y = point_xy(pin.get("pos"))
+        code = self.status_code(pin.get("status"))
+        for grid in self._grids.values():
+            grid.add(len(self.xs), x, y, code)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.codes.append(code)
+
+    # --- Statuses ---
+    def status_code(self, status: Optional[str]) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self.status_names)
+            self.status_names.append(status)
+            self.status_colors.append(get_status_color(status))
+        return code
+
+    def status_groups(self) -> List[Tuple[int, List[int]]]:
+        """(status code, pin indices) for each status in use"""
+        if self._groups is None:
+            groups: Dict[int, List[int]] = {}
+            for i, code in enumerate(self.codes):
+                groups.setdefault(code, []).append(i)
+            self._groups = sorted(groups.items())
+        return self._groups
+
+    # --- Geometry ---
+    def screen_positions(self, width: float, height: float,
+                         x_offset: float = 0.0, y_offset: float = 0.0) -> Tuple[array, array]:
+        """All pin positions scaled to a width x height drawing placed at the offsets"""
+        return (array("d", [x * width + x_offset for x in self.xs]),
+                array("d", [y * height + y_offset for y in self.ys]))
+
+    def hit_test(self, x: float, y: float, width: float, height: float, tolerance: float) -> Optional[int]:
+        """
+        Index of the first pin within tolerance (Manhattan distance) of (x, y),
+        all in the units of a width x height drawing; None if there is none.
+        """
+        nx, ny = x / width, y / height
+        for i, (px, py) in enumerate(zip(self.xs, self.ys)):
+            if abs(px - nx) * width + abs(py - ny) * height < tolerance:
+                return i
+        return None
+
+    # --- Clustering ---
+    def clusters(self, scale: float, width: float, height: float) -> Optional[List[PinCluster]]:
+        """
+        Clusters of the pins of a width x height drawing shown at scale (a
+        single pin is a cluster of one), or None if pins are not clustered at
+        that scale.
+        """
+        if scale >= CLUSTER_MAX_SCALE or not width or not height:
+            return None
+        band = zoom_band(scale)
+        key = (band, width, height)
+        grid = self._grids.get(key)
+        if grid is None:
+            # Cells are CLUSTER_CELL_PX on screen at the band's lowest scale
+            band_scale = 2 ** (band / BANDS_PER_OCTAVE)
+            grid = _ClusterGrid(CLUSTER_CELL_PX / (width * band_scale), CLUSTER_CELL_PX / (height * band_scale))
+            for i, (x, y, code) in enumerate(zip(self.xs, self.ys, self.codes)):
+                grid.add(i, x, y, code)
+            self._grids[key] = grid
+        return list(grid.cells.values())
@@ -0,0 +1,403 @@
+"""
+PDFPinSceneViewer: the elevation drawing viewer on QGraphicsView.
+
+A drop-in alternative to PDFPinViewer (same pins property, set_mode, zoom and
+pin_created / pin_updated signals) that keeps the drawing, shapes and pins
+as items of a QGraphicsScene instead of repainting everything in
+paintEvent:
+
+- scene coordinates are pixels of the rendered drawing (the same units as
+  PDFPinViewer's shapes); pins are placed at pos * drawing size
+- hit testing goes through the scene's BSP index (QGraphicsView.items)
+- pins and shapes are cached as device pixmaps (DeviceCoordinateCache), so
+  only items that change are redrawn
+- zoom/pan are view transforms: the wheel zooms around the cursor and pan
+  mode drags the view
+
+ElevationOverviewWidget uses it when FACADE_SCENE_VIEWER=1 is set.
+"""
+
+import os
+
+from PySide6.QtCore import Signal, Qt, QPoint, QPointF, QRectF
+from PySide6.QtGui import QBrush, QColor, QImage, QPainter, QPainterPath, QPainterPathStroker, QPen, QPixmap
+from PySide6.QtWidgets import (
+    QDialog, QGraphicsEllipseItem, QGraphicsItem, QGraphicsPathItem, QGraphicsPixmapItem,
+    QGraphicsScene, QGraphicsView
+)
+
+from config.status import get_status_color
+from Project.models import Point, point_xy
+
+ENV_VAR = "FACADE_SCENE_VIEWER"
+PIN_RADIUS = 10
+LINE_HIT_WIDTH = 20  # pixels around a line that count as on it
+MIN_ZOOM = 0.05
+MAX_ZOOM = 40.0
+Z_SHAPE, Z_PIN, Z_ACTIVE = 1, 2, 3
+
+
+def scene_viewer_enabled() -> bool:
+    """Whether ENV_VAR asks for the QGraphicsView viewer"""
+    return os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+
+
+class PinItem(QGraphicsEllipseItem):
+    """A pin: a fixed-size dot (not scaled with the drawing) colored by status"""
+
+    def __init__(self, pin):
+        super().__init__(-PIN_RADIUS, -PIN_RADIUS, 2 * PIN_RADIUS, 2 * PIN_RADIUS)
+        self.pin = pin
+        self.hovered = False
+        self.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setAcceptHoverEvents(True)
+        self.setZValue(Z_PIN)
+        self.update_style()
+
+    def update_style(self):
+        color = QColor(get_status_color(self.pin.get('status')))
+        if self.hovered:
+            self.setBrush(QBrush(color.lighter(130)))
+            self.setPen(QPen(QColor(30, 30, 30), 4))  # dark border
+        else:
+            self.setBrush(QBrush(color))
+            self.setPen(QPen(color))
+
+    def hoverEnterEvent(self, event):
+        self.hovered = True
+        self.update_style()
+        super().hoverEnterEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        self.hovered = False
+        self.update_style()
+        super().hoverLeaveEvent(event)
+
+
+class ShapeItem(QGraphicsPathItem):
+    """A drawn line, square or circle; shape dicts are {type, start, end} in scene pixels"""
+
+    def __init__(self, shape):
+        super().__init__()
+        self.shape_data = shape
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setAcceptHoverEvents(True)
+        self.setZValue(Z_SHAPE)
+        self.set_highlight(False)
+        self.update_path()
+
+    def update_path(self):
+        shape = self.shape_data
+        start, end = QPointF(shape['start']), QPointF(shape['end'])
+        path = QPainterPath()
+        if shape['type'] == 'line':
+            path.moveTo(start)
+            path.lineTo(end)
+        elif shape['type'] == 'square':
+            path.addRect(QRectF(start, end).normalized())
+        elif shape['type'] == 'circle':
+            path.addEllipse(QRectF(start, end).normalized())
+        self.setPath(path)
+
+    def set_highlight(self, highlight):
+        pen = QPen(QColor(30, 30, 30), 4) if highlight else QPen(QColor(0, 0, 255), 2)
+        pen.setCosmetic(True)
+        self.setPen(pen)
+
+    def shape(self):
+        if self.shape_data['type'] == 'line':
+            stroker = QPainterPathStroker()
+            stroker.setWidth(LINE_HIT_WIDTH)
+            return stroker.createStroke(self.path())
+        path = QPainterPath(self.path())
+        path.closeSubpath()
+        return path
+
+    def hoverEnterEvent(self, event):
+        self.set_highlight(True)
+        super().hoverEnterEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        self.set_highlight(False)
+        super().hoverLeaveEvent(event)
+
+
+class PDFPinSceneViewer(QGraphicsView):
+    pin_created = Signal(dict)  # Emitted when a new pin is created
+    pin_updated = Signal(dict)  # Emitted when a pin is updated
+
+    def __init__(self, pdf_path=None, parent=None, chat_manager=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.chat_manager = chat_manager
+        self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setScene(self._scene)
+        self.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setStyleSheet("background: #eee; border: 1px solid #bbb; font-size: 18px;")
+        self.setMouseTracking(True)
+        self._pins = []
+        self.pin_items = {}  # id(pin) -> PinItem
+        self.shapes = []  # List of dicts: {type, start, end, id}
+        self.shape_items = []  # ShapeItem per shape
+        self.annotation_store = None  # AnnotationStore the shapes are saved to
+        self.mode = 'pin'  # or 'draw' or 'pan' or 'move' or 'mouse'
+        self.draw_shape = 'line'  # 'line', 'circle', 'square'
+        self.base_pixmap = None
+        self.zoom_level = 1.0
+        self.current_shape_item = None
+        self.moving_item = None  # (item, press scene pos, item start pos)
+        self.temp_pin_item = None
+        self.display_pdf()
+
+    # --- Content ---
+    def display_pdf(self):
+        message = None
+        if self.pdf_path and self.pdf_path.lower().endswith('.pdf'):
+            try:
+                import fitz  # PyMuPDF, imported on first use to keep startup fast
+                doc = fitz.open(self.pdf_path)
+                if doc.page_count > 0:
+                    page = doc.load_page(0)
+                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
+                    image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888)
+                    self.base_pixmap = QPixmap.fromImage(image)
+                else:
+                    message = "PDF (empty)"
+            except Exception as e:
+                message = "PDF error: " + str(e)
+        elif self.pdf_path:
+            message = "Not a PDF file: " + str(self.pdf_path)
+        else:
+            message = "No PDF selected."
+        if message:
+            self._scene.addText(message)
+            return
+        pixmap_item = QGraphicsPixmapItem(self.base_pixmap)
+        pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+        pixmap_item.setZValue(0)
+        self._scene.addItem(pixmap_item)
+        self._scene.setSceneRect(QRectF(self.base_pixmap.rect()))
+
+    @property
+    def pins(self):
+        """The pin dicts shown; assigning a list replaces the pin items"""
+        return self._pins
+
+    @pins.setter
+    def pins(self, pins):
+        for item in self.pin_items.values():
+            self._scene.removeItem(item)
+        self.pin_items = {}
+        self._pins = pins
+        for pin in pins:
+            self._add_pin_item(pin)
+
+    def load_shapes(self, store):
+        """Show the shapes of store (an AnnotationStore) and save drawn shapes to it"""
+        self.annotation_store = store
+        for item in self.shape_items:
+            self._scene.removeItem(item)
+        self.shapes = []
+        self.shape_items = []
+        if not self.base_pixmap:
+            return
+        width, height = self.base_pixmap.width(), self.base_pixmap.height()
+        for record in store.shapes():
+            start, end = record['start'], record['end']
+            shape = {
+                'type': record['type'], 'id': record['id'],
+                'start': QPoint(round(start['x'] * width), round(start['y'] * height)),
+                'end': QPoint(round(end['x'] * width), round(end['y'] * height)),
+            }
+            item = ShapeItem(shape)
+            self._scene.addItem(item)
+            self.shapes.append(shape)
+            self.shape_items.append(item)
+
+    def _save_shape(self, shape):
+        """Write a new or changed shape to the annotation store"""
+        if self.annotation_store is None or not self.base_pixmap:
+            return
+        width, height = self.base_pixmap.width(), self.base_pixmap.height()
+        start = (shape['start'].x() / width, shape['start'].y() / height)
+        end = (shape['end'].x() / width, shape['end'].y() / height)
+        if shape.get('id') is None:
+            shape['id'] = self.annotation_store.add(shape['type'], start, end)
+        else:
+            self.annotation_store.update(shape['id'], shape['type'], start, end)
+
+    def _add_pin_item(self, pin):
+        item = PinItem(pin)
+        item.setPos(self._pin_scene_pos(pin))
+        self._scene.addItem(item)
+        self.pin_items[id(pin)] = item
+        return item
+
+    def _remove_pin(self, pin):
+        item = self.pin_items.pop(id(pin), None)
+        if item is not None:
+            self._scene.removeItem(item)
+        self._pins[:] = [other for other in self._pins if other is not pin]
+
+    def _pin_scene_pos(self, pin):
+        x, y = point_xy(pin.get('pos'))
+        if not self.base_pixmap:
+            return QPointF(0, 0)
+        return QPointF(x * self.base_pixmap.width(), y * self.base_pixmap.height())
+
+    def _normalized(self, scene_pos):
+        return Point(scene_pos.x() / self.base_pixmap.width(), scene_pos.y() / self.base_pixmap.height())
+
+    def _in_drawing(self, scene_pos):
+        return self.base_pixmap is not None and QRectF(self.base_pixmap.rect()).contains(scene_pos)
+
+    def _item_at(self, view_pos, item_type):
+        """Topmost item of item_type under a view position (BSP lookup)"""
+        for item in self.items(view_pos):
+            if isinstance(item, item_type):
+                return item
+        return None
+
+    # --- Modes and zoom ---
+    def set_mode(self, mode, shape=None):
+        self.mode = mode
+        if mode == 'draw' and shape:
+            self.draw_shape = shape
+        self.setDragMode(QGraphicsView.ScrollHandDrag if mode == 'pan' else QGraphicsView.NoDrag)
+        if mode == 'draw':
+            self.viewport().setCursor(Qt.CrossCursor)
+        elif mode == 'pan':
+            self.viewport().setCursor(Qt.OpenHandCursor)
+        elif mode == 'move':
+            self.viewport().setCursor(Qt.SizeAllCursor)
+        else:
+            self.viewport().setCursor(Qt.ArrowCursor)
+
+    def zoom(self, factor):
+        new_level = max(MIN_ZOOM, min(MAX_ZOOM, self.zoom_level * factor))
+        factor = new_level / self.zoom_level
+        if factor != 1.0:
+            self.zoom_level = new_level
+            self.scale(factor, factor)
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta().y()
+        if delta > 0:
+            self.zoom(1.15)
+        elif delta < 0:
+            self.zoom(0.87)
+        event.accept()
+
+    # --- Mouse ---
+    def mousePressEvent(self, event):
+        if self.mode == 'pan' or event.button() != Qt.LeftButton or not self.base_pixmap:
+            super().mousePressEvent(event)
+            return
+        scene_pos = self.mapToScene(event.pos())
+        pin_item = self._item_at(event.pos(), PinItem)
+        if self.mode in ('mouse', 'pin') and pin_item is not None:
+            self.open_pin_dialog(pin_item.pin, new_pin=False)
+        elif self.mode == 'pin' and self._in_drawing(scene_pos):
+            # Start drag-to-place for new pin
+            pin = {"pos": self._normalized(scene_pos), "chat": []}
+            self._pins.append(pin)
+            self.temp_pin_item = self._add_pin_item(pin)
+            self.temp_pin_item.setZValue(Z_ACTIVE)
+        elif self.mode == 'draw' and self._in_drawing(scene_pos):
+            start = QPoint(int(scene_pos.x()), int(scene_pos.y()))
+            self.current_shape_item = ShapeItem({'type': self.draw_shape, 'start': start, 'end': start})
+            self._scene.addItem(self.current_shape_item)
+        elif self.mode == 'move':
+            item = pin_item or self._item_at(event.pos(), ShapeItem)
+            if item is not None:
+                self.moving_item = (item, scene_pos, item.pos())
+                item.setZValue(Z_ACTIVE)
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        if not self.base_pixmap:
+            return
+        scene_pos = self.mapToScene(event.pos())
+        if self.current_shape_item is not None:
+            if self._in_drawing(scene_pos):
+                self.current_shape_item.shape_data['end'] = QPoint(int(scene_pos.x()), int(scene_pos.y()))
+                self.current_shape_item.update_path()
+        elif self.temp_pin_item is not None:
+            if self._in_drawing(scene_pos):
+                self.temp_pin_item.setPos(scene_pos)
+                self.temp_pin_item.pin['pos'] = self._normalized(scene_pos)
+        elif self.moving_item is not None:
+            item, press_pos, start_pos = self.moving_item
+            item.setPos(start_pos + (scene_pos - press_pos))
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self.current_shape_item is not None:
+            self.shapes.append(self.current_shape_item.shape_data)
+            self.shape_items.append(self.current_shape_item)
+            self._save_shape(self.current_shape_item.shape_data)
+            self.current_shape_item = None
+        elif self.temp_pin_item is not None:
+            # Finish placing pin and open dialog
+            item = self.temp_pin_item
+            self.temp_pin_item = None
+            item.setZValue(Z_PIN)
+            if self.open_pin_dialog(item.pin, new_pin=True):
+                self.pin_created.emit(item.pin)
+            else:
+                # If dialog cancelled, remove the pin
+                self._remove_pin(item.pin)
+        elif self.moving_item is not None:
+            item = self.moving_item[0]
+            self.moving_item = None
+            if isinstance(item, PinItem):
+                item.setZValue(Z_PIN)
+                item.pin['pos'] = self._normalized(item.pos())
+                self._pin_moved(item.pin)
+            else:
+                self._shape_moved(item)
+
+    def _pin_moved(self, pin):
+        """Store a dragged pin's new position in the overview's findings and save it like a dialog edit"""
+        parent = self.parent()
+        while parent is not None and not hasattr(parent, 'findings'):
+            parent = parent.parent() if hasattr(parent, 'parent') else None
+        if parent is not None:
+            # The findings may be other dicts for the same pins (after a reload)
+            for finding in parent.findings:
+                if finding is not pin and pin.get('pin_id') is not None and finding.get('pin_id') == pin['pin_id']:
+                    finding['pos'] = pin['pos']
+            parent.refresh_findings_sidebar()
+        self.pin_updated.emit(pin)
+
+    def _shape_moved(self, item):
+        """Fold a dragged shape item's offset back into its start/end points"""
+        delta = item.pos().toPoint()
+        item.shape_data['start'] = item.shape_data['start'] + delta
+        item.shape_data['end'] = item.shape_data['end'] + delta
+        item.setPos(0, 0)
+        item.setZValue(Z_SHAPE)
+        item.update_path()
+        self._save_shape(item.shape_data)
+
+    def open_pin_dialog(self, pin, new_pin=False):
+        from Project.Elevations.elevation_overview import PinTaskDialog
+        dlg = PinTaskDialog(pin, new_pin=new_pin, pdf_path=self.pdf_path, chat_manager=self.chat_manager)
+        if dlg.exec() != QDialog.Accepted:
+            return False
+        pin['chat'] = dlg.get_chat()
+        pin['name'] = dlg.get_name()
+        pin['status'] = dlg.get_status()
+        pin['material'] = dlg.get_material()
+        pin['defect'] = dlg.get_defect()
+        item = self.pin_items.get(id(pin))
+        if item is not None:
+            item.update_style()
+        self.pin_updated.emit(pin)
+        return True
@@ -1,12 +1,11 @@
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QScrollArea, QLabel, QFrame, 
-                              QHBoxLayout, QPushButton, QSizePolicy)
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QScrollArea, QLabel, 
+                              QHBoxLayout, QPushButton, QListView, QAbstractItemView)
 from PySide6.QtCore import Qt
-from ..Elevations.finding_card import FindingCard
 from config.status import STATUS_OPTIONS, STATUS_COLORS
-from styles import (FINDINGS_COLUMN_CONTAINER_STYLE, FINDINGS_SCROLL_AREA_STYLE, 
-                   FINDINGS_NEW_TASK_BTN_STYLE, get_findings_card_style, 
-                   get_findings_column_header_style)
+from styles import (FINDINGS_COLUMN_CONTAINER_STYLE, FINDINGS_LIST_VIEW_STYLE,
+                   FINDINGS_NEW_TASK_BTN_STYLE, get_findings_column_header_style)
+from .kanban_model import FindingsColumnModel, FindingCardDelegate, group_pins_by_status
 
 
 class FindingsWidget(QWidget):
@@ -36,50 +35,73 @@ class FindingsWidget(QWidget):
         self.board_layout.setSpacing(16)
         self.board_layout.setContentsMargins(8, 8, 8, 8)
 
+        self.columns = {}  # status -> {"model", "view", "header"}
+        self.card_delegate = FindingCardDelegate(self)
         self._populate_kanban_board()
 
         scroll.setWidget(self.board)
         main_layout.addWidget(scroll)
+
+        # Refresh from the shared project cache whenever the project's pins change
+        from Project.project_cache import get_project_cache
+        notifier = get_project_cache().qt_notifier()
+        if notifier is not None:
+            notifier.changed.connect(self._on_project_data_changed)
+
+    def _on_project_data_changed(self, project_name, filename):
+        """Apply pin changes to the board when the visible project's pins change"""
+        if project_name == self.project_name and filename == "pins.json" and self.isVisible():
+            self.refresh()
     
     def _populate_kanban_board(self):
         """Populate the kanban board with project-specific findings"""
         if not self.project_name:
-            # Show empty state
-            empty_label = QLabel("No project selected")
-            empty_label.setStyleSheet("color: #666; font-style: italic; font-size: 16px;")
-            self.board_layout.addWidget(empty_label)
+            self._show_board_message("No project selected", "color: #666; font-style: italic; font-size: 16px;")
             return
         
         try:
-            # Load project pins directly since we're working with pin-based findings
-            from ..Elevations.findings_logic import load_pins
-            pins = load_pins(self.project_name)
+            # Read the cached project pins directly since we're working with pin-based findings
+            from ..Elevations.findings_logic import get_shared_pins
+            pins = get_shared_pins(self.project_name)
             print(f"[FindingsWidget] Loaded {len(pins)} pins for project '{self.project_name}'")
             
             # Group pins by status
-            findings_by_status = {status: [] for status in STATUS_OPTIONS}
-            findings_by_status['Other'] = []
-            
-            for pin in pins:
-                status = pin.get('status', STATUS_OPTIONS[0]) or STATUS_OPTIONS[0]
-                if status in findings_by_status:
-                    findings_by_status[status].append(pin)
-                else:
-                    findings_by_status['Other'].append(pin)
-            
+            findings_by_status = group_pins_by_status(pins)
             print(f"[FindingsWidget] Grouped pins by status: {[(status, len(pins)) for status, pins in findings_by_status.items() if pins]}")
                     
         except Exception as e:
             print(f"[ERROR] Failed to load pins for project {self.project_name}: {e}")
-            error_label = QLabel("Error loading findings")
-            error_label.setStyleSheet("color: #d32f2f; font-style: italic; font-size: 16px;")
-            self.board_layout.addWidget(error_label)
+            self._show_board_message("Error loading findings", "color: #d32f2f; font-style: italic; font-size: 16px;")
             return
 
-        # Create a column for each status
-        for status in STATUS_OPTIONS:
+        if not self.columns:
+            self._build_columns()
+
+        # Only the cards that changed are touched; a pin that changed status is
+        # removed from one column model and inserted into another
+        for status, column in self.columns.items():
             status_pins = findings_by_status.get(status, [])
-            
+            column["model"].sync(status_pins)
+            column["header"].setText(f"{status} ({len(status_pins)})")
+
+    def _show_board_message(self, text, style):
+        """Replace the board with a single message label"""
+        self._clear_board()
+        label = QLabel(text)
+        label.setStyleSheet(style)
+        self.board_layout.addWidget(label)
+
+    def _clear_board(self):
+        while self.board_layout.count() > 0:
+            item = self.board_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self.columns = {}
+
+    def _build_columns(self):
+        """Create one column (header, list view, '+ New task') per status"""
+        self._clear_board()
+        for status in STATUS_OPTIONS:
             # Create column container
             col_container = QWidget()
             col_container.setFixedWidth(280)  # Fixed width for consistent columns
@@ -90,35 +112,24 @@ class FindingsWidget(QWidget):
             col_main_layout.setSpacing(8)
 
             # Column header with status and count - colored by status
-            count = len(status_pins)
             status_color = STATUS_COLORS.get(status, "#cccccc")
-            header = QLabel(f"{status} ({count})")
+            header = QLabel(f"{status} (0)")
             header.setStyleSheet(get_findings_column_header_style(status_color))
             col_main_layout.addWidget(header)
 
-            # Scrollable area for findings in this column
-            scroll_area = QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-            scroll_area.setStyleSheet(FINDINGS_SCROLL_AREA_STYLE)
-            
-            # Container for the findings cards
-            cards_widget = QWidget()
-            cards_layout = QVBoxLayout(cards_widget)
-            cards_layout.setContentsMargins(0, 0, 0, 0)
-            cards_layout.setSpacing(8)
-
-            # Add finding cards for this status
-            for pin in status_pins:
-                card = self._create_finding_card(pin)
-                cards_layout.addWidget(card)
-
-            # Add stretch to push cards to top
-            cards_layout.addStretch(1)
-            
-            scroll_area.setWidget(cards_widget)
-            col_main_layout.addWidget(scroll_area)
+            # Virtualized list of cards: only visible rows are painted
+            model = FindingsColumnModel(status, self)
+            view = QListView()
+            view.setModel(model)
+            view.setItemDelegate(self.card_delegate)
+            view.setUniformItemSizes(True)
+            view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+            view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+            view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            view.setMouseTracking(True)
+            view.setStyleSheet(FINDINGS_LIST_VIEW_STYLE)
+            col_main_layout.addWidget(view)
 
             # '+ New task' button at bottom of column
             new_task_btn = QPushButton("+ New task")
@@ -126,72 +137,19 @@ class FindingsWidget(QWidget):
             col_main_layout.addWidget(new_task_btn)
 
             self.board_layout.addWidget(col_container)
+            self.columns[status] = {"model": model, "view": view, "header": header}
         
         # Add stretch at the end
         self.board_layout.addStretch(1)
     
-    def _create_finding_card(self, pin):
-        """Create a finding card widget for a pin"""
-        # Get status color for the card
-        status = pin.get('status', STATUS_OPTIONS[0]) or STATUS_OPTIONS[0]
-        status_color = STATUS_COLORS.get(status, "#cccccc")
-        
-        card = QFrame()
-        card.setStyleSheet(get_findings_card_style(status_color))
-        
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(12, 10, 12, 10)
-        layout.setSpacing(6)
-        
-        # Pin name/title
-        title = QLabel(pin.get('name', 'Untitled Finding'))
-        title.setStyleSheet("font-weight: bold; font-size: 14px; color: #333;")
-        title.setWordWrap(True)
-        layout.addWidget(title)
-        
-        # Material and defect info
-        material = pin.get('material', '')
-        defect = pin.get('defect', '')
-        if material or defect:
-            info_text = []
-            if material:
-                info_text.append(f"Material: {material}")
-            if defect:
-                info_text.append(f"Defect: {defect}")
-            
-            info_label = QLabel(" | ".join(info_text))
-            info_label.setStyleSheet("font-size: 12px; color: #666;")
-            info_label.setWordWrap(True)
-            layout.addWidget(info_label)
-        
-        # Elevation info
-        elevation = pin.get('elevation', '')
-        if elevation:
-            elev_label = QLabel(f"📍 {elevation}")
-            elev_label.setStyleSheet("font-size: 11px; color: #888;")
-            layout.addWidget(elev_label)
-        
-        # Pin ID (for debugging/reference)
-        pin_id = pin.get('pin_id', '')
-        if pin_id:
-            id_label = QLabel(f"Pin #{pin_id}")
-            id_label.setStyleSheet("font-size: 10px; color: #aaa;")
-            layout.addWidget(id_label)
-        
-        return card
-    
     def refresh(self, project_name=None):
         """Refresh the kanban board with updated project findings"""
-        if project_name:
+        if project_name and project_name != self.project_name:
             self.project_name = project_name
+            # Different project: start from empty columns rather than diffing
+            for column in self.columns.values():
+                column["model"].set_pins([])
         
-        # Clear existing columns
-        while self.board_layout.count() > 0:
-            item = self.board_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Repopulate
         self._populate_kanban_board()
     
     def set_project(self, project_name):
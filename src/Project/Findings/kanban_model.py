@@ -0,0 +1,190 @@
+"""
+Model/view pieces for the findings kanban board.
+
+Each status column is a FindingsColumnModel shown in a QListView with a
+FindingCardDelegate. The delegate paints cards directly, so only the rows in
+view cost anything, and FindingsColumnModel.sync applies the difference
+between the current and the new pins (removals, insertions and in-place
+updates keyed by pin_id) instead of rebuilding the column.
+"""
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+from config.status import STATUS_OPTIONS, STATUS_COLORS
+
+PIN_ROLE = Qt.ItemDataRole.UserRole + 1
+
+CARD_MARGIN = 4
+CARD_PADDING_X = 12
+CARD_PADDING_Y = 10
+CARD_LINE_SPACING = 4
+CARD_STRIPE_WIDTH = 4
+
+
+def _pin_key(pin):
+    return pin.get("pin_id")
+
+
+class FindingsColumnModel(QAbstractListModel):
+    """Pins of one status column. Pins are the shared cached dicts: read-only."""
+
+    def __init__(self, status, parent=None):
+        super().__init__(parent)
+        self.status = status
+        self._pins = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._pins)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._pins):
+            return None
+        pin = self._pins[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return pin.get("name", "Untitled Finding")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Pin #{pin.get('pin_id', '')} - {pin.get('elevation', '')}"
+        if role == PIN_ROLE:
+            return pin
+        return None
+
+    def pin_at(self, row):
+        return self._pins[row]
+
+    def set_pins(self, pins):
+        self.beginResetModel()
+        self._pins = list(pins)
+        self.endResetModel()
+
+    def sync(self, pins):
+        """
+        Update the column to show pins, emitting row removals, insertions and
+        dataChanged for the pins that differ. Falls back to a reset if pins
+        lack ids or the surviving pins were reordered.
+        """
+        pins = list(pins)
+        old_keys = [_pin_key(p) for p in self._pins]
+        new_keys = [_pin_key(p) for p in pins]
+        if (None in old_keys or None in new_keys
+                or len(set(old_keys)) != len(old_keys) or len(set(new_keys)) != len(new_keys)):
+            self.set_pins(pins)
+            return
+        new_key_set = set(new_keys)
+        old_key_set = set(old_keys)
+        kept_old = [k for k in old_keys if k in new_key_set]
+        kept_new = [k for k in new_keys if k in old_key_set]
+        if kept_old != kept_new:
+            self.set_pins(pins)
+            return
+
+        # Remove rows that are gone, last first so row numbers stay valid
+        for row in range(len(self._pins) - 1, -1, -1):
+            if old_keys[row] not in new_key_set:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._pins[row]
+                self.endRemoveRows()
+
+        # Walk the new order, inserting new pins and refreshing changed ones
+        for row, pin in enumerate(pins):
+            key = new_keys[row]
+            if key not in old_key_set:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._pins.insert(row, pin)
+                self.endInsertRows()
+            else:
+                old = self._pins[row]
+                self._pins[row] = pin
+                if old is not pin and old != pin:
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+
+
+def group_pins_by_status(pins):
+    """{status: [pins]} for every status in STATUS_OPTIONS plus 'Other'"""
+    groups = {status: [] for status in STATUS_OPTIONS}
+    groups["Other"] = []
+    for pin in pins:
+        status = pin.get("status", STATUS_OPTIONS[0]) or STATUS_OPTIONS[0]
+        groups.get(status, groups["Other"]).append(pin)
+    return groups
+
+
+class FindingCardDelegate(QStyledItemDelegate):
+    """Paints a finding card (same look as the old QFrame cards) for each row"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(12)
+        self.elevation_font = QFont()
+        self.elevation_font.setPixelSize(11)
+        self.id_font = QFont()
+        self.id_font.setPixelSize(10)
+        self._lines = [
+            (self.title_font, QColor("#333333")),
+            (self.info_font, QColor("#666666")),
+            (self.elevation_font, QColor("#888888")),
+            (self.id_font, QColor("#aaaaaa")),
+        ]
+
+    @staticmethod
+    def _card_lines(pin):
+        material = pin.get("material", "")
+        defect = pin.get("defect", "")
+        info = []
+        if material:
+            info.append(f"Material: {material}")
+        if defect:
+            info.append(f"Defect: {defect}")
+        elevation = pin.get("elevation", "")
+        pin_id = pin.get("pin_id", "")
+        return [
+            pin.get("name", "Untitled Finding"),
+            " | ".join(info),
+            f"📍 {elevation}" if elevation else "",
+            f"Pin #{pin_id}" if pin_id else "",
+        ]
+
+    def sizeHint(self, option, index):
+        # Every card has the same height so the view can use uniform item sizes
+        height = 2 * (CARD_MARGIN + CARD_PADDING_Y)
+        for font, _ in self._lines:
+            height += QFontMetrics(font).height() + CARD_LINE_SPACING
+        return QSize(option.rect.width(), height - CARD_LINE_SPACING)
+
+    def paint(self, painter, option, index):
+        pin = index.data(PIN_ROLE)
+        if pin is None:
+            return super().paint(painter, option, index)
+        status = pin.get("status", STATUS_OPTIONS[0]) or STATUS_OPTIONS[0]
+        status_color = QColor(STATUS_COLORS.get(status, "#cccccc"))
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        card = option.rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+        painter.setPen(QPen(status_color if hovered or selected else QColor("#dee2e6"), 1))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(card, 6, 6)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(status_color)
+        painter.drawRoundedRect(QRect(card.left(), card.top(), CARD_STRIPE_WIDTH, card.height()), 2, 2)
+
+        x = card.left() + CARD_STRIPE_WIDTH + CARD_PADDING_X
+        width = card.right() - CARD_PADDING_X - x
+        y = card.top() + CARD_PADDING_Y
+        for (font, color), text in zip(self._lines, self._card_lines(pin)):
+            metrics = QFontMetrics(font)
+            if text:
+                painter.setFont(font)
+                painter.setPen(color)
+                elided = metrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+                painter.drawText(QRect(x, y, width, metrics.height()),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+            y += metrics.height() + CARD_LINE_SPACING
+        painter.restore()
@@ -4,7 +4,6 @@ Provides a visual overview of all uploaded photos in the project
 """
 
 import os
-import json
 from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea,
@@ -14,6 +13,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QPixmap, QFont, QPalette, QColor
 from PySide6.QtCore import Qt, QSize, Signal
 from Project.Elevations.chat_data_manager import ChatDataManager
+from Project.thumbnails import get_thumbnail, PHOTO_THUMBNAIL_SIZE
 
 
 class PhotoThumbnail(QLabel):
@@ -45,7 +45,8 @@ class PhotoThumbnail(QLabel):
         """Load and display the photo thumbnail"""
         photo_path = self.photo_info.get('path')
         if photo_path and os.path.exists(photo_path):
-            pixmap = QPixmap(photo_path)
+            # Small cached copy instead of decoding the full size photo (see Project/thumbnails.py)
+            pixmap = QPixmap(get_thumbnail(photo_path, PHOTO_THUMBNAIL_SIZE) or photo_path)
             if not pixmap.isNull():
                 # Scale to fit the thumbnail size while maintaining aspect ratio
                 scaled_pixmap = pixmap.scaled(116, 116, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -368,14 +369,11 @@ class PhotoGalleryWidget(QWidget):
                 self.status_label.setText("No chat data found")
                 return
             
-            # Load pins.json to get pin information including elevation names
-            pins_file = os.path.join(self.chat_manager.project_dir, 'pins.json')
-            pins_data = {}
-            if os.path.exists(pins_file):
-                with open(pins_file, 'r', encoding='utf-8') as f:
-                    pins_list = json.load(f)
-                    # Convert to dict for easier lookup
-                    pins_data = {pin.get('pin_id', 0): pin for pin in pins_list}
+            # Get pin information including elevation names from the shared project cache
+            from Project.Elevations.findings_logic import get_shared_pins
+            pins_list = get_shared_pins(self.project_name)
+            # Convert to dict for easier lookup
+            pins_data = {pin.get('pin_id', 0): pin for pin in pins_list}
             
             # Organize photos by elevation and pin
             elevation_photos = {}
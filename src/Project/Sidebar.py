@@ -31,6 +31,17 @@ class SidebarNav(QWidget):
         self.layout.addWidget(self.defect_list)
         self.refresh()
 
+        # The pin counts are updated in the background after a save: redraw when they land
+        from Project.project_cache import get_project_cache
+        notifier = get_project_cache().qt_notifier()
+        if notifier is not None:
+            notifier.changed.connect(self._on_project_data_changed)
+
+    def _on_project_data_changed(self, project_name, filename):
+        from Project.project_aggregates import AGGREGATES_FILENAME
+        if project_name == self.project_name and filename == AGGREGATES_FILENAME:
+            self.refresh()
+
     def refresh(self, project_name=None):
         """Refresh the sidebar with project-specific findings"""
         # Update project name if provided
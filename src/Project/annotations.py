@@ -0,0 +1,193 @@
+"""
+Annotation shapes (lines, squares, circles) drawn on elevation drawings.
+
+Each elevation's shapes are kept in one JSON Lines file next to the pin
+partitions, keyed the same way (elevation id, else a key from the name):
+
+    storage/<project>/annotations/<elevation key>.jsonl
+
+Every line is a whole shape, in normalized 0..1 drawing coordinates:
+
+    {"id": 3, "type": "line", "start": {"x": 0.1, "y": 0.2}, "end": {"x": 0.4, "y": 0.2}}
+    {"id": 3, "deleted": true}
+
+Adding or changing a shape appends one line; the last line for an id wins.
+When most lines are superseded the file is compacted (rewritten atomically
+with one line per live shape). The file is read the first time an
+elevation's shapes are needed, i.e. when its drawing is opened.
+
+ShapeGridIndex is a uniform grid over shape bounding boxes that the viewers
+use to hit test only the shapes near a point.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ANNOTATIONS_DIRNAME = "annotations"
+SHAPE_TYPES = ("line", "square", "circle")
+COMPACT_MIN_LINES = 64  # don't bother compacting small files
+
+
+def get_annotations_path(project_dir: str, key: str) -> str:
+    return os.path.join(project_dir, ANNOTATIONS_DIRNAME, f"{key}.jsonl")
+
+
+def _valid_shape(record: Dict[str, Any]) -> bool:
+    if record.get("type") not in SHAPE_TYPES or not isinstance(record.get("id"), int):
+        return False
+    return all(isinstance(record.get(end), dict) and
+               all(isinstance(record[end].get(k), (int, float)) for k in ("x", "y"))
+               for end in ("start", "end"))
+
+
+class AnnotationStore:
+    """The shapes of one elevation, read on first use and written one line per change"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._shapes: Optional[Dict[int, Dict[str, Any]]] = None  # id -> shape, loaded on first use
+        self._lines = 0  # lines in the file, live or superseded
+        self._torn = False  # the file ends in a partial line (a write cut short)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_elevation(cls, project_name: str, elevation_name: str, pdf_path: Optional[str] = None,
+                      elevation_id: Optional[str] = None) -> "AnnotationStore":
+        from Project.Elevations.findings_logic import elevation_partition_keys, get_project_storage_dir
+        from Project.pin_partitions import UNASSIGNED_KEY
+        keys = elevation_partition_keys(elevation_name, pdf_path, elevation_id)
+        key = keys[0] if keys else UNASSIGNED_KEY
+        return cls(get_annotations_path(get_project_storage_dir(project_name), key))
+
+    def shapes(self) -> List[Dict[str, Any]]:
+        """Copies of the shapes, in the order they were first drawn"""
+        with self._lock:
+            return [json.loads(json.dumps(shape)) for shape in self._load().values()]
+
+    def _load(self) -> Dict[int, Dict[str, Any]]:
+        if self._shapes is None:
+            shapes: Dict[int, Dict[str, Any]] = {}
+            lines = 0
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        self._torn = not line.endswith("\n")
+                        if not line.strip():
+                            continue
+                        lines += 1
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # a line cut short by a crash
+                        if record.get("deleted"):
+                            shapes.pop(record.get("id"), None)
+                        elif _valid_shape(record):
+                            shapes[record["id"]] = record
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARNING] Could not read annotations {self.path}: {e}")
+            self._shapes = shapes
+            self._lines = lines
+        return self._shapes
+
+    # --- Writing ---
+    def add(self, shape_type: str, start: Tuple[float, float], end: Tuple[float, float]) -> int:
+        """Store a new shape (normalized coordinates); returns its id"""
+        with self._lock:
+            shapes = self._load()
+            shape_id = max(shapes, default=0) + 1
+            self._write(self._record(shape_id, shape_type, start, end))
+            return shape_id
+
+    def update(self, shape_id: int, shape_type: str, start: Tuple[float, float], end: Tuple[float, float]):
+        """Store the new geometry of a shape"""
+        with self._lock:
+            self._load()
+            self._write(self._record(shape_id, shape_type, start, end))
+
+    def remove(self, shape_id: int):
+        with self._lock:
+            if self._load().pop(shape_id, None) is not None:
+                self._append({"id": shape_id, "deleted": True})
+                self._maybe_compact()
+
+    @staticmethod
+    def _record(shape_id, shape_type, start, end) -> Dict[str, Any]:
+        if shape_type not in SHAPE_TYPES:
+            raise ValueError(f"unknown shape type '{shape_type}'")
+        return {"id": shape_id, "type": shape_type,
+                "start": {"x": float(start[0]), "y": float(start[1])},
+                "end": {"x": float(end[0]), "y": float(end[1])}}
+
+    def _write(self, record: Dict[str, Any]):
+        self._shapes[record["id"]] = record
+        self._append(record)
+        self._maybe_compact()
+
+    def _append(self, record: Dict[str, Any]):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(("\n" if self._torn else "") + json.dumps(record) + "\n")
+            self._torn = False
+            self._lines += 1
+        except OSError as e:
+            print(f"[ERROR] Could not save annotation {record.get('id')}: {e}")
+
+    def _maybe_compact(self):
+        if self._lines >= COMPACT_MIN_LINES and self._lines > 2 * len(self._shapes):
+            self._compact()
+
+    def _compact(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self._shapes.values():
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.path)
+            self._lines = len(self._shapes)
+        except OSError as e:
+            print(f"[WARNING] Could not compact annotations {self.path}: {e}")
+
+
+class ShapeGridIndex:
+    """Uniform grid of cells -> keys of the shapes whose bounding box overlaps the cell"""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Any]] = {}
+        self._cells_of: Dict[Any, List[Tuple[int, int]]] = {}
+
+    def _cell_range(self, x0: float, y0: float, x1: float, y1: float) -> Iterable[Tuple[int, int]]:
+        size = self.cell_size
+        cx0, cx1 = int(min(x0, x1) // size), int(max(x0, x1) // size)
+        cy0, cy1 = int(min(y0, y1) // size), int(max(y0, y1) // size)
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def insert(self, key: Any, x0: float, y0: float, x1: float, y1: float, margin: float = 0.0):
+        """Index key over the box (x0, y0)-(x1, y1) grown by margin (replacing its old box)"""
+        self.remove(key)
+        cells = self._cell_range(min(x0, x1) - margin, min(y0, y1) - margin,
+                                 max(x0, x1) + margin, max(y0, y1) + margin)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._cells_of[key] = cells
+
+    def remove(self, key: Any):
+        for cell in self._cells_of.pop(key, ()):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._cells_of.clear()
+
+    def query(self, x: float, y: float) -> Set[Any]:
+        """Keys of the shapes whose (grown) box may contain (x, y)"""
+        size = self.cell_size
+        return set(self._cells.get((int(x // size), int(y // size)), ()))
@@ -0,0 +1,246 @@
+"""
+Reading and writing pins in bulk (CSV, JSON array or JSON Lines).
+
+Records are read one at a time, so an import never holds the input file in
+memory, and turned into pins by record_to_pin, which applies the same checks
+as findings_logic.create_pin. findings_logic.import_pins does the import
+itself (ids, findings, one save); cli.py exposes it on the command line.
+
+CSV columns (and JSON keys) are the pin fields:
+
+    name, material, defect, status, x, y, elevation, elevation_id,
+    assignee, category, color, drop, start_date, end_date, photos
+
+x/y are the position on the drawing as fractions of its width/height (JSON
+records may give "pos": {"x", "y"} instead); photos are separated by ";"
+in CSV. pin_id/finding_id columns are ignored on import: imported pins get
+new ids from the project's id allocator.
+"""
+
+import io
+import csv
+import json
+import math
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+from config.status import STATUS_OPTIONS
+from Project.models import point_xy
+
+FORMATS = ("csv", "json")
+CHUNK_SIZE = 1 << 16
+PHOTO_SEPARATOR = ";"
+REQUIRED_FIELDS = ("name", "defect", "material")
+TEXT_FIELDS = ("name", "material", "defect", "status", "elevation", "elevation_id",
+               "assignee", "category", "color", "drop")
+DATE_FIELDS = ("start_date", "end_date")
+EXPORT_FIELDS = ("pin_id", "finding_id", "name", "material", "defect", "status", "x", "y",
+                 "elevation", "elevation_id", "assignee", "category", "color", "drop",
+                 "start_date", "end_date", "photos")
+
+
+def detect_format(path: str) -> str:
+    """'csv' or 'json' from a file name (.json, .jsonl and .ndjson are json)"""
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".json", ".jsonl", ".ndjson")):
+        return "json"
+    raise ValueError(f"Cannot tell the format of {path}: use a .csv or .json file or give the format")
+
+
+# --- Reading ---
+def iter_csv_records(fp: TextIO) -> Iterator[Dict[str, Any]]:
+    """Rows of a CSV file with a header row, as dicts (empty cells dropped)"""
+    for row in csv.DictReader(fp):
+        yield {key.strip(): value for key, value in row.items()
+               if key and value not in (None, "")}
+
+
+def _iter_json_lines(lines: Iterable[str]) -> Iterator[Any]:
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no}: {e}") from None
+
+
+def _iter_json_array(fp: TextIO, buffer: str) -> Iterator[Any]:
+    """Elements of a top-level JSON array, decoded as the file is read"""
+    decoder = json.JSONDecoder()
+    pos = buffer.index("[") + 1
+    expect_value = True  # after "[" or ",": a value (or "]" right after "[")
+    first = True
+    read_size = CHUNK_SIZE
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            buffer, pos = fp.read(read_size), 0
+            eof = not buffer
+            continue
+        char = buffer[pos]
+        if not expect_value:
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+        if first and char == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ValueError(f"Invalid JSON: {e}") from None
+            # The element continues in the next chunk (read more each time a
+            # single element is larger than what we have)
+            chunk = fp.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            read_size *= 2
+            continue
+        yield value
+        # Keep only the unread part so memory stays bounded by one element
+        buffer, pos = buffer[end:], 0
+        read_size = CHUNK_SIZE
+        expect_value = False
+        first = False
+
+
+def iter_json_records(fp: TextIO) -> Iterator[Any]:
+    """Records of a JSON array or of JSON Lines (one object per line)"""
+    buffer = fp.read(CHUNK_SIZE)
+    stripped = buffer.lstrip()
+    if stripped.startswith("["):
+        yield from _iter_json_array(fp, buffer)
+    else:
+        # Finish the partial last line of the first chunk, then read by line
+        head = io.StringIO(buffer + fp.readline())
+        yield from _iter_json_lines(_chain_lines(head, fp))
+
+
+def _chain_lines(*files: TextIO) -> Iterator[str]:
+    for fp in files:
+        yield from fp
+
+
+def iter_records(fp: TextIO, fmt: str) -> Iterator[Any]:
+    if fmt == "csv":
+        return iter_csv_records(fp)
+    if fmt == "json":
+        return iter_json_records(fp)
+    raise ValueError(f"Unknown pin file format: {fmt}")
+
+
+# --- Validation ---
+def _coordinate(value: Any, axis: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"missing or invalid position '{axis}'") from None
+    if not math.isfinite(number) or not 0.0 <= number <= 1.0:
+        raise ValueError(f"position '{axis}' must be between 0 and 1 (fraction of the drawing)")
+    return number
+
+
+def record_to_pin(record: Any, elevation_name: Optional[str] = None,
+                  elevation_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate an import record and return it as a new pin (without pin_id).
+    elevation_name/elevation_id are used for records that do not name an
+    elevation. Raises ValueError describing the first problem found.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+    pos = record.get("pos")
+    if isinstance(pos, dict):
+        x, y = pos.get("x"), pos.get("y")
+    else:
+        x, y = record.get("x"), record.get("y")
+    pin = {"pos": {"x": _coordinate(x, "x"), "y": _coordinate(y, "y")}, "chat": []}
+    for field in TEXT_FIELDS:
+        value = record.get(field)
+        if value not in (None, ""):
+            pin[field] = str(value).strip()
+    for field in REQUIRED_FIELDS:
+        if not pin.get(field):
+            raise ValueError(f"missing required field '{field}'")
+    status = pin.setdefault("status", STATUS_OPTIONS[0])
+    if status not in STATUS_OPTIONS:
+        raise ValueError(f"unknown status '{status}'")
+    if "elevation" not in pin and "elevation_id" not in pin:
+        if elevation_name:
+            pin["elevation"] = elevation_name
+        if elevation_id:
+            pin["elevation_id"] = elevation_id
+    for field in DATE_FIELDS:
+        value = record.get(field)
+        if value not in (None, ""):
+            try:
+                pin[field] = date.fromisoformat(str(value).strip()).isoformat()
+            except ValueError:
+                raise ValueError(f"'{field}' must be an ISO date (YYYY-MM-DD)") from None
+    photos = record.get("photos")
+    if isinstance(photos, str):
+        photos = [p.strip() for p in photos.split(PHOTO_SEPARATOR) if p.strip()]
+    if photos:
+        if not isinstance(photos, list):
+            raise ValueError("'photos' must be a list or a ';' separated string")
+        pin["photos"] = [str(p) for p in photos]
+    return pin
+
+
+def pin_position_key(pin: Dict[str, Any], elevation_ids: Optional[Dict[str, str]] = None):
+    """
+    Key under which two pins are the same pin (same elevation and position).
+    elevation_ids (see elevation_registry.elevation_ids_by_key) gives the
+    elevation id of pins that only name their elevation.
+    """
+    from Project.pin_partitions import elevation_key
+    x, y = point_xy(pin.get("pos"))
+    elevation = pin.get("elevation_id")
+    if not elevation:
+        name = pin.get("elevation")
+        elevation = (elevation_ids or {}).get(elevation_key(name)) or name
+    return (elevation, round(float(x), 6), round(float(y), 6))
+
+
+# --- Writing ---
+def _export_row(pin: Dict[str, Any]) -> Dict[str, Any]:
+    pos = pin.get("pos") or {}
+    row = {field: pin.get(field) for field in EXPORT_FIELDS}
+    row["x"], row["y"] = pos.get("x"), pos.get("y")
+    return row
+
+
+def write_pins(pins: Iterable[Dict[str, Any]], fp: TextIO, fmt: str) -> int:
+    """
+    Write pins (with dict positions) to fp as CSV or JSON Lines, one at a
+    time, in a form iter_records reads back. Returns the number written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown pin file format: {fmt}")
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for pin in pins:
+            row = _export_row(pin)
+            row["photos"] = PHOTO_SEPARATOR.join(row["photos"] or [])
+            writer.writerow({k: "" if v is None else v for k, v in row.items()})
+            count += 1
+    else:
+        for pin in pins:
+            row = {k: v for k, v in _export_row(pin).items() if v not in (None, "", [])}
+            fp.write(json.dumps(row, ensure_ascii=False))
+            fp.write("\n")
+            count += 1
+    return count
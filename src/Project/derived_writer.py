@@ -0,0 +1,174 @@
+"""
+Debounced, background updates of the files derived from a project's pins,
+findings and chat.
+
+save_pins writes pins.json and the pin partitions itself, because an
+elevation that is opened next reads them right away. The pin counts
+(aggregates.json, see Project/project_aggregates.py), the project's entry in
+the portfolio catalog and the search index only have to catch up, so the
+writers schedule() them here instead of updating them on the UI thread:
+
+    get_derived_writer().schedule_pins(project_name, ...)      # from save_pins
+    get_derived_writer().schedule_findings(project_name, findings)
+    get_derived_writer().schedule_chat(project_name, pin_id, messages)
+
+Updates of a project within UPDATE_DELAY seconds are merged and applied
+together on a worker thread, in the order they were made. The project cache
+notifies subscribers of the new counts from that thread; its Qt notifier
+delivers them to widgets on the GUI thread.
+
+Readers that need the derived files to be current call flush(project_name)
+first (the search does); pending updates are also flushed at interpreter exit.
+"""
+
+import json
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+UPDATE_DELAY = 0.5  # seconds
+
+
+class DerivedFileWriter:
+    """Merges updates of derived project files and applies them on a worker thread"""
+
+    def __init__(self, delay: float = UPDATE_DELAY):
+        self.delay = delay
+        self._pending: Dict[str, Tuple[Dict[str, Any], float]] = {}  # project -> (updates, due time)
+        self._writing: Set[str] = set()
+        self._lock = threading.Condition()
+        # Held while updates are taken from _pending and applied, so they are applied in order
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule_pins(self, project_name: str, project_dir: str, pins_path: str, pins: List[Dict[str, Any]],
+                      base_source: Optional[List[int]], source: Optional[List[int]],
+                      changes: Dict[str, List[Dict[str, Any]]], previous: Dict[str, List[Dict[str, Any]]]):
+        """
+        Update the counts and search index after save_pins rewrote pins.json.
+        base_source/source are the pins.json signatures before and after the
+        save; changes/previous are the new/old pins of the partitions that
+        changed (see pin_partitions.write_partitions). pins and the partition
+        lists are read on the worker thread and must not be modified.
+        """
+        update = {"project_dir": project_dir, "pins_path": pins_path, "pins": pins, "base_source": base_source,
+                  "source": source, "changes": changes, "previous": previous}
+
+        def merge(updates):
+            earlier = updates.get("pins")
+            if earlier is not None:
+                # One update from the first save's pins to the last: the oldest pins of each
+                # partition, the newest of each. A partition whose oldest pins are unknown stays
+                # unknown, so the counts are rebuilt rather than adjusted from the wrong base.
+                old = {key: group for key, group in previous.items() if key not in earlier["changes"]}
+                old.update(earlier["previous"])
+                new = dict(earlier["changes"])
+                new.update(changes)
+                update.update(base_source=earlier["base_source"], changes=new, previous=old)
+            updates["pins"] = update
+        self._schedule(project_name, merge)
+
+    def schedule_findings(self, project_name: str, findings: List[Dict[str, Any]]):
+        """Index the finding dates after findings.json was rewritten (findings must not be modified)"""
+        def merge(updates):
+            updates["findings"] = findings
+        self._schedule(project_name, merge)
+
+    def schedule_chat(self, project_name: str, pin_id: int, messages: List[Dict[str, Any]]):
+        """Index a pin's chat text after its chat file was rewritten"""
+        # Copy now: the chat dialogs keep appending to their list
+        messages = json.loads(json.dumps(messages, default=str))
+
+        def merge(updates):
+            updates.setdefault("chat", {})[pin_id] = messages
+        self._schedule(project_name, merge)
+
+    def _schedule(self, project_name: str, merge):
+        with self._lock:
+            updates = self._pending[project_name][0] if project_name in self._pending else {}
+            merge(updates)
+            self._pending[project_name] = (updates, time.monotonic() + self.delay)
+            self._ensure_thread()
+            self._lock.notify()
+
+    def is_pending(self, project_name: str) -> bool:
+        """True while updates of the project are waiting or being applied"""
+        with self._lock:
+            return project_name in self._pending or project_name in self._writing
+
+    def flush(self, project_name: Optional[str] = None):
+        """Apply the pending updates of one project (or all) now, waiting for updates in progress"""
+        with self._write_lock:
+            self._take_and_apply([project_name] if project_name is not None else None)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="derived-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._lock.wait()
+                now = time.monotonic()
+                due = min(due for _, due in self._pending.values())
+                if due > now:
+                    self._lock.wait(due - now)
+                    continue
+                names = [name for name, (_, due) in self._pending.items() if due <= now]
+            with self._write_lock:
+                self._take_and_apply(names)
+
+    def _take_and_apply(self, names: Optional[List[str]]):
+        """Apply the pending updates of names (None: every project); _write_lock must be held"""
+        with self._lock:
+            if names is None:
+                names = list(self._pending)
+            batch = [(name, self._pending.pop(name)[0]) for name in names if name in self._pending]
+            self._writing.update(name for name, _ in batch)
+        try:
+            for name, updates in batch:
+                self._apply(name, updates)
+        finally:
+            with self._lock:
+                self._writing.difference_update(name for name, _ in batch)
+
+    @staticmethod
+    def _apply(project_name: str, updates: Dict[str, Any]):
+        from Project import project_aggregates, search_index
+        pins = updates.get("pins")
+        if pins is not None:
+            try:
+                project_aggregates.update_aggregates(project_name, pins["project_dir"], pins["pins_path"],
+                                                     pins["pins"], pins["base_source"], pins["changes"],
+                                                     pins["previous"], source=pins["source"])
+            except Exception as e:
+                print(f"[ERROR] Failed to update pin counts for {project_name}: {e}")
+            try:
+                search_index.index_pin_changes(project_name, pins["pins_path"], pins["base_source"],
+                                               pins["changes"], pins["previous"], source=pins["source"])
+            except Exception as e:
+                print(f"[ERROR] Failed to index pins of {project_name}: {e}")
+        try:
+            if "findings" in updates:
+                search_index.index_findings(project_name, updates["findings"])
+            for pin_id, messages in updates.get("chat", {}).items():
+                search_index.index_chat(project_name, pin_id, messages)
+        except Exception as e:
+            print(f"[ERROR] Failed to index findings of {project_name}: {e}")
+
+
+# Global derived file writer instance
+derived_writer = None
+_writer_lock = threading.Lock()
+
+def get_derived_writer() -> DerivedFileWriter:
+    """Get the global derived file writer"""
+    global derived_writer
+    with _writer_lock:
+        if derived_writer is None:
+            derived_writer = DerivedFileWriter()
+            atexit.register(derived_writer.flush)
+        return derived_writer
@@ -0,0 +1,84 @@
+"""
+Stable elevation identifiers.
+
+Elevations are stored in project.json as folder items:
+    [name, local_path, s3_url, elevation_id]
+Older projects have [name, local_path] or [name, local_path, s3_url] items;
+ensure_elevation_ids upgrades them in place. Pins carry the same id in
+pin['elevation_id'], so a pin stays attached to its drawing when the
+elevation is renamed or its file moves.
+"""
+
+import os
+import json
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+ELEVATION_ID_INDEX = 3
+
+
+def new_elevation_id() -> str:
+    """Create a new stable elevation id"""
+    return f"elv_{uuid.uuid4().hex[:12]}"
+
+
+def make_elevation_item(name: str, local_path: str, s3_url: Optional[str] = None) -> List[Any]:
+    """Create a project.json folder item for a new elevation"""
+    return [name, local_path, s3_url, new_elevation_id()]
+
+
+def get_elevation_id(item: List[Any]) -> Optional[str]:
+    """Elevation id of a folder item, or None for items that predate ids"""
+    return item[ELEVATION_ID_INDEX] if len(item) > ELEVATION_ID_INDEX else None
+
+
+def ensure_elevation_ids(folders: List[Dict[str, Any]]) -> bool:
+    """
+    Give every elevation item in folders a stable id (modifies folders in place).
+    Returns True if anything changed and the project should be saved.
+    """
+    changed = False
+    for folder in folders:
+        for item in folder.get("items", []):
+            while len(item) < ELEVATION_ID_INDEX:
+                item.append(None)
+            if len(item) == ELEVATION_ID_INDEX:
+                item.append(new_elevation_id())
+                changed = True
+            elif not item[ELEVATION_ID_INDEX]:
+                item[ELEVATION_ID_INDEX] = new_elevation_id()
+                changed = True
+    return changed
+
+
+def iter_elevations(folders: List[Dict[str, Any]]) -> Iterator[Tuple[Optional[str], str, str]]:
+    """Yield (elevation_id, name, local_path) for every elevation in folders"""
+    for folder in folders:
+        for item in folder.get("items", []):
+            if len(item) >= 2:
+                yield get_elevation_id(item), item[0], item[1]
+
+
+def elevation_ids_by_key(folders: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map the elevation keys (see pin_partitions.elevation_key) of every
+    elevation's name and drawing to its id, to find the id of a pin that
+    only names its elevation.
+    """
+    from Project.pin_partitions import elevation_key
+    ids_by_key = {}
+    for elevation_id, name, local_path in iter_elevations(folders):
+        if not elevation_id:
+            continue
+        for value in (name, local_path):
+            if value:
+                ids_by_key.setdefault(elevation_key(value), elevation_id)
+    return ids_by_key
+
+
+def load_project_folders(project_name: str) -> List[Dict[str, Any]]:
+    """The elevation folder list of a project, read from its project.json"""
+    from Project.portfolio_catalog import get_projects_storage_dir
+    project_json = os.path.join(get_projects_storage_dir(), project_name, "project.json")
+    with open(project_json, "r", encoding="utf-8") as fp:
+        return json.load(fp).get("elevations", [])
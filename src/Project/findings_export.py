@@ -0,0 +1,172 @@
+"""
+Export findings to CSV or XLSX for reports to building owners.
+
+Rows are produced by generators and written as they come, so an export
+never holds more than one project's findings and pins (the files it reads)
+plus the current row:
+
+    export_findings("report.csv", "Tower_A1B2")                # one project
+    export_findings("portfolio.xlsx", include_chat=True)       # every cataloged project
+
+Each row is a finding joined to its pin (position, elevation) by pin_id;
+include_chat adds the number of chat messages and the latest comment,
+include_photos adds the finding's photos and the photos posted in the pin's
+chat. XLSX needs openpyxl, which is optional; it is written in openpyxl's
+write-only mode, which also streams rows to disk.
+
+Portfolio exports read each project's files directly instead of through the
+project cache, so exporting many projects does not leave them all cached.
+"""
+
+import os
+import csv
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+FORMATS = ("csv", "xlsx")
+PHOTO_SEPARATOR = "; "
+COMMENT_MAX_LENGTH = 200
+
+BASE_COLUMNS = ("project", "finding_id", "pin_id", "title", "status", "material", "defect",
+                "elevation", "category", "assignee", "drop", "start_date", "end_date", "x", "y")
+CHAT_COLUMNS = ("chat_messages", "last_comment", "last_comment_date")
+PHOTO_COLUMNS = ("photo_count", "photos")
+
+
+def export_columns(include_chat: bool = False, include_photos: bool = False) -> Tuple[str, ...]:
+    return BASE_COLUMNS + (CHAT_COLUMNS if include_chat else ()) + (PHOTO_COLUMNS if include_photos else ())
+
+
+def detect_format(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith(".xlsx"):
+        return "xlsx"
+    raise ValueError(f"Cannot tell the export format of {path}: use a .csv or .xlsx file or give the format")
+
+
+# --- Reading ---
+def _project_data(project_name: str, use_cache: bool) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(findings, pins) of a project, read-only"""
+    from Project.Elevations.findings_logic import get_shared_pins, get_pins_path, _read_pins_file
+    from Project.project_findings import get_shared_findings, get_project_findings_path, _read_findings_file
+    if use_cache:
+        return get_shared_findings(project_name), get_shared_pins(project_name)
+    return (_read_findings_file(get_project_findings_path(project_name)),
+            _read_pins_file(get_pins_path(project_name)))
+
+
+def _chat_summary(chat: Sequence[Dict[str, Any]]) -> Tuple[int, str, str]:
+    comments = [msg for msg in chat if msg.get("type", "text") == "text" and msg.get("text")]
+    if not comments:
+        return len(chat), "", ""
+    last = comments[-1]
+    text = " ".join(str(last.get("text", "")).split())
+    if len(text) > COMMENT_MAX_LENGTH:
+        text = text[:COMMENT_MAX_LENGTH - 1] + "…"
+    return len(chat), text, last.get("date") or last.get("timestamp", "")
+
+
+def photo_references(finding: Dict[str, Any], chat: Sequence[Dict[str, Any]]) -> List[str]:
+    """Photos of a finding: its own, then those posted in the pin's chat"""
+    refs = [str(p) for p in finding.get("photos") or [] if p]
+    for msg in chat:
+        if msg.get("type") == "photo":
+            ref = msg.get("path") or msg.get("filename")
+            if ref and ref not in refs:
+                refs.append(ref)
+    return refs
+
+
+def iter_finding_rows(project_name: str, include_chat: bool = False, include_photos: bool = False,
+                      use_cache: bool = True) -> Iterator[Tuple[Any, ...]]:
+    """Rows (in export_columns order) for every finding of a project"""
+    findings, pins = _project_data(project_name, use_cache)
+    pins_by_id = {pin["pin_id"]: pin for pin in pins if pin.get("pin_id") is not None}
+    chat_manager = None
+    if include_chat or include_photos:
+        from Project.Elevations.chat_data_manager import ChatDataManager
+        chat_manager = ChatDataManager(project_name)
+    for finding in findings:
+        pin_id = finding.get("pin_id")
+        pin = pins_by_id.get(pin_id, {})
+        pos = pin.get("pos") or {}
+        row = (
+            project_name, finding.get("id"), pin_id,
+            finding.get("title") or pin.get("name", ""),
+            finding.get("status", ""), finding.get("material", ""), finding.get("defect", ""),
+            finding.get("elevation") or pin.get("elevation", ""),
+            finding.get("category", ""), finding.get("assignee", ""), finding.get("drop", ""),
+            finding.get("start_date") or "", finding.get("end_date") or "",
+            pos.get("x"), pos.get("y"),
+        )
+        if chat_manager is not None:
+            # Chat lives in one file per pin; older pins keep it inline
+            chat = (chat_manager.load_pin_chat(pin_id) if pin_id is not None else []) or pin.get("chat") or []
+            if include_chat:
+                row += _chat_summary(chat)
+            if include_photos:
+                refs = photo_references(finding, chat)
+                row += (len(refs), PHOTO_SEPARATOR.join(refs))
+        yield row
+
+
+def iter_portfolio_rows(project_names: Optional[Iterable[str]] = None, include_chat: bool = False,
+                        include_photos: bool = False) -> Iterator[Tuple[Any, ...]]:
+    """Rows for several projects (default: every project in the portfolio catalog), one project at a time"""
+    if project_names is None:
+        from Project.portfolio_catalog import list_projects
+        project_names = [os.path.basename(entry["folder"]) for entry in list_projects()]
+    for project_name in project_names:
+        yield from iter_finding_rows(project_name, include_chat, include_photos, use_cache=False)
+
+
+# --- Writing ---
+def write_csv(rows: Iterable[Sequence[Any]], path: str, columns: Sequence[str]) -> int:
+    count = 0
+    # utf-8-sig so Excel detects the encoding when the CSV is opened directly
+    with open(path, "w", encoding="utf-8-sig", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+            count += 1
+    return count
+
+
+def write_xlsx(rows: Iterable[Sequence[Any]], path: str, columns: Sequence[str]) -> int:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("XLSX export needs the openpyxl package (pip install openpyxl); "
+                           "export to .csv instead") from None
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Findings")
+    sheet.append(list(columns))
+    count = 0
+    for row in rows:
+        sheet.append(list(row))
+        count += 1
+    tmp_path = path + ".tmp"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return count
+
+
+def export_findings(path: str, projects: Union[str, Iterable[str], None] = None, fmt: Optional[str] = None,
+                    include_chat: bool = False, include_photos: bool = False) -> int:
+    """
+    Export findings of one project (projects is a name), several projects
+    (a list of names) or the whole portfolio (None) to path.
+    Returns the number of rows written.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    columns = export_columns(include_chat, include_photos)
+    if isinstance(projects, str):
+        rows = iter_finding_rows(projects, include_chat, include_photos)
+    else:
+        rows = iter_portfolio_rows(projects, include_chat, include_photos)
+    writer = write_csv if fmt == "csv" else write_xlsx
+    return writer(rows, path, columns)
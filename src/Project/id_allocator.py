@@ -0,0 +1,215 @@
+"""
+Persisted per-project ID allocator for pins and findings.
+
+Each project keeps its last issued ids in storage/<project>/sequences.json:
+    {"pin_id": 142, "finding_id": 37}
+Reserving an id reads and rewrites that small file under a lock, so new ids
+never require loading every pin or finding. Ids are monotonic: an id that was
+reserved but never saved (e.g. a cancelled pin dialog) is not reused.
+
+The first reservation for a project seeds the counter from its existing
+pins.json / findings.json, so projects created before the allocator keep
+their numbering. The size/mtime of each data file is recorded with its
+counter:
+    {"pin_id": 142, "finding_id": 37, "sources": {"pin_id": [5120, 1718000000000000000], ...}}
+If the file changed since (an S3 pull, a sync client, a hand edit), the
+counter is raised to the largest id in the file before ids are issued.
+
+Processes share the file through an exclusive lock on sequences.json.lock
+(fcntl.flock, or msvcrt.locking on Windows).
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+SEQUENCES_FILENAME = "sequences.json"
+PIN_SEQUENCE = "pin_id"
+FINDING_SEQUENCE = "finding_id"
+SOURCES_KEY = "sources"
+
+
+def _seed_pin_id(project_name: str) -> int:
+    from Project.Elevations.findings_logic import get_shared_pins
+    return max([p.get("pin_id") or 0 for p in get_shared_pins(project_name)], default=100)
+
+
+def _seed_finding_id(project_name: str) -> int:
+    from Project.project_findings import get_shared_findings
+    return max([f.get("id") or 0 for f in get_shared_findings(project_name)], default=0)
+
+
+def _pins_path(project_name: str) -> str:
+    from Project.Elevations.findings_logic import get_pins_path
+    return get_pins_path(project_name)
+
+
+def _findings_path(project_name: str) -> str:
+    from Project.project_findings import get_project_findings_path
+    return get_project_findings_path(project_name)
+
+
+_SEEDS: Dict[str, Callable[[str], int]] = {
+    PIN_SEQUENCE: _seed_pin_id,
+    FINDING_SEQUENCE: _seed_finding_id,
+}
+# The data file holding the ids of each sequence
+_SOURCES: Dict[str, Callable[[str], str]] = {
+    PIN_SEQUENCE: _pins_path,
+    FINDING_SEQUENCE: _findings_path,
+}
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _lock_file(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after about 10 seconds; keep waiting
+
+
+def _unlock_file(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class IdAllocator:
+    """Issues monotonic ids for one project's sequences"""
+
+    def __init__(self, project_name: str, project_dir: str):
+        self.project_name = project_name
+        self.project_dir = project_dir
+        self.path = os.path.join(project_dir, SEQUENCES_FILENAME)
+        self._lock = threading.Lock()
+
+    def reserve(self, sequence: str, count: int = 1) -> range:
+        """Reserve count consecutive ids from sequence and return them as a range"""
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        with self._locked():
+            sequences = self._read()
+            last = sequences.get(sequence)
+            sources = sequences.get(SOURCES_KEY)
+            sources = dict(sources) if isinstance(sources, dict) else {}
+            if sequence in _SOURCES:
+                signature = _file_signature(_SOURCES[sequence](self.project_name))
+                if last is None or sources.get(sequence) != signature:
+                    # New counter, or the data file changed outside the allocator
+                    last = max(last or 0, _SEEDS[sequence](self.project_name))
+                sources[sequence] = signature
+                sequences[SOURCES_KEY] = sources
+            elif last is None:
+                last = 0
+            sequences[sequence] = last + count
+            self._write(sequences)
+        return range(last + 1, last + count + 1)
+
+    def merge(self, other: Dict[str, Any]):
+        """
+        Fold in the counters of another copy of sequences.json (one pulled from
+        S3): each counter becomes the larger of the two, so no id issued by
+        either copy is issued again.
+        """
+        with self._locked():
+            sequences = self._read()
+            for key, value in other.items():
+                if key != SOURCES_KEY and isinstance(value, int):
+                    sequences[key] = max(value, sequences.get(key) or 0)
+            sequences.pop(SOURCES_KEY, None)  # recheck the data files on the next reservation
+            self._write(sequences)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the in-process lock and the lock on sequences.json.lock"""
+        with self._lock:
+            os.makedirs(self.project_dir, exist_ok=True)
+            with open(self.path + ".lock", "a+") as lock_file:
+                _lock_file(lock_file)
+                try:
+                    yield
+                finally:
+                    _unlock_file(lock_file)
+
+    def peek(self, sequence: str):
+        """Last id issued from sequence, or None if nothing was reserved yet"""
+        with self._lock:
+            return self._read().get(sequence)
+
+    def _read(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, json.JSONDecodeError) as e:
+            # Reseeding from the data files is safe, they hold every id in use
+            print(f"[WARNING] Ignoring unreadable id sequences {self.path}: {e}")
+            return {}
+
+    def _write(self, sequences: Dict[str, int]):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(sequences, fp)
+        os.replace(tmp_path, self.path)
+
+
+_allocators: Dict[str, IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_id_allocator(project_name: str) -> IdAllocator:
+    """Get the allocator for a project (one shared instance per project)"""
+    if not project_name or not isinstance(project_name, str):
+        raise ValueError("project_name must be a non-empty string.")
+    with _allocators_lock:
+        allocator = _allocators.get(project_name)
+        if allocator is None:
+            from Project.Elevations.findings_logic import get_project_storage_dir
+            allocator = IdAllocator(project_name, get_project_storage_dir(project_name))
+            _allocators[project_name] = allocator
+        return allocator
+
+
+def next_pin_id(project_name: str) -> int:
+    return get_id_allocator(project_name).reserve(PIN_SEQUENCE)[0]
+
+
+def reserve_pin_ids(project_name: str, count: int) -> range:
+    """Reserve ids for a batch of new pins (bulk import)"""
+    return get_id_allocator(project_name).reserve(PIN_SEQUENCE, count)
+
+
+def next_finding_id(project_name: str) -> int:
+    return get_id_allocator(project_name).reserve(FINDING_SEQUENCE)[0]
+
+
+def reserve_finding_ids(project_name: str, count: int) -> range:
+    """Reserve ids for a batch of new findings (bulk import)"""
+    return get_id_allocator(project_name).reserve(FINDING_SEQUENCE, count)
@@ -0,0 +1,392 @@
+"""
+Batch operations on whole projects, for the command line (cli.py) and
+nightly jobs. Nothing here imports Qt.
+
+    project_info(name)        summary: elevations, finding counts, chat stats
+    check_project(name)       integrity problems, as {"errors", "warnings"}
+    reindex_project(name)     rebuild the derived files (pin partitions,
+                              aggregates, search index, catalog entry)
+    push_project(name)        upload the project's files to S3
+    pull_project(name)        download them again
+
+run_for_projects runs one of these (or any module level function taking a
+project name) for many projects in worker processes. Each project is handled
+by one worker, so projects never share a file; the portfolio catalog, which
+spans projects, is updated by the calling process afterwards.
+"""
+
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+S3_MANIFEST_FILENAME = ".s3_manifest.json"
+SEQUENCES_FILENAME = "sequences.json"  # see Project/id_allocator.py
+# Files kept in the pins/findings folder (see findings_logic.get_project_storage_dir),
+# along with the annotations/ folder (see Project/annotations.py)
+DATA_FILENAMES = ("pins.json", "findings.json", SEQUENCES_FILENAME)
+
+
+def all_project_names() -> List[str]:
+    """Folder names of the projects in storage/ (folders with a project.json)"""
+    from abstract_layer.storage_backend import LocalFileStorage
+    from Project.portfolio_catalog import get_projects_storage_dir
+    storage_dir = get_projects_storage_dir()
+    if not os.path.isdir(storage_dir):
+        return []
+    names = LocalFileStorage(storage_dir).list_projects()
+    return sorted(name for name in names if os.path.exists(os.path.join(storage_dir, name, "project.json")))
+
+
+def get_project_dir(project_name: str) -> str:
+    from Project.portfolio_catalog import get_projects_storage_dir
+    return os.path.join(get_projects_storage_dir(), project_name)
+
+
+# --- Info ---
+def project_info(project_name: str) -> Dict[str, Any]:
+    from Project.portfolio_catalog import summarize_project
+    from Project.elevation_registry import iter_elevations, load_project_folders
+    from Project.project_aggregates import load_aggregates
+    from Project.Elevations.chat_data_manager import ChatDataManager
+    info = summarize_project(get_project_dir(project_name))
+    if info is None:
+        raise ValueError(f"No project {project_name} (missing or unreadable project.json)")
+    info["elevation_list"] = [
+        {"elevation_id": elevation_id, "name": name, "path": path, "exists": bool(path) and os.path.exists(path)}
+        for elevation_id, name, path in iter_elevations(load_project_folders(project_name))
+    ]
+    info["counts"] = load_aggregates(project_name).get("counts", {})
+    info["chat"] = ChatDataManager(project_name).get_project_stats()
+    return info
+
+
+# --- Integrity checks ---
+def check_project(project_name: str) -> Dict[str, Any]:
+    """
+    Look for broken references in a project without changing anything.
+    Errors are data that the app cannot use as it is; warnings are leftovers
+    (orphaned chat files, missing photos, ...).
+    """
+    from Project.elevation_registry import iter_elevations, load_project_folders
+    from Project.Elevations.findings_logic import get_pins_path
+    from Project.project_findings import get_project_findings_path
+    from Project.Elevations.chat_data_manager import ChatDataManager
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    try:
+        folders = load_project_folders(project_name)
+    except (OSError, ValueError) as e:
+        return {"project": project_name, "errors": [f"project.json: {e}"], "warnings": []}
+    elevation_ids = set()
+    for elevation_id, name, path in iter_elevations(folders):
+        if elevation_id:
+            elevation_ids.add(elevation_id)
+        else:
+            warnings.append(f"elevation {name!r} has no elevation id (assigned when the project is opened)")
+        if not path or not os.path.exists(path):
+            errors.append(f"elevation {name!r}: drawing not found: {path}")
+
+    pins = _read_json_list(get_pins_path(project_name), "pins.json", errors)
+    findings = _read_json_list(get_project_findings_path(project_name), "findings.json", errors)
+
+    pin_ids = set()
+    for number, pin in enumerate(pins):
+        pin_id = pin.get("pin_id")
+        label = f"pin {pin_id}" if pin_id is not None else f"pin #{number}"
+        if pin_id is None:
+            errors.append(f"{label}: no pin_id")
+        elif pin_id in pin_ids:
+            errors.append(f"{label}: duplicate pin_id")
+        pin_ids.add(pin_id)
+        pos = pin.get("pos")
+        if not isinstance(pos, dict) or not all(isinstance(pos.get(k), (int, float)) for k in ("x", "y")):
+            errors.append(f"{label}: missing or invalid position")
+        elif not (0 <= pos["x"] <= 1 and 0 <= pos["y"] <= 1):
+            errors.append(f"{label}: position outside the drawing ({pos['x']}, {pos['y']})")
+        elevation_id = pin.get("elevation_id")
+        if elevation_id and elevation_id not in elevation_ids:
+            errors.append(f"{label}: unknown elevation_id {elevation_id}")
+
+    finding_ids = set()
+    for finding in findings:
+        finding_id = finding.get("id")
+        if finding_id in finding_ids:
+            errors.append(f"finding {finding_id}: duplicate id")
+        finding_ids.add(finding_id)
+        if finding.get("pin_id") is not None and finding["pin_id"] not in pin_ids:
+            warnings.append(f"finding {finding_id}: pin {finding['pin_id']} does not exist")
+
+    chat_manager = ChatDataManager(project_name)
+    for filename in sorted(os.listdir(chat_manager.chat_data_dir)):
+        if not (filename.startswith("pin_") and filename.endswith("_chat.json")):
+            continue
+        pin_id = filename[len("pin_"):-len("_chat.json")]
+        if not pin_id.isdigit() or int(pin_id) not in pin_ids:
+            warnings.append(f"chat_data/{filename}: pin {pin_id} does not exist")
+            continue
+        for msg in chat_manager.load_pin_chat(int(pin_id)):
+            path = msg.get("path")
+            if msg.get("type") == "photo" and path and not os.path.exists(path):
+                warnings.append(f"pin {pin_id}: chat photo not found: {path}")
+    return {"project": project_name, "errors": errors, "warnings": warnings}
+
+
+def _read_json_list(path: str, label: str, errors: List[str]) -> List[Dict[str, Any]]:
+    # Read the file itself, not through the cache, which could hide a damaged file
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError) as e:
+        errors.append(f"{label}: {e}")
+        return []
+    if not isinstance(data, list):
+        errors.append(f"{label}: not a list")
+        return []
+    return [item for item in data if isinstance(item, dict)]
+
+
+# --- Derived files ---
+def reindex_project(project_name: str) -> Dict[str, Any]:
+    """Rebuild every file derived from pins.json / findings.json / chat"""
+    from Project import pin_partitions, project_aggregates, search_index
+    from Project.project_cache import get_project_cache
+    from Project.Elevations.findings_logic import get_pins_path, get_project_storage_dir, get_shared_pins
+    from Project.project_findings import get_shared_findings
+    from Project.derived_writer import get_derived_writer
+    get_derived_writer().flush(project_name)
+    project_dir = get_project_storage_dir(project_name)
+    pins_path = get_pins_path(project_name)
+    get_project_cache().invalidate(project_name)
+    pins = get_shared_pins(project_name)
+    findings = get_shared_findings(project_name)
+    # Without an index to compare with, every partition is rewritten
+    index_path = pin_partitions.get_index_path(project_dir)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    partitions = pin_partitions.write_partitions(project_dir, pins, pins_path)
+    project_aggregates.update_aggregates(project_name, project_dir, pins_path, pins, None, {}, {})
+    search_index.drop_search_index(project_name)
+    search_index.get_search_index(project_name)
+    return {"project": project_name, "pins": len(pins), "findings": len(findings),
+            "partitions": len(partitions)}
+
+
+# --- S3 ---
+def _is_derived(relpath: str) -> bool:
+    """Files rebuilt from the project data, which are not worth uploading"""
+    from Project.pin_partitions import PARTITIONS_DIRNAME, INDEX_FILENAME
+    from Project.project_aggregates import AGGREGATES_FILENAME
+    from Project.search_index import SEARCH_DB_FILENAME
+    from Project.report_generator import CACHE_DIRNAME
+    top = relpath.split("/", 1)[0]
+    return (top in (PARTITIONS_DIRNAME, INDEX_FILENAME, CACHE_DIRNAME, AGGREGATES_FILENAME, S3_MANIFEST_FILENAME)
+            or top.startswith(SEARCH_DB_FILENAME)
+            or relpath.endswith(".tmp"))
+
+
+def project_files(project_name: str) -> Iterator[Tuple[str, str]]:
+    """(relative path with / separators, local path) of the files to sync for a project"""
+    from Project.Elevations.findings_logic import get_project_storage_dir
+    from Project.annotations import ANNOTATIONS_DIRNAME
+    project_dir = get_project_dir(project_name)
+    data_dir = get_project_storage_dir(project_name)
+    seen = set()
+    if os.path.abspath(data_dir) != os.path.abspath(project_dir):
+        for filename in DATA_FILENAMES:
+            path = os.path.join(data_dir, filename)
+            if os.path.exists(path):
+                seen.add(filename)
+                yield filename, path
+        annotations_dir = os.path.join(data_dir, ANNOTATIONS_DIRNAME)
+        if os.path.isdir(annotations_dir):
+            for filename in sorted(os.listdir(annotations_dir)):
+                if filename.endswith(".jsonl"):
+                    relpath = f"{ANNOTATIONS_DIRNAME}/{filename}"
+                    seen.add(relpath)
+                    yield relpath, os.path.join(annotations_dir, filename)
+    for root, dirs, files in os.walk(project_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            relpath = os.path.relpath(path, project_dir).replace(os.sep, "/")
+            if relpath not in seen and not _is_derived(relpath):
+                yield relpath, path
+
+
+def _local_path(project_name: str, relpath: str) -> str:
+    from Project.Elevations.findings_logic import get_project_storage_dir
+    from Project.annotations import ANNOTATIONS_DIRNAME
+    if relpath in DATA_FILENAMES or relpath.startswith(ANNOTATIONS_DIRNAME + "/"):
+        return os.path.join(get_project_storage_dir(project_name), *relpath.split("/"))
+    return os.path.join(get_project_dir(project_name), *relpath.split("/"))
+
+
+def _file_signature(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def push_project(project_name: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Upload a project's files to s3://<bucket>/<project>/..., skipping files
+    unchanged since the last push or pull (unless force).
+    """
+    from aws_integration import get_aws_manager
+    manager = get_aws_manager()
+    if not manager.s3_client:
+        raise RuntimeError("S3 is not available (see config/aws_config.json)")
+    manifest_path = os.path.join(get_project_dir(project_name), S3_MANIFEST_FILENAME)
+    manifest = _read_manifest(manifest_path)
+    result = {"project": project_name, "uploaded": 0, "unchanged": 0, "failed": []}
+    for relpath, path in project_files(project_name):
+        signature = _file_signature(path)
+        if not force and manifest["local"].get(relpath) == signature:
+            result["unchanged"] += 1
+            continue
+        if manager.upload_file(path, f"{project_name}/{relpath}"):
+            manifest["local"][relpath] = signature
+            # The new object's ETag is unknown: the next pull downloads it once
+            manifest["remote"].pop(relpath, None)
+            result["uploaded"] += 1
+        else:
+            result["failed"].append(relpath)
+    _write_manifest(manifest_path, manifest)
+    return result
+
+
+def pull_project(project_name: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Download a project's files from S3, skipping objects whose ETag is the one
+    recorded at the last pull (unless force). sequences.json is merged rather
+    than replaced (see IdAllocator.merge). Derived files are rebuilt on next use.
+    """
+    from aws_integration import get_aws_manager
+    manager = get_aws_manager()
+    if not manager.s3_client:
+        raise RuntimeError("S3 is not available (see config/aws_config.json)")
+    prefix = f"{project_name}/"
+    objects = manager.list_objects(prefix, with_etags=True)
+    if not objects:
+        raise ValueError(f"No files for project {project_name} in S3")
+    manifest_path = os.path.join(get_project_dir(project_name), S3_MANIFEST_FILENAME)
+    manifest = _read_manifest(manifest_path)
+    result = {"project": project_name, "downloaded": 0, "unchanged": 0, "failed": []}
+    for key, etag in objects:
+        relpath = key[len(prefix):]
+        if not relpath or relpath.endswith("/") or _is_derived(relpath):
+            continue
+        path = _local_path(project_name, relpath)
+        if not force and os.path.exists(path) and manifest["remote"].get(relpath) == etag:
+            result["unchanged"] += 1
+            continue
+        if relpath == SEQUENCES_FILENAME:
+            downloaded = _pull_sequences(project_name, manager, key, path)
+        else:
+            downloaded = manager.download_file(key, path)
+        if downloaded:
+            # What was just downloaded does not need to be pushed back
+            manifest["local"][relpath] = _file_signature(path)
+            manifest["remote"][relpath] = etag
+            result["downloaded"] += 1
+        else:
+            result["failed"].append(relpath)
+    _write_manifest(manifest_path, manifest)
+    return result
+
+
+def _pull_sequences(project_name: str, manager, key: str, path: str) -> bool:
+    """Download sequences.json and fold its counters into the local ones"""
+    from Project.id_allocator import get_id_allocator
+    tmp_path = f"{path}.{os.getpid()}.s3"
+    if not manager.download_file(key, tmp_path):
+        return False
+    try:
+        with open(tmp_path, "r", encoding="utf-8") as fp:
+            remote = json.load(fp)
+        if not isinstance(remote, dict):
+            raise ValueError("not an object")
+        get_id_allocator(project_name).merge(remote)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not merge {key}: {e}")
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    """{"local": {relpath: [size, mtime_ns] when last synced}, "remote": {relpath: ETag at the last pull}}"""
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            manifest = json.load(fp)
+    except (OSError, ValueError):
+        manifest = {}
+    return {"local": dict(manifest.get("local") or {}), "remote": dict(manifest.get("remote") or {})}
+
+
+def _write_manifest(path: str, manifest: Dict[str, Dict[str, Any]]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+# --- Running for many projects ---
+def _call(func: Callable[..., Any], project_name: str, kwargs: Dict[str, Any]):
+    try:
+        return func(project_name, **kwargs)
+    finally:
+        # Worker processes exit without running atexit handlers
+        from Project.derived_writer import get_derived_writer
+        get_derived_writer().flush(project_name)
+
+
+def run_for_projects(func: Callable[..., Any], project_names: Iterable[str], workers: Optional[int] = None,
+                     update_catalog: bool = False, **kwargs) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+    """
+    Run func(project_name, **kwargs) for every project, in worker processes
+    when there is more than one project and workers is not 1. func must be a
+    module level function. Yields (project_name, result, error) as projects
+    finish; error is the exception func raised, if any. With update_catalog
+    the portfolio catalog entries of the projects are refreshed at the end.
+    """
+    project_names = list(project_names)
+    remaining = list(project_names)
+    if len(remaining) > 1 and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_call, func, name, kwargs): name for name in remaining}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        remaining.remove(name)
+                        yield name, None, e
+                    else:
+                        remaining.remove(name)
+                        yield name, result, None
+        except (OSError, BrokenProcessPool) as e:
+            # No worker processes here (sandbox, frozen app): do the rest in this process
+            print(f"[WARNING] Running in one process: {e}")
+    for name in list(remaining):
+        try:
+            result = func(name, **kwargs)
+        except Exception as e:
+            yield name, None, e
+        else:
+            yield name, result, None
+    if update_catalog:
+        # Workers may have raced on the shared catalog file; summarize again from here
+        from Project.portfolio_catalog import update_project
+        for name in project_names:
+            update_project(get_project_dir(name))
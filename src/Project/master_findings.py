@@ -4,11 +4,14 @@ import os
 from datetime import date
 import json
 from config.status import STATUS_OPTIONS
-import boto3
 
 # Recommended: store all finding photos in this directory for traceability
 PHOTOS_DIR = os.path.join(os.path.dirname(__file__), "..", "photos")
-os.makedirs(PHOTOS_DIR, exist_ok=True)
+
+def get_photos_dir():
+    """PHOTOS_DIR, created on first use rather than at import"""
+    os.makedirs(PHOTOS_DIR, exist_ok=True)
+    return PHOTOS_DIR
 
 master_findings = [
     {
@@ -124,7 +127,6 @@ import pathlib
 # Always resolve storage at workspace root (two levels up from this file)
 WORKSPACE_ROOT = pathlib.Path(__file__).resolve().parents[2]
 STORAGE_DIR = os.path.join(WORKSPACE_ROOT, "storage")
-os.makedirs(STORAGE_DIR, exist_ok=True)
 MASTER_FINDINGS_PATH = os.path.join(STORAGE_DIR, "master_findings.json")
 
 def save_master_findings():
@@ -140,6 +142,7 @@ def save_master_findings():
         if isinstance(f.get("end_date"), date):
             f["end_date"] = f["end_date"].isoformat() if f["end_date"] else None
         return f
+    os.makedirs(STORAGE_DIR, exist_ok=True)
     with open(MASTER_FINDINGS_PATH, "w", encoding="utf-8") as fp:
         json.dump([serialize_finding(f) for f in master_findings], fp, indent=2)
     upload_master_findings_to_s3()
@@ -174,8 +177,8 @@ def get_aws_manager():
         # Import here to avoid circular imports
         import sys
         sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-        from aws_integration import aws_manager
-        return aws_manager
+        from aws_integration import get_aws_manager as get_shared_aws_manager
+        return get_shared_aws_manager()
     except ImportError as e:
         print(f"[WARNING] AWS integration not available: {e}")
         return None
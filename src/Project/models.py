@@ -0,0 +1,176 @@
+"""
+Plain-Python domain objects for pin positions, findings and chat messages.
+
+Nothing here imports Qt, so the data layer (findings_logic, the CLI, worker
+processes) can load and save project data without PySide6. Pins are stored
+and passed around as dicts whose 'pos' is a Point while loaded:
+
+    pins = with_points(pins)           # {'x', 'y'} dicts -> Point
+    pin['pos'].x(), pin['pos'].y()     # normalized 0..1 drawing coordinates
+    pos_to_dict(pin['pos'])            # what goes back into pins.json
+
+Point has the x()/y() accessors of QPointF, so widgets that read pin['pos']
+work with either; the UI converts to QPointF only where Qt needs one.
+
+Finding and ChatMessage are the typed forms of findings.json entries and
+chat messages; from_dict keeps unknown keys in .extra and to_dict puts
+them back.
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Point:
+    """Immutable 2D point with the read accessors of QPointF"""
+    __slots__ = ("_x", "_y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self._x = float(x)
+        self._y = float(y)
+
+    def x(self) -> float:
+        return self._x
+
+    def y(self) -> float:
+        return self._y
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"x": self._x, "y": self._y}
+
+    @classmethod
+    def from_value(cls, value: Any) -> Optional["Point"]:
+        """Point from a {'x', 'y'} dict or anything with x()/y() (a QPointF); None if neither"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            if "x" in value and "y" in value:
+                return cls(value["x"], value["y"])
+            return None
+        if callable(getattr(value, "x", None)) and callable(getattr(value, "y", None)):
+            return cls(value.x(), value.y())
+        return None
+
+    def __eq__(self, other):
+        if isinstance(other, Point):
+            return self._x == other._x and self._y == other._y
+        if callable(getattr(other, "x", None)) and callable(getattr(other, "y", None)):
+            return self._x == other.x() and self._y == other.y()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._x, self._y))
+
+    def __repr__(self):
+        return f"Point({self._x!r}, {self._y!r})"
+
+
+def point_xy(pos: Any) -> Tuple[float, float]:
+    """(x, y) of a stored position: a {'x', 'y'} dict, a Point or a QPointF ((0, 0) if missing)"""
+    if isinstance(pos, dict):
+        return pos.get("x", 0), pos.get("y", 0)
+    if pos is None:
+        return 0, 0
+    return pos.x(), pos.y()
+
+
+def pos_to_dict(pos: Any) -> Any:
+    """A position as stored in JSON; values that are not points are returned unchanged"""
+    if isinstance(pos, dict):
+        return pos
+    point = Point.from_value(pos)
+    return point.to_dict() if point is not None else pos
+
+
+def with_points(pins: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace the {'x', 'y'} dict positions of pins (in place) with Points"""
+    for pin in pins:
+        pos = pin.get("pos")
+        if isinstance(pos, dict) and "x" in pos and "y" in pos:
+            pin["pos"] = Point(pos["x"], pos["y"])
+    return pins
+
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields (what dataclass(slots=True)
+    does on Python 3.10+; done here so the models work on 3.8).
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names + ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _from_dict(cls, data: Dict[str, Any]):
+    names = {f.name for f in fields(cls)} - {"extra"}
+    known = {key: value for key, value in data.items() if key in names}
+    extra = {key: value for key, value in data.items() if key not in names}
+    return cls(**known, extra=extra)
+
+
+def _to_dict(obj, keep_none: bool) -> Dict[str, Any]:
+    data = {}
+    for f in fields(obj):
+        if f.name == "extra":
+            continue
+        value = getattr(obj, f.name)
+        if value is not None or keep_none:
+            data[f.name] = value
+    data.update(obj.extra)
+    return data
+
+
+@_slotted
+@dataclass
+class Finding:
+    """A finding of a project (one entry of findings.json)"""
+    id: Optional[int] = None
+    title: str = "Untitled Finding"
+    status: Optional[str] = None
+    color: str = "#d32f2f"
+    category: str = "Defect"
+    assignee: str = ""
+    drop: str = ""
+    start_date: Any = None
+    end_date: Any = None
+    photos: List[str] = field(default_factory=list)
+    material: str = ""
+    defect: str = ""
+    elevation: str = ""
+    elevation_id: Optional[str] = None
+    pin_id: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Finding":
+        return _from_dict(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The finding as stored in findings.json (every field, None included)"""
+        return _to_dict(self, keep_none=True)
+
+
+@_slotted
+@dataclass
+class ChatMessage:
+    """A message of a pin's chat: text, or a photo with a caption"""
+    type: str = "text"
+    text: Optional[str] = None
+    path: Optional[str] = None
+    original_path: Optional[str] = None
+    filename: Optional[str] = None
+    caption: Optional[str] = None
+    author: str = "User"
+    timestamp: Optional[str] = None
+    date: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChatMessage":
+        return _from_dict(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The message as stored in the pin's chat file (fields that are None are left out)"""
+        return _to_dict(self, keep_none=False)
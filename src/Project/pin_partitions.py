@@ -0,0 +1,201 @@
+"""
+Per-elevation partitions of a project's pins.
+
+pins.json holds every pin of every elevation. To open a single drawing
+without loading the whole project, save_pins also writes one partition file
+per elevation plus a small index:
+
+    storage/<project>/pins_index.json
+    storage/<project>/pins/<elevation key>.json
+
+The index lives outside pins/ so that no elevation key (an elevation named
+"Index", say) can collide with it.
+
+Partitions are keyed by the pin's stable elevation id (see
+Project/elevation_registry.py); pins written before elevation ids existed are
+keyed by their elevation name instead (see partition_key). Readers look up a
+partition by key instead of comparing names pin by pin, and the index maps
+each key to its pin ids and each pin id to its key. Only partitions whose
+contents changed are rewritten.
+
+The index records the size/mtime of pins.json it was built from; if pins.json
+was changed by something else the partitions are considered stale and are
+rebuilt from pins.json on the next read.
+"""
+
+import os
+import re
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+PARTITIONS_DIRNAME = "pins"
+INDEX_FILENAME = "pins_index.json"
+LEGACY_INDEX_FILENAME = "index.json"  # inside pins/, before the index moved out
+UNASSIGNED_KEY = "_unassigned"
+INDEX_VERSION = 2
+
+
+def elevation_key(name: Optional[str]) -> str:
+    """
+    Filesystem-safe key for an elevation name or drawing path.
+    Ignores folders, file extension, case and punctuation, so "North Elevation",
+    "north_elevation.pdf" and ".../elevations/North_Elevation.pdf" share a key.
+    """
+    if not name:
+        return UNASSIGNED_KEY
+    stem = os.path.splitext(os.path.basename(str(name).strip()))[0].lower().strip()
+    key = re.sub(r"[^a-z0-9]+", "_", stem).strip("_")
+    return key or UNASSIGNED_KEY
+
+
+def partition_key(pin: Dict[str, Any]) -> str:
+    """Partition a pin belongs to: its stable elevation id, or a key from its elevation name"""
+    return pin.get("elevation_id") or elevation_key(pin.get("elevation"))
+
+
+def get_partitions_dir(project_dir: str) -> str:
+    return os.path.join(project_dir, PARTITIONS_DIRNAME)
+
+
+def get_partition_path(project_dir: str, key: str) -> str:
+    return os.path.join(get_partitions_dir(project_dir), f"{key}.json")
+
+
+def get_index_path(project_dir: str) -> str:
+    return os.path.join(project_dir, INDEX_FILENAME)
+
+
+def partition_cache_name(key: str) -> str:
+    """Name of a partition in the project cache (see Project/project_cache.py)"""
+    return f"{PARTITIONS_DIRNAME}/{key}.json"
+
+
+def partition_key_from_cache_name(name: str) -> Optional[str]:
+    """Elevation key of a partition's cache name; None if name is not a partition"""
+    prefix = f"{PARTITIONS_DIRNAME}/"
+    if not name.startswith(prefix) or not name.endswith(".json"):
+        return None
+    key = name[len(prefix):-len(".json")]
+    return key if key and "/" not in key else None
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _write_atomic(path: str, text: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        fp.write(text)
+    os.replace(tmp_path, path)
+
+
+def load_index(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Load the partition index, or None if the project has not been partitioned"""
+    index_path = get_index_path(project_dir)
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, "r", encoding="utf-8") as fp:
+            index = json.load(fp)
+        if index.get("version") != INDEX_VERSION:
+            return None
+        return index
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARNING] Ignoring unreadable pin partition index {index_path}: {e}")
+        return None
+
+
+def is_index_fresh(index: Optional[Dict[str, Any]], pins_path: str) -> bool:
+    """True if the index was built from the current pins.json"""
+    return index is not None and index.get("source") == _signature(pins_path)
+
+
+def write_partitions(project_dir: str, pins: List[Dict[str, Any]], pins_path: str,
+                     previous: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                     base_source: Optional[List[int]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Write the per-elevation partitions and index for pins (with dict positions),
+    rewriting only partitions whose contents changed.
+    Returns {key: pins} for the partitions that were written, and {key: []}
+    for partitions that were removed.
+
+    If previous is a dict, it is filled with the old pins of every changed
+    partition ([] for new partitions), read before they are overwritten. This
+    is only done if the old index was built from the pins.json signature
+    base_source; otherwise previous is left empty.
+    """
+    partitions_dir = get_partitions_dir(project_dir)
+    os.makedirs(partitions_dir, exist_ok=True)
+    old_index = load_index(project_dir) or {}
+    old_partitions = old_index.get("partitions", {})
+    collect_previous = (previous is not None and base_source is not None
+                        and old_index.get("source") == list(base_source))
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for pin in pins:
+        groups.setdefault(partition_key(pin), []).append(pin)
+
+    partitions = {}
+    pin_keys = {}
+    changed = {}
+    for key, group in groups.items():
+        text = json.dumps(group, separators=(",", ":"), ensure_ascii=False, default=str)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        partition_path = get_partition_path(project_dir, key)
+        if old_partitions.get(key, {}).get("digest") != digest or not os.path.exists(partition_path):
+            if collect_previous:
+                previous[key] = read_partition(project_dir, key) if key in old_partitions else []
+            _write_atomic(partition_path, text)
+            changed[key] = group
+        pin_ids = [pin["pin_id"] for pin in group if pin.get("pin_id") is not None]
+        partitions[key] = {
+            "file": os.path.basename(partition_path),
+            "elevation": group[0].get("elevation", ""),
+            "count": len(group),
+            "digest": digest,
+            "pin_ids": pin_ids,
+        }
+        for pin_id in pin_ids:
+            pin_keys[str(pin_id)] = key
+
+    # Remove partitions for elevations that no longer have pins
+    for key in old_partitions:
+        if key not in partitions:
+            if collect_previous:
+                previous[key] = read_partition(project_dir, key)
+            try:
+                os.remove(get_partition_path(project_dir, key))
+            except OSError:
+                pass
+            changed[key] = []
+
+    index = {
+        "version": INDEX_VERSION,
+        "source": _signature(pins_path),
+        "partitions": partitions,
+        "pins": pin_keys,
+    }
+    _write_atomic(get_index_path(project_dir), json.dumps(index, separators=(",", ":")))
+    # An index left inside pins/ by an older version is stale (or is now a partition)
+    legacy_path = os.path.join(partitions_dir, LEGACY_INDEX_FILENAME)
+    if os.path.splitext(LEGACY_INDEX_FILENAME)[0] not in partitions and os.path.exists(legacy_path):
+        try:
+            os.remove(legacy_path)
+        except OSError:
+            pass
+    return changed
+
+
+def read_partition(project_dir: str, key: str) -> List[Dict[str, Any]]:
+    """Read one partition's pins (positions as dicts); missing partitions are empty"""
+    partition_path = get_partition_path(project_dir, key)
+    if not os.path.exists(partition_path):
+        return []
+    with open(partition_path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
@@ -0,0 +1,303 @@
+"""
+Portfolio catalog: one summary row per project for the HomePage.
+
+storage/portfolio.json holds, for every project folder in storage/:
+
+    {"version": 1, "projects": {"<folder name>": {
+        "name", "subtitle", "members", "code", "file_path", "folder",
+        "elevations": 4, "findings": 57, "open_findings": 31,
+        "by_status": {"Unsafe": 3, ...}, "last_modified": 1718000000.0}},
+     "folders": {"<folder name>": [folder mtime_ns, project.json mtime_ns]}}
+
+The home page reads this single file instead of opening every project.json.
+It is updated when a project changes: ProjectPage.save_project and project
+creation call update_project, and saving pins updates the finding counts
+through project_aggregates. The catalog is built by scanning storage/ the
+first time it is needed (or by refresh_catalog); afterwards every load
+compares the folders in storage/ and their mtimes with "folders" and only
+summarizes the projects added or changed outside the app, and drops the
+removed ones.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from config.status import CLOSED_STATUSES
+
+CATALOG_FILENAME = "portfolio.json"
+CATALOG_VERSION = 1
+_CACHE_PROJECT = "*"  # project cache key for the catalog, which spans projects
+SORT_KEYS = ("name", "last_modified", "open_findings", "findings", "elevations")
+
+_lock = threading.RLock()
+# While projects are summarized (which may rebuild their counts), updates are
+# queued and applied to the new catalog before it is written
+_refreshing = False
+_queued: List[Callable[[Dict[str, Any]], Any]] = []
+_queue_lock = threading.Lock()
+
+
+def get_projects_storage_dir() -> str:
+    """storage/ folder holding one sub folder per project (same as the HomePage)"""
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'storage'))
+
+
+def get_catalog_path() -> str:
+    return os.path.join(get_projects_storage_dir(), CATALOG_FILENAME)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _apply_counts(entry: Dict[str, Any], aggregates: Optional[Dict[str, Any]]):
+    by_status = dict((aggregates or {}).get("counts", {}).get("status", {}))
+    entry["by_status"] = by_status
+    entry["findings"] = (aggregates or {}).get("total", 0)
+    entry["open_findings"] = sum(count for status, count in by_status.items()
+                                 if status not in CLOSED_STATUSES)
+
+
+def summarize_project(folder_path: str) -> Optional[Dict[str, Any]]:
+    """Catalog entry for a project folder, or None if it has no readable project.json"""
+    project_json = os.path.join(folder_path, "project.json")
+    if not os.path.exists(project_json):
+        return None
+    foldername = os.path.basename(folder_path)
+    try:
+        with open(project_json, encoding="utf-8") as f:
+            project_data = json.load(f)
+    except Exception as e:
+        print(f"[WARN] Could not load project {foldername}: {e}")
+        return None
+    entry = {
+        "name": project_data.get('name', foldername),
+        "subtitle": project_data.get('subtitle', ''),
+        "members": project_data.get('members', 0),
+        "code": project_data.get('subtitle', '') or project_data.get('code', ''),
+        "file_path": project_json,
+        "folder": folder_path,
+        "elevations": sum(len(folder.get("items", [])) for folder in project_data.get("elevations", [])),
+        "last_modified": _mtime(project_json),
+    }
+    aggregates = None
+    try:
+        from Project.project_aggregates import load_aggregates
+        from Project.Elevations.findings_logic import get_pins_path
+        aggregates = load_aggregates(foldername)
+        entry["last_modified"] = max(entry["last_modified"], _mtime(get_pins_path(foldername)))
+    except Exception as e:
+        print(f"[WARN] Could not count findings for project {foldername}: {e}")
+    _apply_counts(entry, aggregates)
+    return entry
+
+
+def _read(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            catalog = json.load(fp)
+        if catalog.get("version") != CATALOG_VERSION:
+            return None
+        return catalog
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARNING] Ignoring unreadable portfolio catalog {path}: {e}")
+        return None
+
+
+def _write(catalog: Dict[str, Any]):
+    from Project.project_cache import get_project_cache
+    path = get_catalog_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Per process, as batch jobs (Project/maintenance.py) update projects in parallel
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(catalog, fp, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    get_project_cache().put(_CACHE_PROJECT, CATALOG_FILENAME, path, catalog)
+
+
+def _folder_signature(folder_path: str, mtime_ns: Optional[int] = None) -> Optional[List[int]]:
+    """[folder mtime_ns, project.json mtime_ns (0 if missing)], or None if the folder is gone"""
+    try:
+        if mtime_ns is None:
+            mtime_ns = os.stat(folder_path).st_mtime_ns
+        project_mtime = os.stat(os.path.join(folder_path, "project.json")).st_mtime_ns
+    except FileNotFoundError:
+        if mtime_ns is None:
+            return None
+        project_mtime = 0
+    return [mtime_ns, project_mtime]
+
+
+def _scan_folders() -> Dict[str, List[int]]:
+    """Signature of every folder in storage/"""
+    folders = {}
+    try:
+        with os.scandir(get_projects_storage_dir()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    signature = _folder_signature(entry.path, entry.stat().st_mtime_ns)
+                    if signature is not None:
+                        folders[entry.name] = signature
+    except FileNotFoundError:
+        pass
+    return folders
+
+
+def _sync(catalog: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Bring catalog (None: rebuild from scratch) in line with storage/:
+    summarize the folders whose signature changed and drop the removed ones.
+    """
+    global _refreshing
+    with _lock:
+        catalog = catalog or {}
+        known = catalog.get("folders", {})
+        folders = _scan_folders()
+        changed = sorted(name for name, signature in folders.items() if known.get(name) != signature)
+        projects = dict(catalog.get("projects", {}))
+        removed = [name for name in set(projects) | set(known) if name not in folders]
+        if catalog and not changed and not removed:
+            return catalog
+        storage_dir = get_projects_storage_dir()
+        with _queue_lock:
+            _refreshing = True
+        try:
+            for name in removed:
+                projects.pop(name, None)
+            for name in changed:
+                folder_path = os.path.join(storage_dir, name)
+                entry = summarize_project(folder_path)
+                if entry is None:
+                    projects.pop(name, None)
+                else:
+                    projects[name] = entry
+                # Summarizing may build the project's aggregates.json, which changes the folder's mtime
+                signature = _folder_signature(folder_path)
+                if signature is None:
+                    folders.pop(name, None)
+                else:
+                    folders[name] = signature
+        finally:
+            with _queue_lock:
+                _refreshing = False
+                queued = _queued[:]
+                del _queued[:]
+        for change in queued:
+            change(projects)
+        catalog = {"version": CATALOG_VERSION, "projects": projects, "folders": folders}
+        _write(catalog)
+    return catalog
+
+
+def refresh_catalog() -> Dict[str, Any]:
+    """Rebuild the catalog by scanning every project folder in storage/"""
+    return _sync(None)
+
+
+def load_catalog() -> Dict[str, Any]:
+    """The shared catalog (read-only), built on first use and updated with changes made outside the app"""
+    return _sync(_cached_catalog())
+
+
+def _cached_catalog() -> Optional[Dict[str, Any]]:
+    from Project.project_cache import get_project_cache
+    return get_project_cache().get(_CACHE_PROJECT, CATALOG_FILENAME, get_catalog_path(), _read)
+
+
+def _modify(change, foldername: str):
+    """
+    Apply change(projects) to a private copy of the catalog and store it, with
+    the new signature of the changed folder. While the catalog is rebuilt the
+    change is queued instead.
+    """
+    with _queue_lock:
+        if _refreshing:
+            _queued.append(change)
+            return
+    with _lock:
+        catalog = _cached_catalog()
+        if catalog is None:
+            _sync(None)  # summarizes the folder anyway
+            return
+        projects = dict(catalog.get("projects", {}))
+        if change(projects) is False:
+            return
+        folders = dict(catalog.get("folders", {}))
+        signature = _folder_signature(os.path.join(get_projects_storage_dir(), foldername))
+        if signature is None:
+            folders.pop(foldername, None)
+        else:
+            folders[foldername] = signature
+        _write({"version": CATALOG_VERSION, "projects": projects, "folders": folders})
+
+
+def update_project(folder_path: str):
+    """Re-summarize one project after it was created or saved"""
+    if os.path.dirname(os.path.abspath(folder_path)) != get_projects_storage_dir():
+        return  # not a project in storage/
+    entry = summarize_project(folder_path)
+    foldername = os.path.basename(folder_path)
+
+    def change(projects):
+        if entry is None:
+            if foldername not in projects:
+                return False
+            del projects[foldername]
+        else:
+            projects[foldername] = entry
+    _modify(change, foldername)
+
+
+def remove_project(folder_path: str):
+    def change(projects):
+        if projects.pop(os.path.basename(folder_path), None) is None:
+            return False
+    _modify(change, os.path.basename(folder_path))
+
+
+def update_project_counts(project_name: str, aggregates: Dict[str, Any]):
+    """Store new finding counts for a cataloged project (called when pins are saved)"""
+    if not os.path.exists(get_catalog_path()):
+        return
+
+    def change(projects):
+        if project_name not in projects:
+            return False
+        entry = dict(projects[project_name])
+        _apply_counts(entry, aggregates)
+        source = aggregates.get("source")
+        if source:
+            entry["last_modified"] = max(entry.get("last_modified", 0.0), source[1] / 1e9)
+        projects[project_name] = entry
+    _modify(change, project_name)
+
+
+def list_projects(text: str = "", sort: str = "name", descending: bool = False,
+                  status: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Cataloged projects matching text (in name or code) and, if given, having
+    open findings with the given status; sorted by one of SORT_KEYS.
+    Returns copies that callers may modify.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    needle = text.strip().lower()
+    projects = []
+    for entry in load_catalog().get("projects", {}).values():
+        if needle and needle not in f"{entry.get('name', '')} {entry.get('code', '')}".lower():
+            continue
+        if status and not entry.get("by_status", {}).get(status):
+            continue
+        projects.append(dict(entry))
+    if sort == "name":
+        projects.sort(key=lambda p: str(p.get("name", "")).lower(), reverse=descending)
+    else:
+        projects.sort(key=lambda p: p.get(sort) or 0, reverse=descending)
+    return projects
@@ -0,0 +1,175 @@
+"""
+Materialized pin counts for a project.
+
+storage/<project>/aggregates.json keeps the number of pins per
+material/defect pair, status, elevation and assignee:
+
+    {"version": 1, "source": [size, mtime_ns], "total": 42,
+     "counts": {"material_defect": {"Brick\\u001fCrack": 3, ...},
+                "status": {...}, "elevation": {...}, "assignee": {...}}}
+
+save_pins updates the counts incrementally from the partitions it rewrote
+(old pins are subtracted, new pins added), so the sidebar and dashboards
+read counts without touching pins.json. The update runs shortly after the
+save on a worker thread (see Project/derived_writer.py). "source" is the size/mtime of the
+pins.json the counts describe; if it does not match, the counts are rebuilt
+from the pins on the next read.
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config.status import STATUS_OPTIONS
+
+AGGREGATES_FILENAME = "aggregates.json"
+AGGREGATES_VERSION = 1
+PAIR_SEPARATOR = "\x1f"
+DIMENSIONS = ("material_defect", "status", "elevation", "assignee")
+
+
+def file_signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def get_aggregates_path(project_dir: str) -> str:
+    return os.path.join(project_dir, AGGREGATES_FILENAME)
+
+
+def pin_facets(pin: Dict[str, Any]) -> Dict[str, str]:
+    """The value a pin contributes to each dimension (missing dimensions are skipped)"""
+    facets = {"status": pin.get("status") or STATUS_OPTIONS[0]}
+    material = str(pin.get("material") or "").strip()
+    defect = str(pin.get("defect") or "").strip()
+    if material and defect:
+        facets["material_defect"] = f"{material}{PAIR_SEPARATOR}{defect}"
+    if pin.get("elevation"):
+        facets["elevation"] = pin["elevation"]
+    if pin.get("assignee"):
+        facets["assignee"] = pin["assignee"]
+    return facets
+
+
+def _empty() -> Dict[str, Any]:
+    return {"version": AGGREGATES_VERSION, "source": None, "total": 0,
+            "counts": {dimension: {} for dimension in DIMENSIONS}}
+
+
+def _apply(aggregates: Dict[str, Any], pins: Iterable[Dict[str, Any]], sign: int):
+    counts = aggregates["counts"]
+    for pin in pins:
+        aggregates["total"] += sign
+        for dimension, value in pin_facets(pin).items():
+            bucket = counts[dimension]
+            count = bucket.get(value, 0) + sign
+            if count > 0:
+                bucket[value] = count
+            else:
+                bucket.pop(value, None)
+
+
+def build_aggregates(pins: Iterable[Dict[str, Any]], source: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Count pins from scratch"""
+    aggregates = _empty()
+    aggregates["source"] = source
+    _apply(aggregates, pins, 1)
+    return aggregates
+
+
+def _read(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            aggregates = json.load(fp)
+        if aggregates.get("version") != AGGREGATES_VERSION:
+            return None
+        return aggregates
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARNING] Ignoring unreadable aggregates {path}: {e}")
+        return None
+
+
+def _store(project_name: str, project_dir: str, aggregates: Dict[str, Any]):
+    from Project.project_cache import get_project_cache
+    path = get_aggregates_path(project_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(aggregates, fp, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    get_project_cache().put(project_name, AGGREGATES_FILENAME, path, aggregates)
+    from Project.portfolio_catalog import update_project_counts
+    update_project_counts(project_name, aggregates)
+
+
+def update_aggregates(project_name: str, project_dir: str, pins_path: str, pins: List[Dict[str, Any]],
+                      base_source: Optional[List[int]], changes: Dict[str, List[Dict[str, Any]]],
+                      previous: Dict[str, List[Dict[str, Any]]], source: Optional[List[int]] = None):
+    """
+    Update the counts after pins.json was rewritten.
+    changes/previous are the new/old pins of the partitions that changed (see
+    pin_partitions.write_partitions); base_source and source are the pins.json
+    signatures before and after the save (source defaults to the file's
+    current signature). Falls back to recounting pins if the stored counts do
+    not describe base_source or the old pins are unknown.
+    """
+    from Project.project_cache import get_project_cache
+    if source is None:
+        source = file_signature(pins_path)
+    path = get_aggregates_path(project_dir)
+    aggregates = get_project_cache().peek(project_name, AGGREGATES_FILENAME) or _read(path)
+    incremental = (aggregates is not None and base_source is not None
+                   and aggregates.get("source") == list(base_source)
+                   and all(key in previous for key in changes))
+    if incremental:
+        aggregates = json.loads(json.dumps(aggregates))  # cached copy is shared
+        for key, new_pins in changes.items():
+            _apply(aggregates, previous[key], -1)
+            _apply(aggregates, new_pins, 1)
+        aggregates["source"] = list(source) if source is not None else None
+    else:
+        aggregates = build_aggregates(pins, source)
+    _store(project_name, project_dir, aggregates)
+
+
+def load_aggregates(project_name: str) -> Dict[str, Any]:
+    """
+    Shared counts for a project (read-only), rebuilt from pins.json if it was
+    changed since they were computed.
+    """
+    from Project.Elevations.findings_logic import get_project_storage_dir, get_pins_path, get_shared_pins
+    from Project.project_cache import get_project_cache
+    project_dir = get_project_storage_dir(project_name)
+    pins_path = get_pins_path(project_name)
+    aggregates = get_project_cache().get(project_name, AGGREGATES_FILENAME,
+                                         get_aggregates_path(project_dir), _read)
+    stale = aggregates is not None and aggregates.get("source") != file_signature(pins_path)
+    if stale:
+        # After a save the counts are updated in the background; keep the last ones until then
+        from Project.derived_writer import get_derived_writer
+        stale = not get_derived_writer().is_pending(project_name)
+    if aggregates is None or stale:
+        pins = get_shared_pins(project_name)
+        aggregates = build_aggregates(pins, file_signature(pins_path))
+        _store(project_name, project_dir, aggregates)
+    return aggregates
+
+
+def get_counts(project_name: str, dimension: str) -> Dict[str, int]:
+    """{value: count} for one of DIMENSIONS"""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown aggregate dimension: {dimension}")
+    return dict(load_aggregates(project_name)["counts"][dimension])
+
+
+def get_material_defect_counts(project_name: str) -> Dict[Tuple[str, str], int]:
+    """{(material, defect): count}"""
+    return {tuple(key.split(PAIR_SEPARATOR, 1)): count
+            for key, count in load_aggregates(project_name)["counts"]["material_defect"].items()}
+
+
+def get_total(project_name: str) -> int:
+    return load_aggregates(project_name)["total"]
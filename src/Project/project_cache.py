@@ -0,0 +1,188 @@
+"""
+Process-wide in-memory cache for project data files (pins.json, findings.json, ...).
+
+Several widgets read the same project files (ElevationOverviewWidget,
+FindingsWidget, SidebarNav, PhotoGalleryWidget). The cache keeps one parsed
+copy per (project, file) and hands out that shared object, so repeated reads
+come from memory instead of re-parsing the file.
+
+Entries are validated against the file's size and mtime on every access, so
+changes made outside the app are picked up. Writers call put() after saving
+so the cache is updated without a re-read, and subscribers are notified of
+every change. Qt widgets can connect to ProjectCacheNotifier.changed (see
+qt_notifier()), which also installs a QFileSystemWatcher on cached files.
+
+put() may be called from worker threads: subscribers run on the calling
+thread, while the notifier's changed signal is delivered to widgets on the
+GUI thread.
+
+Cached objects are shared: treat them as read-only and copy before mutating.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class ProjectDataCache:
+    """Shared parsed project files keyed by (project_name, filename)"""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._subscribers: List[Callable[[str, str, Any], None]] = []
+        self._lock = threading.RLock()
+        self._notifier = None
+
+    def get(self, project_name: str, filename: str, path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Return the shared parsed contents of path, loading it with loader(path)
+        if it is not cached or the file changed on disk since it was cached.
+        """
+        key = (project_name, filename)
+        signature = _file_signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["path"] == path and entry["signature"] == signature:
+                return entry["data"]
+        data = loader(path)
+        stale = entry is not None
+        with self._lock:
+            # The loader may have created or repaired the file, so stat it again
+            self._entries[key] = {"path": path, "signature": _file_signature(path), "data": data}
+        self._watch(path)
+        if stale:
+            self._notify(project_name, filename, data)
+        return data
+
+    def peek(self, project_name: str, filename: str) -> Any:
+        """Return the cached data without touching disk, or None if not cached"""
+        with self._lock:
+            entry = self._entries.get((project_name, filename))
+            return entry["data"] if entry else None
+
+    def put(self, project_name: str, filename: str, path: str, data: Any):
+        """Store data that was just written to path and notify subscribers"""
+        with self._lock:
+            self._entries[(project_name, filename)] = {
+                "path": path, "signature": _file_signature(path), "data": data
+            }
+        self._watch(path)
+        self._notify(project_name, filename, data)
+
+    def invalidate(self, project_name: str = None, filename: str = None):
+        """Drop cached entries for a file, a whole project, or everything"""
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (project_name is None or key[0] == project_name)
+                    and (filename is None or key[1] == filename)]
+            for key in keys:
+                del self._entries[key]
+        for key in keys:
+            self._notify(key[0], key[1], None)
+
+    def subscribe(self, callback: Callable[[str, str, Any], None]):
+        """
+        Register callback(project_name, filename, data), called whenever a cached
+        file changes. data is the new shared object, or None if it was invalidated.
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, str, Any], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, project_name: str, filename: str, data: Any):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(project_name, filename, data)
+            except Exception as e:
+                print(f"[ERROR] Project cache subscriber failed for {project_name}/{filename}: {e}")
+        if self._notifier is not None:
+            self._notifier.changed.emit(project_name, filename)
+
+    # --- Qt integration ---
+    def qt_notifier(self):
+        """
+        Return the ProjectCacheNotifier QObject, creating it on first use.
+        Requires a running QApplication; returns None if PySide6 is unavailable.
+        """
+        if self._notifier is None:
+            try:
+                self._notifier = _create_qt_notifier(self)
+            except ImportError:
+                return None
+            with self._lock:
+                paths = [entry["path"] for entry in self._entries.values()]
+            for path in paths:
+                self._watch(path)
+        return self._notifier
+
+    def _watch(self, path: str):
+        if self._notifier is not None:
+            self._notifier.watch(path)
+
+    def _file_changed(self, path: str):
+        """Called by the file watcher: reload entries whose file really changed"""
+        signature = _file_signature(path)
+        with self._lock:
+            changed = [key for key, entry in self._entries.items()
+                       if entry["path"] == path and entry["signature"] != signature]
+            for key in changed:
+                del self._entries[key]
+        for key in changed:
+            self._notify(key[0], key[1], None)
+
+
+def _create_qt_notifier(cache: ProjectDataCache):
+    from PySide6.QtCore import QObject, QFileSystemWatcher, QThread, Qt, Signal
+
+    class ProjectCacheNotifier(QObject):
+        """Qt bridge for the project cache: emits changed(project_name, filename)"""
+        changed = Signal(str, str)
+        _watch_requested = Signal(str)
+
+        def __init__(self):
+            super().__init__()
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(self._on_file_changed)
+            self._watch_requested.connect(self._add_path, Qt.QueuedConnection)
+
+        def watch(self, path: str):
+            # Files cached by worker threads (see Project/derived_writer.py) are
+            # added to the watcher on the notifier's own thread
+            if QThread.currentThread() is not self.thread():
+                self._watch_requested.emit(path)
+            else:
+                self._add_path(path)
+
+        def _add_path(self, path: str):
+            if os.path.exists(path) and path not in self.watcher.files():
+                self.watcher.addPath(path)
+
+        def _on_file_changed(self, path: str):
+            cache._file_changed(path)
+            # Files replaced by an atomic rename drop out of the watcher
+            self.watch(path)
+
+    return ProjectCacheNotifier()
+
+
+# Global project cache instance
+project_cache = ProjectDataCache()
+
+def get_project_cache() -> ProjectDataCache:
+    """Get the global project data cache"""
+    return project_cache
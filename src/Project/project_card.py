@@ -21,20 +21,33 @@ class ProjectCard(QFrame):
         layout.setContentsMargins(16, 8, 16, 8)
         layout.setSpacing(4)
 
-        title = QLabel(project_name)
-        title.setObjectName("ProjectTitle")
-        subtitle_label = QLabel(subtitle)
-        subtitle_label.setObjectName("ProjectSubtitle")
+        self.title_label = QLabel(project_name)
+        self.title_label.setObjectName("ProjectTitle")
+        self.subtitle_label = QLabel(subtitle)
+        self.subtitle_label.setObjectName("ProjectSubtitle")
         members_row = QHBoxLayout()
         members_row.addStretch()
-        members_label = QLabel(f"{members} 👥")
-        members_label.setObjectName("ProjectMembers")
-        members_row.addWidget(members_label)
+        self.members_label = QLabel(f"{members} 👥")
+        self.members_label.setObjectName("ProjectMembers")
+        members_row.addWidget(self.members_label)
 
-        layout.addWidget(title)
-        layout.addWidget(subtitle_label)
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.subtitle_label)
         layout.addLayout(members_row)
 
+    def set_project(self, project_data):
+        """Show another project on this card (cards are reused by the project grid)"""
+        self.project_data = project_data
+        self.title_label.setText(project_data.get("name", ""))
+        self.subtitle_label.setText(project_data.get("subtitle", ""))
+        self.members_label.setText(f"{project_data.get('members', 0)} 👥")
+        if "findings" in project_data:
+            self.setToolTip(f"{project_data.get('elevations', 0)} elevations, "
+                            f"{project_data.get('open_findings', 0)} open of "
+                            f"{project_data.get('findings', 0)} findings")
+        else:
+            self.setToolTip("")
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.project_clicked.emit(self.project_data)
@@ -4,10 +4,12 @@ Each project has its own findings.json file, no more global master_findings.
 """
 
 import os
+import copy
 import json
 from datetime import date
 from typing import List, Dict, Any, Optional
 from config.status import STATUS_OPTIONS
+from Project.models import Finding
 
 def get_project_findings_path(project_name: str) -> str:
     """Get path to project-specific findings.json file"""
@@ -18,38 +20,53 @@ def get_project_findings_path(project_name: str) -> str:
     os.makedirs(base_dir, exist_ok=True)
     return os.path.join(base_dir, "findings.json")
 
-def load_project_findings(project_name: str) -> List[Dict[str, Any]]:
-    """Load findings for a specific project"""
-    findings_path = get_project_findings_path(project_name)
-    
+def _read_findings_file(findings_path: str) -> List[Dict[str, Any]]:
+    """Read findings from disk, with dates left as ISO strings"""
     if not os.path.exists(findings_path):
         # Create empty findings file
+        project_name = os.path.basename(os.path.dirname(findings_path))
         save_project_findings(project_name, [])
         return []
     
     try:
         with open(findings_path, "r", encoding="utf-8") as fp:
             findings = json.load(fp)
-            
-        # Parse dates
-        for finding in findings:
-            if finding.get("start_date"):
-                try:
-                    finding["start_date"] = date.fromisoformat(finding["start_date"])
-                except:
-                    finding["start_date"] = None
-            if finding.get("end_date"):
-                try:
-                    finding["end_date"] = date.fromisoformat(finding["end_date"])
-                except:
-                    finding["end_date"] = None
-        
         return findings
         
     except (json.JSONDecodeError, Exception) as e:
-        print(f"[ERROR] Failed to load findings for {project_name}: {e}")
+        print(f"[ERROR] Failed to load findings from {findings_path}: {e}")
         return []
 
+def get_shared_findings(project_name: str) -> List[Dict[str, Any]]:
+    """
+    Return the project's findings from the process-wide project cache.
+    Shared with every other caller: do not mutate (use load_project_findings
+    for an editable copy). Dates are ISO strings.
+    """
+    from Project.project_cache import get_project_cache
+    findings_path = get_project_findings_path(project_name)
+    return get_project_cache().get(project_name, "findings.json", findings_path, _read_findings_file)
+
+def load_project_findings(project_name: str) -> List[Dict[str, Any]]:
+    """Load findings for a specific project"""
+    findings = copy.deepcopy(get_shared_findings(project_name))
+    return _parse_finding_dates(findings)
+
+def _parse_finding_dates(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parse ISO start/end dates in place"""
+    for finding in findings:
+        if finding.get("start_date"):
+            try:
+                finding["start_date"] = date.fromisoformat(finding["start_date"])
+            except:
+                finding["start_date"] = None
+        if finding.get("end_date"):
+            try:
+                finding["end_date"] = date.fromisoformat(finding["end_date"])
+            except:
+                finding["end_date"] = None
+    return findings
+
 def save_project_findings(project_name: str, findings: List[Dict[str, Any]]) -> bool:
     """Save findings for a specific project"""
     findings_path = get_project_findings_path(project_name)
@@ -65,8 +82,15 @@ def save_project_findings(project_name: str, findings: List[Dict[str, Any]]) ->
                 finding_copy["end_date"] = finding_copy["end_date"].isoformat() if finding_copy["end_date"] else None
             findings_to_save.append(finding_copy)
         
+        text = json.dumps(findings_to_save, separators=(",", ":"))
         with open(findings_path, "w", encoding="utf-8") as fp:
-            json.dump(findings_to_save, fp, indent=2)
+            fp.write(text)
+        # Parsed back so the cache shares no lists (photos) with the caller's findings
+        findings_to_save = json.loads(text)
+        from Project.project_cache import get_project_cache
+        get_project_cache().put(project_name, "findings.json", findings_path, findings_to_save)
+        from Project.derived_writer import get_derived_writer
+        get_derived_writer().schedule_findings(project_name, findings_to_save)
         
         print(f"[INFO] Saved {len(findings)} findings for project {project_name}")
         return True
@@ -94,35 +118,15 @@ def add_finding_to_project(project_name: str, pin_data: Dict[str, Any]) -> Dict[
                     "material": pin_data.get("material", finding.get("material", "")),
                     "defect": pin_data.get("defect", finding.get("defect", "")),
                     "elevation": pin_data.get("elevation", finding.get("elevation", "")),
+                    "elevation_id": pin_data.get("elevation_id", finding.get("elevation_id")),
                 })
                 save_project_findings(project_name, findings)
                 print(f"[INFO] Updated finding {finding['id']} for pin {pin_id} in project {project_name}")
                 return finding
     
     # Create new finding
-    next_id = max([f.get("id", 0) for f in findings], default=0) + 1
-    
-    # Validate status
-    status = pin_data.get("status", STATUS_OPTIONS[0])
-    if status not in STATUS_OPTIONS:
-        status = STATUS_OPTIONS[0]
-    
-    new_finding = {
-        "id": next_id,
-        "title": pin_data.get("name", "Untitled Finding"),
-        "status": status,
-        "color": pin_data.get("color", "#d32f2f"),
-        "category": pin_data.get("category", "Defect"),
-        "assignee": pin_data.get("assignee", ""),
-        "drop": pin_data.get("drop", ""),
-        "start_date": pin_data.get("start_date", None),
-        "end_date": pin_data.get("end_date", None),
-        "photos": pin_data.get("photos", []),
-        "material": pin_data.get("material", ""),
-        "defect": pin_data.get("defect", ""),
-        "elevation": pin_data.get("elevation", ""),
-        "pin_id": pin_id,
-    }
+    from Project.id_allocator import next_finding_id
+    new_finding = build_finding(next_finding_id(project_name), pin_data)
     
     findings.append(new_finding)
     save_project_findings(project_name, findings)
@@ -130,6 +134,31 @@ def add_finding_to_project(project_name: str, pin_data: Dict[str, Any]) -> Dict[
     print(f"[INFO] Created finding {new_finding['id']} for pin {pin_id} in project {project_name}")
     return new_finding
 
+def build_finding(finding_id: int, pin_data: Dict[str, Any]) -> Dict[str, Any]:
+    """New finding dict for a pin (not saved)"""
+    # Validate status
+    status = pin_data.get("status", STATUS_OPTIONS[0])
+    if status not in STATUS_OPTIONS:
+        status = STATUS_OPTIONS[0]
+    
+    return Finding(
+        id=finding_id,
+        title=pin_data.get("name", "Untitled Finding"),
+        status=status,
+        color=pin_data.get("color", "#d32f2f"),
+        category=pin_data.get("category", "Defect"),
+        assignee=pin_data.get("assignee", ""),
+        drop=pin_data.get("drop", ""),
+        start_date=pin_data.get("start_date", None),
+        end_date=pin_data.get("end_date", None),
+        photos=pin_data.get("photos", []),
+        material=pin_data.get("material", ""),
+        defect=pin_data.get("defect", ""),
+        elevation=pin_data.get("elevation", ""),
+        elevation_id=pin_data.get("elevation_id"),
+        pin_id=pin_data.get("pin_id"),
+    ).to_dict()
+
 def get_findings_by_status(project_name: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Group project findings by status for the kanban board.
@@ -154,28 +183,19 @@ def get_material_defect_summary(project_name: str) -> Dict[tuple, int]:
     """
     Get summary of material/defect pairs for sidebar display.
     Returns dict with (material, defect) tuples as keys and counts as values.
-    Now uses pins directly since that's where all the findings data is stored.
+    Reads the pin counts maintained by save_pins (see Project/project_aggregates.py).
     """
     from collections import Counter
     pair_counts = Counter()
     
     try:
-        # Load pins directly since they contain the material/defect information
-        from Project.Elevations.findings_logic import load_pins
-        pins = load_pins(project_name)
-        
-        for pin in pins:
-            material = pin.get('material', '').strip()
-            defect = pin.get('defect', '').strip()
-            if material and defect:
-                pair_counts[(material, defect)] += 1
-        
-        print(f"[DEBUG] get_material_defect_summary for {project_name}: {dict(pair_counts)}")
+        from Project.project_aggregates import get_material_defect_counts
+        pair_counts.update(get_material_defect_counts(project_name))
         
     except Exception as e:
-        print(f"[ERROR] Failed to load pins for material/defect summary: {e}")
+        print(f"[ERROR] Failed to load pin counts for material/defect summary: {e}")
         # Fallback to findings if pins fail
-        findings = load_project_findings(project_name)
+        findings = get_shared_findings(project_name)
         for finding in findings:
             material = finding.get('material', '').strip()
             defect = finding.get('defect', '').strip()
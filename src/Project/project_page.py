@@ -20,6 +20,7 @@ from Project.Findings.findings_widget import FindingsWidget
 from Project.Elevations.elevation_add_dialog import ElevationAddDialog
 from Project.Elevations.elevation_overview import ElevationOverviewWidget
 from Project.Photos.Photo_finding import PhotoGalleryWidget
+from Project.elevation_registry import ensure_elevation_ids, make_elevation_item
 from functools import partial
 
 class AddElevationCard(QWidget):
@@ -188,6 +189,9 @@ class ProjectPage(QWidget):
         ])
         print(f"[DEBUG] Loaded folders in __init__: {self.folders}")
         self.project_data['elevations'] = self.folders
+        # Give elevations from older projects a stable id
+        if ensure_elevation_ids(self.folders):
+            self.save_project()
         self.grid_widget = QWidget()
         self.grid_layout = QVBoxLayout(self.grid_widget)
         self.grid_layout.setSpacing(16)
@@ -204,6 +208,14 @@ class ProjectPage(QWidget):
         elif 'name' in self.project_data:
             project_name = self.project_data['name']
         
+        if project_name:
+            # Attach pins saved before elevation ids existed to their elevation
+            from Project.Elevations.findings_logic import assign_elevation_ids
+            try:
+                assign_elevation_ids(project_name, self.folders)
+            except Exception as e:
+                print(f"[ProjectPage] Could not assign elevation ids to pins: {e}")
+
         self.findings_widget = FindingsWidget(project_name=project_name)
         self.stacked_content.addWidget(self.findings_widget)  # index 1
 
@@ -245,6 +257,8 @@ class ProjectPage(QWidget):
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(self.project_data, f, indent=2)
             print(f"[ProjectPage] Project saved to {file_path}")
+            from Project.portfolio_catalog import update_project
+            update_project(os.path.dirname(file_path))
             # Reload from disk to ensure UI and memory match
             with open(file_path, 'r', encoding='utf-8') as f:
                 loaded = json.load(f)
@@ -268,7 +282,7 @@ class ProjectPage(QWidget):
                 continue
             if not self.folders:
                 self.folders.append({"name": "Default Folder", "items": []})
-            self.folders[-1]["items"].append([name, file_path])
+            self.folders[-1]["items"].append(make_elevation_item(name, file_path))
             self.save_project()
             self.populate_elevation_grid()
             break
@@ -328,14 +342,12 @@ class ProjectPage(QWidget):
             col = 0
             max_cols = 3
             for item in folder["items"]:
-                # Support both [name, path] and [name, local_path, s3_url]
-                if len(item) == 3:
-                    name, local_path, s3_url = item
-                else:
-                    name, local_path = item
-                    s3_url = None
+                # Items are [name, local_path, s3_url, elevation_id]; older ones are shorter
+                name, local_path = item[0], item[1]
+                elevation_id = item[3] if len(item) > 3 else None
                 card = ElevationCard(name, local_path)
-                card.clicked.connect(lambda path=local_path, elev_name=name: self.open_elevation_overview(path, elev_name))
+                card.clicked.connect(lambda path=local_path, elev_name=name, elev_id=elevation_id:
+                                     self.open_elevation_overview(path, elev_name, elev_id))
                 grid.addWidget(card, row, col)
                 col += 1
                 if col >= max_cols:
@@ -347,7 +359,7 @@ class ProjectPage(QWidget):
             folder_vbox.addLayout(grid)
             self.grid_layout.addWidget(folder_container)
 
-    def open_elevation_overview(self, pdf_path, elevation_name=None):
+    def open_elevation_overview(self, pdf_path, elevation_name=None, elevation_id=None):
         print(f"[DEBUG] open_elevation_overview called with pdf_path: {pdf_path}, elevation_name: {elevation_name}")
         if not os.path.exists(pdf_path):
             print(f"[DEBUG] File does NOT exist: {pdf_path}")
@@ -359,7 +371,8 @@ class ProjectPage(QWidget):
             project_name = os.path.basename(self.project_data['folder'])
         elif 'name' in self.project_data:
             project_name = self.project_data['name']
-        overview = ElevationOverviewWidget(pdf_path=pdf_path, sidebar=self.sidebar, project_name=project_name, elevation_name=elevation_name)
+        overview = ElevationOverviewWidget(pdf_path=pdf_path, sidebar=self.sidebar, project_name=project_name, elevation_name=elevation_name,
+                                          elevation_id=elevation_id)
         overview.back_to_project.connect(self.show_elevations_overview)
         self.stacked_content.addWidget(overview)
         self.stacked_content.setCurrentWidget(overview)
@@ -449,8 +462,9 @@ class ProjectPage(QWidget):
                 # S3 upload is optional, continue with local save
                 s3_url = None
 
-            self.folders[folder_idx]["items"].append([name, local_path, s3_url])
-            print(f"[DEBUG] Added elevation to folder: {[name, local_path, s3_url]}")
+            item = make_elevation_item(name, local_path, s3_url)
+            self.folders[folder_idx]["items"].append(item)
+            print(f"[DEBUG] Added elevation to folder: {item}")
             self.save_project()
             print(f"[DEBUG] Called save_project()")
             # Confirm file exists locally
@@ -0,0 +1,435 @@
+"""
+PDF inspection reports.
+
+generate_report writes one PDF per project:
+
+    cover page      project name, date, findings per status
+    per elevation   the elevation drawing with its pins drawn on it, a pin
+                    list, then one page per finding (details, latest comments,
+                    an excerpt of the drawing around the pin, photos)
+
+Pages are built with PyMuPDF directly from the source drawings: the drawing
+page is copied into the report and the pins are added as vector circles and
+labels in the colors PDFPinViewer uses (config.status.get_status_color), so
+nothing is rasterized and the drawing stays sharp at any zoom.
+
+Each elevation is rendered to its own PDF in storage/<project>/report_cache/,
+named after a digest of everything that goes on its pages (the drawing file,
+its pins, findings, comments and photo files). Elevations whose digest did
+not change since the last run are reused as they are; the others are
+rendered in parallel in worker processes. The report is then assembled from
+the cached files.
+
+Pin positions are fractions of the drawing page as shown (page 0, after its
+/Rotate), as stored by PDFPinViewer.
+"""
+
+import os
+import json
+import hashlib
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+REPORT_VERSION = 1  # bump when the page layout changes so cached pages are rebuilt
+CACHE_DIRNAME = "report_cache"
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 portrait, points
+MARGIN = 40
+LINE_HEIGHT = 14
+MAX_COMMENTS = 5
+PHOTOS_PER_PAGE = 4
+EXCERPT_FRACTION = 0.25  # side of the drawing excerpt, as a fraction of the drawing's shorter side
+
+
+def _rgb(hex_color: str):
+    hex_color = hex_color.lstrip("#")
+    return tuple(int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def _file_signature(path: Optional[str]):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+# --- Collecting the report contents (main process) ---
+def _resolve_photo(ref: str, search_dirs: List[str]) -> Optional[str]:
+    if os.path.isabs(ref):
+        return ref if os.path.exists(ref) else None
+    for folder in search_dirs:
+        path = os.path.join(folder, ref)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _pin_entry(pin, finding, chat, include_photos, photo_dirs):
+    from Project.findings_export import photo_references
+    comments = [{"author": msg.get("author", ""), "date": msg.get("date", ""), "text": msg.get("text", "")}
+                for msg in chat if msg.get("type", "text") == "text" and msg.get("text")]
+    photos = []
+    if include_photos:
+        for ref in photo_references(finding or {}, chat):
+            path = _resolve_photo(ref, photo_dirs)
+            photos.append({"ref": ref, "path": path, "signature": _file_signature(path)})
+    pos = pin.get("pos") or {}
+    return {
+        "pin_id": pin.get("pin_id"),
+        "x": pos.get("x", 0.0), "y": pos.get("y", 0.0),
+        "name": pin.get("name") or (finding or {}).get("title", "Untitled Finding"),
+        "status": pin.get("status") or (finding or {}).get("status", ""),
+        "material": pin.get("material", ""),
+        "defect": pin.get("defect", ""),
+        "finding": {key: (finding or {}).get(key) for key in
+                    ("id", "assignee", "category", "drop", "start_date", "end_date")},
+        "comments": comments[-MAX_COMMENTS:],
+        "photos": photos,
+    }
+
+
+def build_jobs(project_name: str, folders=None, elevation_ids=None, include_photos: bool = True) -> List[Dict[str, Any]]:
+    """
+    One render job per elevation that has a PDF drawing (in project order).
+    A job holds everything its pages show, so it can be digested for the
+    page cache and rendered in another process.
+    """
+    from Project.elevation_registry import iter_elevations, load_project_folders
+    from Project.pin_partitions import partition_key
+    from Project.Elevations.findings_logic import get_shared_pins, elevation_partition_keys, get_project_storage_dir
+    from Project.project_findings import get_shared_findings
+    from Project.Elevations.chat_data_manager import ChatDataManager
+    if folders is None:
+        folders = load_project_folders(project_name)
+    pins_by_key: Dict[str, List[Dict[str, Any]]] = {}
+    for pin in get_shared_pins(project_name):
+        pins_by_key.setdefault(partition_key(pin), []).append(pin)
+    findings_by_pin = {f.get("pin_id"): f for f in get_shared_findings(project_name) if f.get("pin_id") is not None}
+    chat_manager = ChatDataManager(project_name)
+    photo_dirs = [chat_manager.photos_dir, chat_manager.project_dir, get_project_storage_dir(project_name)]
+
+    jobs = []
+    for elevation_id, name, pdf_path in iter_elevations(folders):
+        if elevation_ids and elevation_id not in elevation_ids:
+            continue
+        if not pdf_path or not str(pdf_path).lower().endswith(".pdf"):
+            continue
+        pins = []
+        for key in elevation_partition_keys(name, pdf_path, elevation_id):
+            pins.extend(pins_by_key.pop(key, []))
+        pins.sort(key=lambda p: p.get("pin_id") or 0)
+        entries = []
+        for pin in pins:
+            pin_id = pin.get("pin_id")
+            chat = (chat_manager.load_pin_chat(pin_id) if pin_id is not None else []) or pin.get("chat") or []
+            entries.append(_pin_entry(pin, findings_by_pin.get(pin_id), chat, include_photos, photo_dirs))
+        jobs.append({
+            "elevation_id": elevation_id or name,
+            "name": name,
+            "pdf_path": pdf_path,
+            "pdf_signature": _file_signature(pdf_path),
+            "pins": entries,
+        })
+    return jobs
+
+
+def job_digest(job: Dict[str, Any]) -> str:
+    text = json.dumps([REPORT_VERSION, job], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+
+# --- Rendering one elevation (worker process) ---
+def _insert_lines(page, y: float, lines, fontsize: float = 10, color=(0, 0, 0)) -> float:
+    for line in lines:
+        page.insert_text((MARGIN, y), line, fontsize=fontsize, color=color)
+        y += LINE_HEIGHT
+    return y
+
+
+def _draw_pin(page, center, radius: float, status: str, label=None):
+    """Pin circle (and label) at center, given in the page's displayed (rotated) coordinates"""
+    from config.status import get_status_color
+    color = _rgb(get_status_color(status))
+    # Drawing happens in unrotated page space; text is turned to read upright
+    derotate = page.derotation_matrix
+    shape = page.new_shape()
+    shape.draw_circle(center * derotate, radius)
+    shape.finish(color=(0.12, 0.12, 0.12), fill=color, width=max(radius / 5, 0.5))
+    shape.commit()
+    if label is not None:
+        at = center + (radius * 1.2, -radius * 0.4)
+        page.insert_text(at * derotate, str(label), fontsize=radius * 1.6,
+                         color=(0.12, 0.12, 0.12), rotate=page.rotation)
+
+
+def _render_overview(fitz, out, src, job):
+    """Copy of the drawing page with every pin drawn on it"""
+    out.insert_pdf(src, from_page=0, to_page=0)
+    page = out[-1]
+    shown = page.rect  # the page as displayed, i.e. after /Rotate
+    radius = max(min(shown.width, shown.height) * 0.008, 3)
+    page.insert_text(fitz.Point(radius, radius * 3) * page.derotation_matrix,
+                     f"{job['name']} - {len(job['pins'])} findings",
+                     fontsize=radius * 2.5, color=(0.12, 0.12, 0.12), rotate=page.rotation)
+    for pin in job["pins"]:
+        center = fitz.Point(pin["x"] * shown.width, pin["y"] * shown.height)
+        _draw_pin(page, center, radius, pin["status"], pin["pin_id"])
+
+
+def _render_pin_list(out, job):
+    from config.status import get_status_color
+    pins = job["pins"]
+    per_page = int((PAGE_HEIGHT - 2 * MARGIN - 30) // LINE_HEIGHT)
+    for start in range(0, max(len(pins), 1), per_page):
+        page = out.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, MARGIN + 10), f"{job['name']}: findings", fontsize=14)
+        y = MARGIN + 34
+        for pin in pins[start:start + per_page]:
+            color = _rgb(get_status_color(pin["status"]))
+            page.draw_circle((MARGIN + 4, y - 3.5), 4, color=color, fill=color)
+            detail = " / ".join(part for part in (pin["material"], pin["defect"]) if part)
+            page.insert_text((MARGIN + 14, y), f"#{pin['pin_id']}  {pin['name']}  [{pin['status']}]  {detail}",
+                             fontsize=9)
+            y += LINE_HEIGHT
+        if not pins:
+            page.insert_text((MARGIN, y), "No findings on this elevation.", fontsize=10)
+
+
+def _excerpt_clip(fitz, shown, x: float, y: float):
+    """Square around (x, y) in displayed page coordinates, shifted to stay on the page"""
+    side = min(shown.width, shown.height) * EXCERPT_FRACTION
+    x0 = min(max(x - side / 2, 0), shown.width - side)
+    y0 = min(max(y - side / 2, 0), shown.height - side)
+    return fitz.Rect(x0, y0, x0 + side, y0 + side)
+
+
+def _render_finding_pages(fitz, out, src, job, pin):
+    page = out.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((MARGIN, MARGIN + 12), f"#{pin['pin_id']}  {pin['name']}", fontsize=16)
+    from config.status import get_status_color
+    color = _rgb(get_status_color(pin["status"]))
+    page.draw_rect(fitz.Rect(MARGIN, MARGIN + 22, MARGIN + 10, MARGIN + 32), color=color, fill=color)
+    page.insert_text((MARGIN + 16, MARGIN + 31), pin["status"] or "No status", fontsize=11)
+    finding = pin["finding"]
+    details = [
+        f"Elevation: {job['name']}",
+        f"Material: {pin['material']}",
+        f"Defect: {pin['defect']}",
+    ]
+    for label, key in (("Finding", "id"), ("Assignee", "assignee"), ("Category", "category"),
+                       ("Drop", "drop"), ("Start date", "start_date"), ("End date", "end_date")):
+        if finding.get(key) not in (None, ""):
+            details.append(f"{label}: {finding[key]}")
+    y = _insert_lines(page, MARGIN + 54, details)
+    if pin["comments"]:
+        y = _insert_lines(page, y + 6, ["Latest comments:"], fontsize=10)
+        for comment in pin["comments"]:
+            text = " ".join(comment["text"].split())
+            rect = fitz.Rect(MARGIN + 10, y - 10, PAGE_WIDTH - MARGIN, y + 2 * LINE_HEIGHT)
+            page.insert_textbox(rect, f"{comment['date']} {comment['author']}: {text}", fontsize=9)
+            y += 2 * LINE_HEIGHT
+
+    # Excerpt of the drawing around the pin, copied as vectors. Rotated drawings
+    # are left out: show_pdf_page clips in unrotated page space.
+    src_page = src[0]
+    if src_page.rotation == 0:
+        shown = src_page.rect
+        px, py = pin["x"] * shown.width, pin["y"] * shown.height
+        clip = _excerpt_clip(fitz, shown, px, py)
+        size = min(PAGE_WIDTH - 2 * MARGIN, PAGE_HEIGHT - MARGIN - y - 20)
+        if size > 80 and clip.width > 0:
+            target = fitz.Rect(MARGIN, y + 10, MARGIN + size, y + 10 + size)
+            page.show_pdf_page(target, src, 0, clip=clip)
+            page.draw_rect(target, color=(0.7, 0.7, 0.7), width=0.5)
+            scale = size / clip.width
+            center = fitz.Point(target.x0 + (px - clip.x0) * scale, target.y0 + (py - clip.y0) * scale)
+            _draw_pin(page, center, 6, pin["status"])
+
+    # Photos, PHOTOS_PER_PAGE per page in a 2x2 grid
+    photos = pin["photos"]
+    cell_w = (PAGE_WIDTH - 3 * MARGIN) / 2
+    cell_h = (PAGE_HEIGHT - 3 * MARGIN - 30) / 2
+    for start in range(0, len(photos), PHOTOS_PER_PAGE):
+        page = out.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, MARGIN + 10), f"#{pin['pin_id']}  {pin['name']}: photos", fontsize=12)
+        for i, photo in enumerate(photos[start:start + PHOTOS_PER_PAGE]):
+            x0 = MARGIN + (i % 2) * (cell_w + MARGIN)
+            y0 = MARGIN + 30 + (i // 2) * (cell_h + MARGIN)
+            cell = fitz.Rect(x0, y0, x0 + cell_w, y0 + cell_h - LINE_HEIGHT)
+            inserted = False
+            if photo["path"]:
+                try:
+                    page.insert_image(cell, filename=photo["path"], keep_proportion=True)
+                    inserted = True
+                except Exception as e:
+                    print(f"[WARNING] Could not add photo {photo['path']} to report: {e}")
+            if not inserted:
+                page.draw_rect(cell, color=(0.7, 0.7, 0.7), width=0.5)
+            caption = os.path.basename(photo["ref"]) + ("" if inserted else " (missing)")
+            page.insert_text((x0, cell.y1 + 11), caption, fontsize=8)
+
+
+def render_elevation(job: Dict[str, Any], output_path: str) -> int:
+    """Render one elevation's pages to output_path. Returns the page count."""
+    import fitz  # PyMuPDF
+    src = fitz.open(job["pdf_path"])
+    out = fitz.open()
+    try:
+        if src.page_count == 0:
+            raise ValueError(f"Drawing has no pages: {job['pdf_path']}")
+        _render_overview(fitz, out, src, job)
+        _render_pin_list(out, job)
+        for pin in job["pins"]:
+            _render_finding_pages(fitz, out, src, job, pin)
+        tmp_path = output_path + ".tmp"
+        out.save(tmp_path, garbage=3, deflate=True)
+        page_count = out.page_count
+    finally:
+        out.close()
+        src.close()
+    os.replace(tmp_path, output_path)
+    return page_count
+
+
+# --- Assembling the report ---
+def _cover_page(out, project_name: str, jobs: List[Dict[str, Any]]):
+    from config.status import STATUS_OPTIONS, get_status_color
+    page = out.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((MARGIN, MARGIN + 30), "Facade Inspection Report", fontsize=22)
+    page.insert_text((MARGIN, MARGIN + 58), project_name, fontsize=14)
+    page.insert_text((MARGIN, MARGIN + 78), date.today().isoformat(), fontsize=10, color=(0.4, 0.4, 0.4))
+    counts: Dict[str, int] = {}
+    for job in jobs:
+        for pin in job["pins"]:
+            counts[pin["status"]] = counts.get(pin["status"], 0) + 1
+    y = MARGIN + 120
+    page.insert_text((MARGIN, y), "Findings by status", fontsize=12)
+    y += 22
+    for status in STATUS_OPTIONS + sorted(s for s in counts if s not in STATUS_OPTIONS):
+        if not counts.get(status):
+            continue
+        color = _rgb(get_status_color(status))
+        page.draw_circle((MARGIN + 5, y - 4), 5, color=color, fill=color)
+        page.insert_text((MARGIN + 16, y), f"{status or 'No status'}: {counts[status]}", fontsize=10)
+        y += LINE_HEIGHT + 2
+    y += 16
+    page.insert_text((MARGIN, y), "Elevations", fontsize=12)
+    y += 22
+    for job in jobs:
+        if y > PAGE_HEIGHT - MARGIN:
+            break
+        page.insert_text((MARGIN, y), f"{job['name']}: {len(job['pins'])} findings", fontsize=10)
+        y += LINE_HEIGHT
+
+
+def get_report_cache_dir(project_name: str) -> str:
+    from Project.Elevations.findings_logic import get_project_storage_dir
+    return os.path.join(get_project_storage_dir(project_name), CACHE_DIRNAME)
+
+
+def _cache_path(cache_dir: str, job: Dict[str, Any], digest: str) -> str:
+    from Project.pin_partitions import elevation_key
+    return os.path.join(cache_dir, f"{elevation_key(job['elevation_id'])}-{digest}.pdf")
+
+
+def _render_all(todo, workers: Optional[int], on_done: Callable[[], None]) -> Dict[str, Exception]:
+    """
+    Render (job, path) pairs, in worker processes when there is more than one.
+    Returns {path: error} for the elevations that could not be rendered.
+    """
+    failed: Dict[str, Exception] = {}
+    if workers is None:
+        workers = min(len(todo), os.cpu_count() or 1)
+    if len(todo) > 1 and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(render_elevation, job, path): path for job, path in todo}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        failed[futures[future]] = e
+                    on_done()
+            return failed
+        except (OSError, BrokenProcessPool) as e:
+            # e.g. no process support in a frozen build: render the rest here
+            print(f"[WARNING] Parallel report rendering failed ({e}); rendering in-process")
+            failed.clear()
+    for job, path in todo:
+        if os.path.exists(path):
+            continue
+        try:
+            render_elevation(job, path)
+        except Exception as e:
+            failed[path] = e
+        on_done()
+    return failed
+
+
+def generate_report(project_name: str, output_path: str, folders=None, elevation_ids=None,
+                    include_photos: bool = True, workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Write the inspection report for a project to output_path.
+    folders is the project's elevation folder list (default: read from its
+    project.json); elevation_ids limits the report to some elevations.
+    progress(done, total) is called as elevations are ready.
+    Elevations whose drawing cannot be rendered are left out (and listed in
+    "failed"). Returns {"pages", "elevations", "rendered", "cached", "failed"}.
+    """
+    import fitz  # PyMuPDF
+    jobs = build_jobs(project_name, folders, elevation_ids, include_photos)
+    cache_dir = get_report_cache_dir(project_name)
+    os.makedirs(cache_dir, exist_ok=True)
+    for job in jobs:
+        job["include_photos"] = include_photos
+    paths = [_cache_path(cache_dir, job, job_digest(job)) for job in jobs]
+    todo = [(job, path) for job, path in zip(jobs, paths) if not os.path.exists(path)]
+    cached = len(jobs) - len(todo)
+    done = [cached]
+
+    def on_done():
+        done[0] = min(done[0] + 1, len(jobs))
+        if progress:
+            progress(done[0], len(jobs))
+
+    if progress:
+        progress(cached, len(jobs))
+    failed = _render_all(todo, workers, on_done) if todo else {}
+    for job, path in todo:
+        if path in failed:
+            print(f"[ERROR] Left elevation {job['name']} out of the report: {failed[path]}")
+    paths = [path for path in paths if path not in failed]
+
+    out = fitz.open()
+    try:
+        _cover_page(out, project_name, jobs)
+        for path in paths:
+            with fitz.open(path) as part:
+                out.insert_pdf(part)
+        tmp_path = output_path + ".tmp"
+        out.save(tmp_path, garbage=3, deflate=True)
+        pages = out.page_count
+    finally:
+        out.close()
+    os.replace(tmp_path, output_path)
+
+    # Drop cached elevations that this run replaced or no longer uses
+    keep = {os.path.basename(path) for path in paths}
+    if elevation_ids is None:
+        for filename in os.listdir(cache_dir):
+            if filename.endswith(".pdf") and filename not in keep:
+                try:
+                    os.remove(os.path.join(cache_dir, filename))
+                except OSError:
+                    pass
+    failed_names = [job["name"] for job, path in todo if path in failed]
+    rendered = len(todo) - len(failed_names)
+    print(f"[INFO] Wrote report {output_path}: {pages} pages, "
+          f"{rendered} elevations rendered, {cached} from cache")
+    return {"pages": pages, "elevations": len(jobs), "rendered": rendered, "cached": cached,
+            "failed": failed_names}
@@ -0,0 +1,359 @@
+"""
+Per-project search index over pins/findings and their chat.
+
+storage/<project>/search.sqlite holds one row per pin with its facets
+(status, material, defect, elevation, date) and an SQLite FTS5 table over
+title, material, defect, status, elevation and chat text:
+
+    from Project.search_index import search_findings
+    search_findings("ProjectX", "crack lintel", status=["Unsafe"], date_from="2025-01-01")
+
+The index is kept up to date by the writers: save_pins indexes the pins of
+the partitions it rewrote, save_project_findings the finding dates and
+ChatDataManager.save_pin_chat the chat text, all shortly after the save on a
+worker thread (see Project/derived_writer.py). Writers only touch an index that
+already exists; it is built from the project files on the first search. The
+index records which pins.json it reflects and resyncs the pins if that file
+was changed by something else.
+
+The date facet is the linked finding's start_date, or the date of the pin's
+last chat message if the finding has none.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+SEARCH_DB_FILENAME = "search.sqlite"
+FACETS = ("status", "material", "defect", "elevation")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS entries (
+    pin_id INTEGER PRIMARY KEY,
+    finding_id INTEGER,
+    title TEXT,
+    material TEXT,
+    defect TEXT,
+    status TEXT,
+    elevation TEXT,
+    elevation_id TEXT,
+    start_date TEXT,
+    activity_date TEXT,
+    chat TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_status ON entries(status);
+CREATE INDEX IF NOT EXISTS entries_material ON entries(material);
+CREATE INDEX IF NOT EXISTS entries_defect ON entries(defect);
+CREATE INDEX IF NOT EXISTS entries_elevation ON entries(elevation);
+CREATE INDEX IF NOT EXISTS entries_date ON entries(COALESCE(start_date, activity_date));
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, material, defect, status, elevation, chat,
+    content='entries', content_rowid='pin_id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, title, material, defect, status, elevation, chat)
+    VALUES (new.pin_id, new.title, new.material, new.defect, new.status, new.elevation, new.chat);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, title, material, defect, status, elevation, chat)
+    VALUES ('delete', old.pin_id, old.title, old.material, old.defect, old.status, old.elevation, old.chat);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, title, material, defect, status, elevation, chat)
+    VALUES ('delete', old.pin_id, old.title, old.material, old.defect, old.status, old.elevation, old.chat);
+    INSERT INTO entries_fts(rowid, title, material, defect, status, elevation, chat)
+    VALUES (new.pin_id, new.title, new.material, new.defect, new.status, new.elevation, new.chat);
+END;
+"""
+
+_UPSERT_PIN = """
+INSERT INTO entries (pin_id, finding_id, title, material, defect, status, elevation, elevation_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(pin_id) DO UPDATE SET
+    finding_id = excluded.finding_id, title = excluded.title, material = excluded.material,
+    defect = excluded.defect, status = excluded.status, elevation = excluded.elevation,
+    elevation_id = excluded.elevation_id
+"""
+
+_UPSERT_CHAT = """
+INSERT INTO entries (pin_id, chat, activity_date) VALUES (?, ?, ?)
+ON CONFLICT(pin_id) DO UPDATE SET chat = excluded.chat, activity_date = excluded.activity_date
+"""
+
+
+def _signature(path: str) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _pin_row(pin: Dict[str, Any]):
+    from config.status import STATUS_OPTIONS
+    return (pin["pin_id"], pin.get("finding_id"), pin.get("name") or "", pin.get("material") or "",
+            pin.get("defect") or "", pin.get("status") or STATUS_OPTIONS[0], pin.get("elevation") or "",
+            pin.get("elevation_id"))
+
+
+def _chat_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        if message.get("text"):
+            parts.append(str(message["text"]))
+        if message.get("caption"):
+            parts.append(str(message["caption"]))
+    return "\n".join(parts)
+
+
+def _chat_date(messages: List[Dict[str, Any]]) -> Optional[str]:
+    dates = [str(m.get("timestamp") or m.get("date") or "")[:10] for m in messages]
+    dates = [d for d in dates if d]
+    return max(dates) if dates else None
+
+
+def _as_date(value) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return value.isoformat()[:10] if hasattr(value, "isoformat") else str(value)[:10]
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, as a prefix"""
+    words = re.findall(r"\w+", text, re.UNICODE)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class SearchIndex:
+    """SQLite FTS5 index for one project"""
+
+    def __init__(self, project_name: str, db_path: str):
+        self.project_name = project_name
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- meta ---
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # --- writes ---
+    def upsert_pins(self, pins: Iterable[Dict[str, Any]], removed_ids: Iterable[int] = (),
+                    pins_source: Optional[str] = None):
+        """Index new/changed pins and drop removed ones in one transaction"""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM entries WHERE pin_id = ?", [(i,) for i in removed_ids])
+            self._conn.executemany(_UPSERT_PIN, [_pin_row(p) for p in pins if p.get("pin_id") is not None])
+            if pins_source is not None:
+                self._set_meta("pins_source", pins_source)
+
+    def sync_pins(self, pins: List[Dict[str, Any]], pins_source: Optional[str]):
+        """Make the indexed pins match pins exactly (chat text is kept)"""
+        ids = {p["pin_id"] for p in pins if p.get("pin_id") is not None}
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT pin_id FROM entries")}
+            self.upsert_pins(pins, indexed - ids, pins_source)
+
+    def set_chat(self, pin_id: int, messages: List[Dict[str, Any]]):
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT_CHAT, (pin_id, _chat_text(messages), _chat_date(messages)))
+
+    def set_finding_dates(self, findings: Iterable[Dict[str, Any]]):
+        """Store start dates of findings on their pins' rows"""
+        rows = [(_as_date(f.get("start_date")), f.get("id"), f["pin_id"])
+                for f in findings if f.get("pin_id") is not None]
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE entries SET start_date = ?, finding_id = COALESCE(finding_id, ?) "
+                                   "WHERE pin_id = ?", rows)
+
+    # --- queries ---
+    def _where(self, text, filters, joined_fts=False):
+        clauses, params = [], []
+        query = _fts_query(text) if text else ""
+        if query and not joined_fts:
+            clauses.append("e.pin_id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+            params.append(query)
+        for facet in FACETS:
+            values = filters.get(facet)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            values = list(values)
+            clauses.append(f"e.{facet} IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(values)
+        date_expr = "COALESCE(e.start_date, e.activity_date)"
+        if filters.get("date_from"):
+            clauses.append(f"{date_expr} >= ?")
+            params.append(_as_date(filters["date_from"]))
+        if filters.get("date_to"):
+            clauses.append(f"{date_expr} <= ?")
+            params.append(_as_date(filters["date_to"]))
+        clauses.append("e.title IS NOT NULL")  # chat of a pin that was never saved
+        return " AND ".join(clauses), params, query
+
+    def search(self, text: str = "", limit: Optional[int] = 200, **filters) -> List[Dict[str, Any]]:
+        """
+        Find pins matching free text (every word, prefix match) and facets.
+        Facets: status, material, defect, elevation (a value or a list of values),
+        date_from, date_to (date or 'YYYY-MM-DD', inclusive).
+        Results are ranked by relevance when text is given.
+        """
+        where, params, query = self._where(text, filters, joined_fts=True)
+        if query:
+            sql = (f"SELECT e.*, bm25(entries_fts) AS rank FROM entries_fts "
+                   f"JOIN entries e ON e.pin_id = entries_fts.rowid "
+                   f"WHERE entries_fts MATCH ? AND {where} ORDER BY rank")
+            params = [query] + params
+        else:
+            sql = f"SELECT e.* FROM entries e WHERE {where} ORDER BY e.pin_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            result = {key: row[key] for key in row.keys() if key not in ("chat", "rank")}
+            result["date"] = row["start_date"] or row["activity_date"]
+            results.append(result)
+        return results
+
+    def facet_counts(self, facet: str, text: str = "", **filters) -> Dict[str, int]:
+        """Number of matching pins per value of facet"""
+        if facet not in FACETS:
+            raise ValueError(f"Unknown search facet: {facet}")
+        where, params, _ = self._where(text, filters)
+        sql = f"SELECT e.{facet}, COUNT(*) FROM entries e WHERE {where} GROUP BY e.{facet}"
+        with self._lock:
+            return {value: count for value, count in self._conn.execute(sql, params)}
+
+
+_indexes: Dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_db_path(project_name: str) -> str:
+    from Project.Elevations.findings_logic import get_project_storage_dir
+    return os.path.join(get_project_storage_dir(project_name), SEARCH_DB_FILENAME)
+
+
+def _open(project_name: str, create: bool) -> Optional[SearchIndex]:
+    with _indexes_lock:
+        index = _indexes.get(project_name)
+        if index is None:
+            db_path = get_search_db_path(project_name)
+            if not create and not os.path.exists(db_path):
+                return None
+            index = SearchIndex(project_name, db_path)
+            _indexes[project_name] = index
+        return index
+
+
+def _build(index: SearchIndex):
+    """Index every pin, finding date and chat of the project"""
+    from Project.Elevations.findings_logic import get_shared_pins, get_pins_path
+    from Project.project_findings import get_shared_findings
+    from Project.Elevations.chat_data_manager import ChatDataManager
+    pins_path = get_pins_path(index.project_name)
+    pins = get_shared_pins(index.project_name)
+    index.sync_pins(pins, _signature(pins_path))
+    index.set_finding_dates(get_shared_findings(index.project_name))
+    chat_manager = ChatDataManager(index.project_name)
+    for pin in pins:
+        if pin.get("pin_id") is not None and os.path.exists(chat_manager.get_chat_file_path(pin["pin_id"])):
+            index.set_chat(pin["pin_id"], chat_manager.load_pin_chat(pin["pin_id"]))
+    with index._lock, index._conn:
+        index._set_meta("built", "1")
+
+
+def get_search_index(project_name: str) -> SearchIndex:
+    """Open the project's index, building it or resyncing its pins if needed"""
+    from Project.Elevations.findings_logic import get_shared_pins, get_pins_path
+    from Project.derived_writer import get_derived_writer
+    get_derived_writer().flush(project_name)
+    index = _open(project_name, create=True)
+    pins_source = _signature(get_pins_path(project_name))
+    if index.get_meta("built") != "1":
+        _build(index)
+    elif index.get_meta("pins_source") != pins_source:
+        index.sync_pins(get_shared_pins(project_name), pins_source)
+    return index
+
+
+def drop_search_index(project_name: str):
+    """Close and delete the project's index; the next use builds it again"""
+    with _indexes_lock:
+        index = _indexes.pop(project_name, None)
+    if index is not None:
+        index.close()
+    db_path = get_search_db_path(project_name)
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+def search_findings(project_name: str, text: str = "", limit: Optional[int] = 200, **filters) -> List[Dict[str, Any]]:
+    """Search a project's findings, see SearchIndex.search"""
+    return get_search_index(project_name).search(text, limit, **filters)
+
+
+# --- Hooks for writers: only update an index that already exists ---
+def index_pin_changes(project_name: str, pins_path: str, base_source: Optional[List[int]],
+                      changes: Dict[str, List[Dict[str, Any]]], previous: Dict[str, List[Dict[str, Any]]],
+                      source: Optional[List[int]] = None):
+    """
+    Index the pins of the partitions save_pins rewrote (see
+    pin_partitions.write_partitions); source is the signature of the new
+    pins.json. If the index did not reflect the pins.json being replaced, it
+    is left stale and resynced on the next search.
+    """
+    index = _open(project_name, create=False)
+    if index is None:
+        return
+    try:
+        base = f"{base_source[0]}:{base_source[1]}" if base_source else None
+        if index.get_meta("pins_source") != base or not all(key in previous for key in changes):
+            return
+        new_pins = [pin for group in changes.values() for pin in group]
+        new_ids = {pin.get("pin_id") for pin in new_pins}
+        removed = {pin.get("pin_id") for group in previous.values() for pin in group} - new_ids
+        pins_source = f"{source[0]}:{source[1]}" if source else _signature(pins_path)
+        index.upsert_pins(new_pins, [i for i in removed if i is not None], pins_source)
+    except sqlite3.Error as e:
+        print(f"[WARNING] Could not update search index for {project_name}: {e}")
+
+
+def index_findings(project_name: str, findings: Iterable[Dict[str, Any]]):
+    index = _open(project_name, create=False)
+    if index is None:
+        return
+    try:
+        index.set_finding_dates(findings)
+    except sqlite3.Error as e:
+        print(f"[WARNING] Could not update search index for {project_name}: {e}")
+
+
+def index_chat(project_name: str, pin_id: int, messages: List[Dict[str, Any]]):
+    index = _open(project_name, create=False)
+    if index is None:
+        return
+    try:
+        index.set_chat(pin_id, messages)
+    except sqlite3.Error as e:
+        print(f"[WARNING] Could not update search index for {project_name}: {e}")
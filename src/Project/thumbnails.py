@@ -0,0 +1,110 @@
+"""
+Thumbnail cache for elevation drawings and photos.
+
+Rendering the first page of a drawing (or decoding a full size photo) every
+time a card is shown is slow, so previews are rendered once with PyMuPDF to
+PNG files in storage/.thumbnails/:
+
+    get_thumbnail(path, ELEVATION_THUMBNAIL_SIZE)   # ElevationCard
+    get_thumbnail(path, PHOTO_THUMBNAIL_SIZE)       # PhotoThumbnail
+
+A thumbnail is named after a digest of the source path, its size/mtime and
+the thumbnail size, so a changed drawing or photo gets a new one.
+generate_project_thumbnails renders every thumbnail a project needs ahead
+of time (see `cli.py thumbnails`). Sizes are twice the size shown, for
+high-DPI screens.
+
+Needs PyMuPDF; without it get_thumbnail returns None and callers render the
+source themselves.
+"""
+
+import os
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+THUMBNAILS_DIRNAME = ".thumbnails"
+ELEVATION_THUMBNAIL_SIZE = (400, 220)
+PHOTO_THUMBNAIL_SIZE = (232, 232)
+THUMBNAIL_SOURCES = (".pdf", ".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+
+def get_thumbnails_dir() -> str:
+    from Project.portfolio_catalog import get_projects_storage_dir
+    return os.path.join(get_projects_storage_dir(), THUMBNAILS_DIRNAME)
+
+
+def thumbnail_path(source_path: str, size: Tuple[int, int]) -> Optional[str]:
+    """Where the thumbnail of the current version of source_path goes (None if it does not exist)"""
+    source_path = os.path.abspath(source_path)
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return None
+    key = f"{source_path}|{st.st_size}|{st.st_mtime_ns}|{size[0]}x{size[1]}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(get_thumbnails_dir(), digest[:2], digest + ".png")
+
+
+def render_thumbnail(source_path: str, out_path: str, size: Tuple[int, int]):
+    """Render the first page of a PDF (or an image) to fit size, as PNG"""
+    import fitz  # PyMuPDF
+    with fitz.open(source_path) as doc:
+        if doc.page_count == 0:
+            raise ValueError(f"{source_path} has no pages")
+        page = doc.load_page(0)
+        scale = min(size[0] / page.rect.width, size[1] / page.rect.height)
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    pix.save(tmp_path, output="png")
+    os.replace(tmp_path, out_path)
+
+
+def get_thumbnail(source_path: str, size: Tuple[int, int], create: bool = True) -> Optional[str]:
+    """
+    Path of the cached thumbnail of source_path, rendering it if needed
+    (unless create is False). None if it cannot be made.
+    """
+    if not source_path or not source_path.lower().endswith(THUMBNAIL_SOURCES):
+        return None
+    path = thumbnail_path(source_path, size)
+    if path is None:
+        return None
+    if os.path.exists(path):
+        return path
+    if not create:
+        return None
+    try:
+        render_thumbnail(source_path, path, size)
+    except ImportError:
+        return None
+    except Exception as e:
+        print(f"[WARNING] Could not render thumbnail of {source_path}: {e}")
+        return None
+    return path
+
+
+def generate_project_thumbnails(project_name: str) -> Dict[str, Any]:
+    """
+    Render the thumbnails of a project's elevation drawings and chat photos.
+    Returns {"created", "cached", "failed": [paths]}.
+    """
+    import fitz  # noqa: F401  (fail early with ImportError instead of one failure per file)
+    from Project.elevation_registry import iter_elevations, load_project_folders
+    from Project.Elevations.chat_data_manager import ChatDataManager
+    sources = [(local_path, ELEVATION_THUMBNAIL_SIZE)
+               for _, _, local_path in iter_elevations(load_project_folders(project_name))]
+    photos_dir = ChatDataManager(project_name).photos_dir
+    for filename in sorted(os.listdir(photos_dir)):
+        sources.append((os.path.join(photos_dir, filename), PHOTO_THUMBNAIL_SIZE))
+    result = {"created": 0, "cached": 0, "failed": []}
+    for source_path, size in sources:
+        if not source_path or not source_path.lower().endswith(THUMBNAIL_SOURCES):
+            continue
+        if get_thumbnail(source_path, size, create=False):
+            result["cached"] += 1
+        elif get_thumbnail(source_path, size):
+            result["created"] += 1
+        else:
+            result["failed"].append(source_path)
+    return result
@@ -0,0 +1,136 @@
+"""
+Template catalog: one summary per template file for the TemplatesPage.
+
+storage/templates_catalog.json holds, for every templates/*.json file:
+
+    {"version": 1, "templates_dir": "<abs path of templates/>",
+     "templates": {"<template name>": {
+        "name", "extends", "statuses": 7, "materials": 5, "defects": 18,
+        "mtime": 1718000000.0, "size": 2048}}}
+
+It lives with the other user data in storage/, not in the tracked
+templates/ folder, and is ignored if it describes another templates folder.
+
+The templates page builds its cards from this instead of opening and
+parsing every template each time it is shown; a template's full data is
+only loaded (through the template registry) when its card is opened.
+list_templates checks each file's mtime/size with a directory scan and
+re-reads only the templates that changed. The template saver and the
+templates page keep it current with update_template / remove_template.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from .template_registry import MASTER_LIST_NAME, SECTIONS, EXTENDS_KEY, get_template_registry
+
+CATALOG_FILENAME = "templates_catalog.json"
+CATALOG_VERSION = 1
+
+_lock = threading.RLock()
+_catalog: Optional[Dict[str, Dict[str, Any]]] = None  # name -> summary, loaded on first use
+
+
+def get_catalog_path() -> str:
+    from Project.portfolio_catalog import get_projects_storage_dir
+    return os.path.join(get_projects_storage_dir(), CATALOG_FILENAME)
+
+
+def summarize_template(name: str, data: Dict[str, Any], mtime: float = 0.0, size: int = 0) -> Dict[str, Any]:
+    """Catalog entry of a template from its file data (counts don't depend on the parent)"""
+    summary = {"name": name, "extends": data.get(EXTENDS_KEY), "mtime": mtime, "size": size}
+    for section in SECTIONS:
+        summary[section] = len(data.get(section) or {})
+    return summary
+
+
+def _load() -> Dict[str, Dict[str, Any]]:
+    global _catalog
+    if _catalog is None:
+        _catalog = {}
+        try:
+            with open(get_catalog_path(), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if (stored.get("version") == CATALOG_VERSION
+                    and stored.get("templates_dir") == get_template_registry().templates_dir):
+                _catalog = stored.get("templates", {})
+        except (OSError, ValueError):
+            pass
+    return _catalog
+
+
+def _save():
+    path = get_catalog_path()
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CATALOG_VERSION, "templates_dir": get_template_registry().templates_dir,
+                       "templates": _catalog}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARNING] Could not save template catalog: {e}")
+
+
+def _stat(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime, st.st_size
+
+
+def list_templates(include_master: bool = False) -> List[Dict[str, Any]]:
+    """Summaries of the templates in templates/, sorted by name"""
+    templates_dir = get_template_registry().templates_dir
+    if not os.path.isdir(templates_dir):
+        return []
+    with _lock:
+        catalog = _load()
+        changed = False
+        seen = set()
+        with os.scandir(templates_dir) as entries:
+            for dir_entry in entries:
+                if not dir_entry.name.endswith('.json') or not dir_entry.is_file():
+                    continue
+                name = dir_entry.name[:-5]
+                seen.add(name)
+                st = dir_entry.stat()
+                summary = catalog.get(name)
+                if summary and summary.get("mtime") == st.st_mtime and summary.get("size") == st.st_size:
+                    continue
+                try:
+                    with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"[WARNING] Could not read template {name}: {e}")
+                    data = {}
+                catalog[name] = summarize_template(name, data, st.st_mtime, st.st_size)
+                changed = True
+        for name in [name for name in catalog if name not in seen]:
+            del catalog[name]
+            changed = True
+        if changed:
+            _save()
+        return [dict(catalog[name]) for name in sorted(catalog)
+                if include_master or name != MASTER_LIST_NAME]
+
+
+def update_template(name: str, data: Dict[str, Any]):
+    """Record a template that was just written to its file"""
+    path = get_template_registry().get_template_path(name)
+    st = _stat(path)
+    if st is None:
+        return
+    with _lock:
+        _load()[name] = summarize_template(name, data, *st)
+        _save()
+
+
+def remove_template(name: str):
+    """Forget a template whose file was deleted"""
+    with _lock:
+        if _load().pop(name, None) is not None:
+            _save()
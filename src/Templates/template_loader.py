@@ -5,6 +5,8 @@ import os
 import json
 from typing import Dict, List, Any, Optional
 
+from .template_registry import CompiledTemplate, DEFAULT_STATUS_COLOR, get_template_registry
+
 class TemplateLoader:
     """Loads and manages templates for categories, materials, defects, and statuses"""
     
@@ -13,31 +15,41 @@ class TemplateLoader:
             os.path.dirname(__file__), '..', '..', 'templates'
         ))
         self.current_template = None
-        self.template_data = None
+        self._compiled = None
+        # True when the current template comes from its file (follows edits to it)
+        self._from_file = False
+    
+    @property
+    def template_data(self) -> Optional[Dict[str, Any]]:
+        compiled = self._current()
+        return compiled.data if compiled else None
+    
+    @template_data.setter
+    def template_data(self, data: Optional[Dict[str, Any]]):
+        self._compiled = CompiledTemplate(self.current_template or "", data) if data is not None else None
+        self._from_file = False
+    
+    def _current(self) -> Optional[CompiledTemplate]:
+        """The compiled current template, picking up changes to its file"""
+        if self._from_file and self.current_template:
+            compiled = get_template_registry().get(self.current_template)
+            if compiled is not None:
+                self._compiled = compiled
+        return self._compiled
     
     def get_available_templates(self) -> List[str]:
         """Get list of available template names"""
-        templates = []
-        if os.path.exists(self.templates_dir):
-            for filename in os.listdir(self.templates_dir):
-                if filename.endswith('.json'):
-                    templates.append(filename[:-5])  # Remove .json extension
-        return templates
+        return get_template_registry().names()
     
     def load_template(self, template_name: str) -> bool:
         """Load a specific template"""
-        template_file = os.path.join(self.templates_dir, f"{template_name}.json")
-        if not os.path.exists(template_file):
-            return False
-        
-        try:
-            with open(template_file, 'r', encoding='utf-8') as f:
-                self.template_data = json.load(f)
-            self.current_template = template_name
-            return True
-        except Exception as e:
-            print(f"[ERROR] Failed to load template {template_name}: {e}")
+        compiled = get_template_registry().get(template_name)
+        if compiled is None:
             return False
+        self._compiled = compiled
+        self._from_file = True
+        self.current_template = template_name
+        return True
     
     def get_statuses(self) -> Dict[str, Dict[str, Any]]:
         """Get status options from current template"""
@@ -59,58 +71,60 @@ class TemplateLoader:
     
     def get_material_defects(self, material_name: str) -> List[str]:
         """Get defects associated with a specific material"""
-        materials = self.get_materials()
-        material_data = materials.get(material_name, {})
-        return material_data.get('defects', [])
+        compiled = self._current()
+        if not compiled:
+            return []
+        return list(compiled.material_defects.get(material_name, []))
     
     def get_status_color(self, status_name: str) -> str:
         """Get color for a specific status"""
-        statuses = self.get_statuses()
-        status_data = statuses.get(status_name, {})
-        return status_data.get('color', '#cccccc')
+        compiled = self._current()
+        if not compiled:
+            return DEFAULT_STATUS_COLOR
+        return compiled.status_colors.get(status_name, DEFAULT_STATUS_COLOR)
+    
+    def get_defect_severity(self, defect_name: str, default: str = "") -> str:
+        """Get severity of a defect from the current template, then the master list"""
+        compiled = self._current()
+        if compiled and defect_name in compiled.defect_severity:
+            return compiled.defect_severity[defect_name]
+        return get_template_registry().master().defect_severity.get(defect_name, default)
     
     def get_category_options_for_pin_dialog(self) -> Dict[str, List[str]]:
         """
         Get category options in the format expected by pin dialogs.
         Returns a dictionary with materials as keys and their defects as values.
         """
-        materials = self.get_materials()
-        category_options = {}
-        
-        for material_name, material_data in materials.items():
-            defects = material_data.get('defects', [])
-            category_options[material_name] = defects
+        compiled = self._current()
+        category_options = compiled.material_defects if compiled else {}
         
         # If no template is loaded, fall back to master list
         if not category_options:
-            category_options = self.get_master_list_categories()
+            category_options = get_template_registry().master().material_defects
         
-        return category_options
+        return dict(category_options)
     
     def get_status_options_for_pin_dialog(self) -> List[str]:
         """Get status options as a list for pin dialogs"""
-        statuses = self.get_statuses()
-        status_list = list(statuses.keys())
+        compiled = self._current()
+        status_list = compiled.status_options if compiled else []
         
         # If no template is loaded, fall back to master list
         if not status_list:
-            master_data = self.load_master_list()
-            status_list = list(master_data.get('statuses', {}).keys())
+            status_list = get_template_registry().master().status_options
         
-        return status_list
+        return list(status_list)
     
     def get_status_colors_dict(self) -> Dict[str, str]:
         """Get status colors in the format expected by the existing system"""
-        statuses = self.get_statuses()
-        colors = {}
-        for status_name, status_data in statuses.items():
-            colors[status_name] = status_data.get('color', '#cccccc')
+        compiled = self._current()
+        colors = compiled.status_colors if compiled else {}
         
         # If no template is loaded, fall back to master list
         if not colors:
-            colors = self.get_master_list_statuses()
+            colors = get_template_registry().master().status_colors
         
-        return colors
+        return dict(colors)
     
     def create_default_template(self, template_name: str) -> bool:
         """Create a default template with some basic categories"""
@@ -250,46 +264,26 @@ class TemplateLoader:
             with open(template_file, 'w', encoding='utf-8') as f:
                 json.dump(default_template, f, indent=2)
             
-            self.template_data = default_template
-            self.current_template = template_name
-            return True
+            get_template_registry().put(template_name, default_template)
+            return self.load_template(template_name)
         except Exception as e:
             print(f"[ERROR] Failed to create default template: {e}")
             return False
     
     def load_master_list(self) -> Dict[str, Any]:
-        """Load the master list data"""
-        master_file = os.path.join(self.templates_dir, 'master_list.json')
-        if os.path.exists(master_file):
-            try:
-                with open(master_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[ERROR] Failed to load master list: {e}")
-        return {'statuses': {}, 'materials': {}, 'defects': {}}
+        """Load the master list data (shared, do not modify)"""
+        master_data = get_template_registry().master().data
+        if not master_data:
+            return {'statuses': {}, 'materials': {}, 'defects': {}}
+        return master_data
     
     def get_master_list_categories(self) -> Dict[str, List[str]]:
         """Get category options from master list"""
-        master_data = self.load_master_list()
-        materials = master_data.get('materials', {})
-        category_options = {}
-        
-        for material_name, material_data in materials.items():
-            defects = material_data.get('defects', [])
-            category_options[material_name] = defects
-        
-        return category_options
+        return dict(get_template_registry().master().material_defects)
     
     def get_master_list_statuses(self) -> Dict[str, str]:
         """Get status colors from master list"""
-        master_data = self.load_master_list()
-        statuses = master_data.get('statuses', {})
-        colors = {}
-        
-        for status_name, status_data in statuses.items():
-            colors[status_name] = status_data.get('color', '#cccccc')
-        
-        return colors
+        return dict(get_template_registry().master().status_colors)
 
 # Global template loader instance
 template_loader = TemplateLoader()
@@ -1,5 +1,4 @@
-import os
-import json
+import copy
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSplitter,
     QTreeWidget, QTreeWidgetItem, QMessageBox, QInputDialog, QColorDialog,
@@ -9,6 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QColor, QIcon, QPixmap, QPainter
 from styles import DEFECTS_TREE_STYLE
+from .template_registry import get_template_registry
+from .template_saver import get_template_saver
 
 class MasterListSelectionDialog(QDialog):
     """Dialog for selecting items from the master list"""
@@ -986,14 +987,10 @@ class TemplateOverviewPage(QWidget):
     
     def load_master_list(self):
         """Load the master list of all available items"""
-        master_file = os.path.join(self.templates_dir, 'master_list.json')
-        if os.path.exists(master_file):
-            try:
-                with open(master_file, 'r', encoding='utf-8') as f:
-                    self.master_list_data = json.load(f)
-            except Exception as e:
-                print(f"[WARN] Could not load master list: {e}")
-                self.master_list_data = {'statuses': {}, 'materials': {}, 'defects': {}}
+        master_data = get_template_registry().master().data
+        if master_data:
+            # The dialogs copy entries out of it; keep the registry's copy untouched
+            self.master_list_data = copy.deepcopy(master_data)
         else:
             self.master_list_data = {'statuses': {}, 'materials': {}, 'defects': {}}
     
@@ -1004,7 +1001,7 @@ class TemplateOverviewPage(QWidget):
         header_layout = QHBoxLayout()
         
         back_btn = QPushButton("← Back to Templates")
-        back_btn.clicked.connect(self.back_to_templates.emit)
+        back_btn.clicked.connect(self.go_back)
         header_layout.addWidget(back_btn)
         
         header_layout.addStretch()
@@ -1552,21 +1549,35 @@ class TemplateOverviewPage(QWidget):
     
     def save_template(self):
         """Save the template to file with user feedback"""
-        if self.save_template_quietly():
+        if self.save_template_quietly() and self.flush_saves():
             QMessageBox.information(self, "Success", f"Template '{self.template_name}' saved successfully!")
     
     def save_template_quietly(self):
-        """Save the template to file without user feedback, returns success status"""
-        template_file = os.path.join(self.templates_dir, f"{self.template_name}.json")
-        
-        try:
-            with open(template_file, 'w', encoding='utf-8') as f:
-                json.dump(self.template_data, f, indent=2)
+        """Schedule saving the template (edits are coalesced and written in the background)"""
+        # Templates extending the master list only store what differs from it
+        file_data = get_template_registry().compact(self.template_data)
+        get_template_saver().schedule(self.template_name, file_data)
+        return True
+    
+    def flush_saves(self):
+        """Write the pending save of this template now, returns success status"""
+        saver = get_template_saver()
+        if saver.flush(self.template_name):
             return True
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save template: {e}")
-            return False
+        QMessageBox.critical(self, "Error", f"Failed to save template: {saver.last_error(self.template_name)}")
+        return False
+    
+    def go_back(self):
+        """Leave the page once its edits are on disk (or the user chose to leave without them)"""
+        if not self.flush_saves():
+            reply = QMessageBox.question(
+                self, "Unsaved Changes",
+                f"Template '{self.template_name}' could not be saved. Leave this page anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        self.back_to_templates.emit()
     
     def edit_template_defects(self):
         """Open dialog to edit (add/remove) defects in the template"""
@@ -0,0 +1,386 @@
+"""
+Process-wide registry of parsed templates (templates/*.json).
+
+Each template file is read once and compiled into a CompiledTemplate that
+holds the raw data plus the lookup tables the pin dialogs need (status
+options and colors, material -> defects, defect -> severity), so
+TemplateLoader answers from memory.
+
+Under Qt the registry watches the templates/ directory and its files with a
+QFileSystemWatcher and drops templates that change, so reads never touch
+disk. Without a QApplication (scripts, the CLI) each read checks the
+file's size/mtime instead. Code that writes a template calls put() (or
+remove()) right after saving so the new version is used immediately.
+
+A template can extend another one (normally the master list) and store only
+what differs from it:
+
+    {"extends": "master_list",
+     "statuses": {"Unsafe": {}, "Verified": {"color": "#00838f"}},
+     "materials": {"Stone": {"defects": ["Crack", "Spall"]}},
+     "defects": {"Crack": {}}}
+
+Each listed entry is a patch over the parent's entry of the same name
+({} takes it unchanged, a null value drops a key); entries the parent
+does not have are used as they are, and parent entries the template does not
+list are left out. Resolved templates are cached and only re-resolved when
+their file or a parent changes, which costs one pass over the template's own
+entries.
+
+Compiled templates are shared: treat their data and tables as read-only.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MASTER_LIST_NAME = "master_list"
+DEFAULT_STATUS_COLOR = "#cccccc"
+EXTENDS_KEY = "extends"
+SECTIONS = ("statuses", "materials", "defects")
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def resolve_template(raw: Dict[str, Any], parent_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Full template data from a template file's data and its parent's resolved data"""
+    if parent_data is None:
+        return raw
+    data = dict(raw)
+    for section in SECTIONS:
+        parent_entries = parent_data.get(section) or {}
+        entries = {}
+        for name, patch in (raw.get(section) or {}).items():
+            entry = dict(parent_entries.get(name) or {})
+            entry.update(patch or {})
+            entries[name] = {key: value for key, value in entry.items() if value is not None}
+        data[section] = entries
+    return data
+
+
+def compact_template(data: Dict[str, Any], parent_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of resolve_template: keep only what differs from the parent"""
+    raw = dict(data)
+    for section in SECTIONS:
+        parent_entries = parent_data.get(section) or {}
+        entries = {}
+        for name, entry in (data.get(section) or {}).items():
+            parent_entry = parent_entries.get(name)
+            if parent_entry is None:
+                entries[name] = entry
+                continue
+            patch = {key: value for key, value in entry.items() if parent_entry.get(key) != value}
+            patch.update({key: None for key in parent_entry if key not in entry})
+            entries[name] = patch
+        raw[section] = entries
+    return raw
+
+
+class CompiledTemplate:
+    """A template's resolved data plus lookup tables derived from it (read-only)"""
+
+    def __init__(self, name: str, data: Dict[str, Any], signature: Optional[Tuple[int, int]] = None,
+                 raw: Optional[Dict[str, Any]] = None, parent: Optional["CompiledTemplate"] = None):
+        self.name = name
+        self.data = data
+        self.signature = signature
+        # The file's own data and the parent it was resolved against
+        self.raw = raw if raw is not None else data
+        self.parent = parent
+        statuses = data.get("statuses") or {}
+        materials = data.get("materials") or {}
+        defects = data.get("defects") or {}
+        self.status_options: List[str] = list(statuses)
+        self.status_colors: Dict[str, str] = {
+            name: (info or {}).get("color", DEFAULT_STATUS_COLOR) for name, info in statuses.items()
+        }
+        self.material_defects: Dict[str, List[str]] = {
+            name: list((info or {}).get("defects", [])) for name, info in materials.items()
+        }
+        self.defect_severity: Dict[str, str] = {
+            name: (info or {}).get("severity", "") for name, info in defects.items()
+            if (info or {}).get("severity")
+        }
+
+    def is_empty(self) -> bool:
+        return not (self.data.get("statuses") or self.data.get("materials") or self.data.get("defects"))
+
+
+class TemplateRegistry:
+    """Compiled templates keyed by name (file name without .json)"""
+
+    def __init__(self, templates_dir: Optional[str] = None):
+        self.templates_dir = templates_dir or os.path.abspath(os.path.join(
+            os.path.dirname(__file__), '..', '..', 'templates'
+        ))
+        self._entries: Dict[str, CompiledTemplate] = {}
+        self._names: Optional[List[str]] = None
+        self._subscribers: List[Callable[[str], None]] = []
+        self._lock = threading.RLock()
+        self._watcher = None
+
+    def get_template_path(self, name: str) -> str:
+        return os.path.join(self.templates_dir, f"{name}.json")
+
+    # --- Reading ---
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        """The compiled (resolved) template, or None if there is no readable file for it"""
+        self._ensure_watcher()
+        return self._get(name, ())
+
+    def _get(self, name: str, children: Tuple[str, ...]) -> Optional[CompiledTemplate]:
+        if name in children:
+            print(f"[ERROR] Template {name} extends itself (via {' -> '.join(children)})")
+            return None
+        path = self.get_template_path(name)
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and self._watcher is None and entry.signature != _file_signature(path):
+            entry = None
+        if entry is None:
+            signature = _file_signature(path)
+            if signature is None:
+                return None
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+            except Exception as e:
+                print(f"[ERROR] Failed to load template {name}: {e}")
+                return None
+            self._watch(path)
+        else:
+            signature, raw = entry.signature, entry.raw
+        parent = self._resolve_parent(name, raw, children)
+        if entry is not None and entry.parent is parent:
+            return entry
+        entry = self._compile(name, raw, signature, parent)
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def _resolve_parent(self, name: str, raw: Dict[str, Any], children: Tuple[str, ...]) -> Optional[CompiledTemplate]:
+        parent_name = raw.get(EXTENDS_KEY)
+        if not parent_name:
+            return None
+        parent = self._get(parent_name, children + (name,))
+        if parent is None:
+            print(f"[WARNING] Template {name} extends missing template {parent_name}")
+        return parent
+
+    @staticmethod
+    def _compile(name: str, raw: Dict[str, Any], signature: Optional[Tuple[int, int]],
+                 parent: Optional[CompiledTemplate]) -> CompiledTemplate:
+        data = resolve_template(raw, parent.data if parent else None)
+        return CompiledTemplate(name, data, signature, raw, parent)
+
+    def master(self) -> CompiledTemplate:
+        """The master list (an empty template if there is none)"""
+        return self.get(MASTER_LIST_NAME) or CompiledTemplate(MASTER_LIST_NAME, {})
+
+    def names(self) -> List[str]:
+        """Names of the template files in templates/ (master_list included)"""
+        self._ensure_watcher()
+        with self._lock:
+            if self._names is not None and self._watcher is not None:
+                return list(self._names)
+        names = []
+        if os.path.exists(self.templates_dir):
+            names = sorted(filename[:-5] for filename in os.listdir(self.templates_dir)
+                           if filename.endswith('.json'))
+        with self._lock:
+            self._names = names
+        return list(names)
+
+    # --- Writers ---
+    def put(self, name: str, raw: Dict[str, Any]):
+        """
+        Use raw (what was just written to the template's file) for a template.
+        Called off the watcher's thread (by the template saver's worker), the
+        template is published on the watcher's thread, where subscribers run.
+        """
+        # Copy so later edits by the caller don't leak into the shared template
+        raw = json.loads(json.dumps(raw))
+        signature = _file_signature(self.get_template_path(name))
+        watcher = self._watcher
+        if watcher is not None and not watcher.on_own_thread():
+            watcher.request_put(name, raw, signature)
+            return
+        self._put(name, raw, signature)
+
+    def _put(self, name: str, raw: Dict[str, Any], signature: Optional[Tuple[int, int]]):
+        path = self.get_template_path(name)
+        parent = self._resolve_parent(name, raw, ())
+        entry = self._compile(name, raw, signature, parent)
+        with self._lock:
+            self._entries[name] = entry
+            if self._names is not None and name not in self._names:
+                self._names = sorted(self._names + [name])
+        self._watch(path)
+        self._notify(name)
+
+    def compact(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """What to write to the file of a template with (resolved) data"""
+        parent_name = data.get(EXTENDS_KEY)
+        parent = self.get(parent_name) if parent_name else None
+        if parent is None:
+            return data
+        return compact_template(data, parent.data)
+
+    def remove(self, name: str):
+        """Forget a template whose file was deleted"""
+        with self._lock:
+            self._entries.pop(name, None)
+            if self._names is not None and name in self._names:
+                self._names = [n for n in self._names if n != name]
+        self._notify(name)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop one template (or all) so the next read loads it from disk"""
+        with self._lock:
+            names = [name] if name is not None else list(self._entries)
+            for key in names:
+                self._entries.pop(key, None)
+            self._names = None
+        for key in names:
+            self._notify(key)
+
+    # --- Change notification ---
+    def subscribe(self, callback: Callable[[str], None]):
+        """Register callback(template_name), called when a template changes"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, name: str):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(name)
+            except Exception as e:
+                print(f"[ERROR] Template registry subscriber failed for {name}: {e}")
+        if self._watcher is not None:
+            self._watcher.changed.emit(name)
+
+    # --- Qt integration ---
+    def qt_watcher(self):
+        """The TemplateWatcher QObject (emits changed(name)), or None without a QApplication"""
+        self._ensure_watcher()
+        return self._watcher
+
+    def _ensure_watcher(self):
+        if self._watcher is not None:
+            return
+        try:
+            from PySide6.QtCore import QCoreApplication, QThread
+        except ImportError:
+            return
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() is not app.thread():
+            return  # the watcher is created on the GUI thread
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = _create_qt_watcher(self)
+                # Entries loaded before the watcher existed may be stale
+                self._entries = {name: entry for name, entry in self._entries.items()
+                                 if entry.signature == _file_signature(self.get_template_path(name))}
+                self._names = None
+                paths = [self.get_template_path(name) for name in self._entries]
+        for path in paths:
+            self._watch(path)
+
+    def _watch(self, path: str):
+        if self._watcher is not None:
+            self._watcher.watch(path)
+
+    def _file_changed(self, path: str):
+        """Called by the watcher: drop the template if its file really changed"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.signature == _file_signature(path):
+                return
+            del self._entries[name]
+        self._notify(name)
+
+    def _directory_changed(self):
+        """Called by the watcher when template files were added, removed or renamed"""
+        with self._lock:
+            self._names = None
+            names = list(self._entries)
+        for name in names:
+            self._file_changed(self.get_template_path(name))
+
+
+def _create_qt_watcher(registry: TemplateRegistry):
+    from PySide6.QtCore import QObject, QFileSystemWatcher, QThread, Qt, Signal
+
+    class TemplateWatcher(QObject):
+        """Watches templates/ for the registry; emits changed(template_name)"""
+        changed = Signal(str)
+        _put_requested = Signal(str, object, object)
+        _watch_requested = Signal(str)
+
+        def __init__(self):
+            super().__init__()
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(self._on_file_changed)
+            self.watcher.directoryChanged.connect(lambda path: registry._directory_changed())
+            if os.path.isdir(registry.templates_dir):
+                self.watcher.addPath(registry.templates_dir)
+            # Requests from other threads are handled on this object's thread
+            self._put_requested.connect(self._on_put_requested, Qt.QueuedConnection)
+            self._watch_requested.connect(self._add_path, Qt.QueuedConnection)
+
+        def on_own_thread(self) -> bool:
+            return QThread.currentThread() is self.thread()
+
+        def request_put(self, name: str, raw: Dict[str, Any], signature: Optional[Tuple[int, int]]):
+            self._put_requested.emit(name, raw, signature)
+
+        def _on_put_requested(self, name: str, raw: Dict[str, Any], signature: Optional[Tuple[int, int]]):
+            # A newer save of the template publishes itself; don't pair its file with older data
+            if signature == _file_signature(registry.get_template_path(name)):
+                registry._put(name, raw, signature)
+
+        def watch(self, path: str):
+            if self.on_own_thread():
+                self._add_path(path)
+            else:
+                self._watch_requested.emit(path)
+
+        def _add_path(self, path: str):
+            if os.path.exists(path) and path not in self.watcher.files():
+                self.watcher.addPath(path)
+
+        def _on_file_changed(self, path: str):
+            registry._file_changed(path)
+            # Files replaced by an atomic rename drop out of the watcher
+            self.watch(path)
+
+    return TemplateWatcher()
+
+
+# Global template registry instance
+template_registry = None
+_registry_lock = threading.Lock()
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the global template registry"""
+    global template_registry
+    with _registry_lock:
+        if template_registry is None:
+            template_registry = TemplateRegistry()
+        return template_registry
@@ -0,0 +1,139 @@
+"""
+Debounced, background saving of template files (templates/*.json).
+
+The template editors save after every add/edit/delete. Instead of
+rewriting the file each time, they schedule() the new contents: edits to
+the same template within SAVE_DELAY seconds are coalesced and only the
+latest version is written, atomically (tmp file + os.replace) on a worker
+thread. After writing, the saver publishes the new version to the template
+registry (which hands it to the GUI thread under Qt, see
+TemplateRegistry.put) and the template catalog.
+
+Pages call flush() when the user leaves them (and an explicit Save button
+flushes right away); pending saves are also flushed at interpreter exit.
+"""
+
+import os
+import json
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .template_registry import get_template_registry
+from .template_catalog import update_template
+
+SAVE_DELAY = 0.5  # seconds
+
+
+class TemplateSaveScheduler:
+    """Coalesces template saves and writes them on a worker thread"""
+
+    def __init__(self, delay: float = SAVE_DELAY):
+        self.delay = delay
+        self._pending: Dict[str, Tuple[Dict[str, Any], float]] = {}  # name -> (data, due time)
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Condition()
+        # Held while a save is taken from _pending and written, so writes of one template stay in order
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, name: str, data: Dict[str, Any]):
+        """Save data as template name after the debounce delay"""
+        # Snapshot now: the editors keep changing their dict after scheduling
+        snapshot = json.loads(json.dumps(data))
+        with self._lock:
+            self._pending[name] = (snapshot, time.monotonic() + self.delay)
+            self._errors.pop(name, None)
+            self._ensure_thread()
+            self._lock.notify()
+
+    def is_pending(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    def last_error(self, name: str) -> Optional[str]:
+        """Error of the last failed save of a template, if it failed"""
+        with self._lock:
+            return self._errors.get(name)
+
+    def errors(self) -> Dict[str, str]:
+        """Errors of the templates whose last save failed, by template name"""
+        with self._lock:
+            return dict(self._errors)
+
+    def flush(self, name: Optional[str] = None) -> bool:
+        """
+        Write the pending save of one template (or all) now, waiting for a
+        write in progress. Returns False if the last save of the template (or
+        of any template) failed (see last_error and errors).
+        """
+        with self._write_lock:
+            with self._lock:
+                names = [name] if name is not None else list(self._pending)
+                saves = [(key, self._pending.pop(key)[0]) for key in names if key in self._pending]
+            for key, data in saves:
+                self._write(key, data)
+        with self._lock:
+            if name is None:
+                return not self._errors
+            return name not in self._errors
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="template-saver", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._lock.wait()
+                now = time.monotonic()
+                due = min(due for _, due in self._pending.values())
+                if due > now:
+                    self._lock.wait(due - now)
+                    continue
+            with self._write_lock:
+                with self._lock:
+                    now = time.monotonic()
+                    saves = [(key, data) for key, (data, due) in self._pending.items() if due <= now]
+                    for key, _ in saves:
+                        del self._pending[key]
+                for key, data in saves:
+                    self._write(key, data)
+
+    def _write(self, name: str, data: Dict[str, Any]):
+        registry = get_template_registry()
+        path = registry.get_template_path(name)
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[ERROR] Failed to save template {name}: {e}")
+            with self._lock:
+                self._errors[name] = str(e)
+            return
+        registry.put(name, data)
+        update_template(name, data)
+
+    def pending_names(self) -> List[str]:
+        with self._lock:
+            return list(self._pending)
+
+
+# Global template saver instance
+template_saver = None
+_saver_lock = threading.Lock()
+
+def get_template_saver() -> TemplateSaveScheduler:
+    """Get the global template save scheduler"""
+    global template_saver
+    with _saver_lock:
+        if template_saver is None:
+            template_saver = TemplateSaveScheduler()
+            atexit.register(template_saver.flush)
+        return template_saver
@@ -1,4 +1,5 @@
 import os
+import copy
 import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QScrollArea, 
@@ -10,6 +11,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QPixmap, QPalette, QColor
 from .new_template_card import NewTemplateCard
+from .template_registry import MASTER_LIST_NAME, get_template_registry
+from .template_saver import get_template_saver
+from .template_catalog import list_templates, update_template, remove_template
 from styles import (
     DEFECTS_TREE_STYLE, EDITABLE_ITEM_CARD_STYLE, EDIT_DEFECTS_BUTTON_STYLE,
     MATERIAL_DESCRIPTION_STYLE, DEFECTS_COUNT_STYLE,
@@ -920,10 +924,11 @@ class TemplateCard(QFrame):
     template_deleted = Signal(str)   # Signal when template is deleted
     template_clicked = Signal(str, dict)  # Signal when template card is clicked for overview
     
-    def __init__(self, template_name, template_data=None, parent=None):
+    def __init__(self, template_name, summary=None, parent=None):
         super().__init__(parent)
         self.template_name = template_name
-        self.template_data = template_data or {}
+        # Catalog summary (entry counts); the template itself is loaded when the card is opened
+        self.summary = summary or {}
         
         # Set fixed size similar to ProjectCard
         self.setFixedSize(260, 200)
@@ -957,9 +962,9 @@ class TemplateCard(QFrame):
         layout.addWidget(name_label)
         
         # Template stats with icons
-        statuses_count = len(self.template_data.get('statuses', {}))
-        materials_count = len(self.template_data.get('materials', {}))
-        defects_count = len(self.template_data.get('defects', {}))
+        statuses_count = self.summary.get('statuses', 0)
+        materials_count = self.summary.get('materials', 0)
+        defects_count = self.summary.get('defects', 0)
         
         # Stats container
         stats_widget = QWidget()
@@ -1045,9 +1050,14 @@ class TemplateCard(QFrame):
                 super().mousePressEvent(event)
             else:
                 # Click on card itself - open template overview
-                self.template_clicked.emit(self.template_name, self.template_data)
+                self.template_clicked.emit(self.template_name, self.get_template_data())
         super().mousePressEvent(event)
     
+    def get_template_data(self):
+        """Resolved template data (shared registry data, copy before editing)"""
+        compiled = get_template_registry().get(self.template_name)
+        return compiled.data if compiled else {}
+    
     def delete_template(self):
         reply = QMessageBox.question(
             self, "Delete Template", 
@@ -1078,7 +1088,7 @@ class TemplatesPage(QWidget):
         header_layout = QHBoxLayout()
         
         back_btn = QPushButton("← Back to Home")
-        back_btn.clicked.connect(self.back_to_home.emit)
+        back_btn.clicked.connect(self.go_back)
         header_layout.addWidget(back_btn)
         
         header_layout.addStretch()
@@ -1117,60 +1127,47 @@ class TemplatesPage(QWidget):
     
     def refresh_template_cards_display(self):
         """Refresh the template cards display in grid layout"""
-        # Clear existing cards
-        while self.templates_grid_layout.count():
-            item = self.templates_grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
-        
+        summaries = {summary['name']: summary for summary in list_templates()}
+        
+        # Only build cards for new or changed templates
+        for template_name in list(self.template_cards):
+            card = self.template_cards[template_name]
+            if summaries.get(template_name) != card.summary:
+                self.templates_grid_layout.removeWidget(card)
+                card.setParent(None)
+                card.deleteLater()
+                del self.template_cards[template_name]
+        for template_name, summary in summaries.items():
+            if template_name not in self.template_cards:
+                card = TemplateCard(template_name, summary)
+                card.template_selected.connect(self.select_template)
+                card.template_deleted.connect(self.delete_template)
+                card.template_clicked.connect(self.open_template_overview_page)
+                self.template_cards[template_name] = card
+        
+        self._grid_columns = None
+        self.layout_template_cards()
+    
+    def layout_template_cards(self):
+        """Place the cards in the grid (only moves them when the column count changes)"""
         # Similar to homepage grid calculation
         grid_width = self.templates_grid_layout.geometry().width() or 800  # Default width
         card_width = 260 + 24  # Card width plus spacing
         columns = max(1, (grid_width // card_width))
+        if columns == self._grid_columns:
+            return
+        self._grid_columns = columns
         
-        # Start with index 0
-        idx = 0
-        
-        # Add "New Template" card first
-        new_card = NewTemplateCard()
-        new_card.create_template.connect(self.create_new_template)
-        row = idx // columns
-        col = idx % columns
-        self.templates_grid_layout.addWidget(new_card, row, col)
-        idx += 1
-        
-        # Add existing template cards
-        available_templates = self.get_available_templates()
-        for template_name in available_templates:
-            template_file = os.path.join(self.templates_dir, f"{template_name}.json")
-            template_data = {}
-            if os.path.exists(template_file):
-                try:
-                    with open(template_file, 'r') as f:
-                        template_data = json.load(f)
-                except:
-                    pass
-            
-            card = TemplateCard(template_name, template_data)
-            card.template_selected.connect(self.select_template)
-            card.template_deleted.connect(self.delete_template)
-            card.template_clicked.connect(self.open_template_overview_page)
-            
-            row = idx // columns
-            col = idx % columns
-            self.templates_grid_layout.addWidget(card, row, col)
-            idx += 1
+        # "New Template" card first, then the templates by name
+        cards = [self.new_template_card] + [self.template_cards[name] for name in sorted(self.template_cards)]
+        for card in cards:
+            self.templates_grid_layout.removeWidget(card)
+        for idx, card in enumerate(cards):
+            self.templates_grid_layout.addWidget(card, idx // columns, idx % columns)
     
     def get_available_templates(self):
         """Get list of available templates"""
-        templates = []
-        if os.path.exists(self.templates_dir):
-            for filename in os.listdir(self.templates_dir):
-                if filename.endswith('.json') and filename != 'master_list.json':
-                    templates.append(filename[:-5])  # Remove .json extension
-        return templates
-    
-
+        return [summary['name'] for summary in list_templates()]
     
     def delete_template(self, template_name):
         """Delete a template"""
@@ -1178,6 +1175,8 @@ class TemplatesPage(QWidget):
         if os.path.exists(template_file):
             try:
                 os.remove(template_file)
+                get_template_registry().remove(template_name)
+                remove_template(template_name)
                 self.refresh_template_cards_display()
                 QMessageBox.information(self, "Success", f"Template '{template_name}' deleted successfully!")
             except Exception as e:
@@ -1197,7 +1196,7 @@ class TemplatesPage(QWidget):
         """Refresh grid when window is resized"""
         super().resizeEvent(event)
         if hasattr(self, 'templates_grid_layout'):
-            self.refresh_template_cards_display()
+            self.layout_template_cards()
     
 
     
@@ -1206,23 +1205,17 @@ class TemplatesPage(QWidget):
             QMessageBox.warning(self, "Warning", "No master list data to save.")
             return
         
-        master_list_file = os.path.join(self.templates_dir, "master_list.json")
-        
-        try:
-            with open(master_list_file, 'w') as f:
-                json.dump(self.master_list_data, f, indent=2)
-            
+        self.save_master_list()
+        if self.flush_saves():
             QMessageBox.information(self, "Success", "Master list saved successfully!")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save master list: {e}")
     
     def create_new_template(self):
         """Create a new template"""
         name, ok = QInputDialog.getText(self, "New Template", "Template name:")
         if ok and name:
-            # Create empty template structure
+            # Create empty template structure, taking its entries from the master list
             template_data = {
+                'extends': MASTER_LIST_NAME,
                 'statuses': {},
                 'materials': {},
                 'defects': {}
@@ -1233,6 +1226,8 @@ class TemplatesPage(QWidget):
             try:
                 with open(template_file, 'w') as f:
                     json.dump(template_data, f, indent=2)
+                get_template_registry().put(name, template_data)
+                update_template(name, template_data)
                 
                 QMessageBox.information(self, "Success", f"Template '{name}' created successfully!")
                 
@@ -1284,6 +1279,12 @@ class TemplatesPage(QWidget):
         self.templates_grid_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
         grid_container.setLayout(self.templates_grid_layout)
         
+        # Cards are kept across refreshes and rebuilt only when their template changes
+        self.new_template_card = NewTemplateCard()
+        self.new_template_card.create_template.connect(self.create_new_template)
+        self.template_cards = {}
+        self._grid_columns = None
+        
         grid_outer_layout.addWidget(grid_container)
         scroll.setWidget(grid_outer)
         
@@ -1352,13 +1353,29 @@ class TemplatesPage(QWidget):
             self.save_master_list()  # Create default file
     
     def save_master_list(self):
-        """Save the master list to file"""
-        master_file = os.path.join(self.templates_dir, 'master_list.json')
-        try:
-            with open(master_file, 'w', encoding='utf-8') as f:
-                json.dump(self.master_list_data, f, indent=2)
-        except Exception as e:
-            print(f"[ERROR] Failed to save master list: {e}")
+        """Schedule saving the master list (edits are coalesced and written in the background)"""
+        get_template_saver().schedule(MASTER_LIST_NAME, self.master_list_data)
+    
+    def flush_saves(self):
+        """Write pending template saves now, returns success status"""
+        saver = get_template_saver()
+        if saver.flush():
+            return True
+        failed = "\n".join(f"{name}: {error}" for name, error in sorted(saver.errors().items()))
+        QMessageBox.critical(self, "Error", f"Failed to save templates:\n{failed}")
+        return False
+    
+    def go_back(self):
+        """Leave the page once its edits are on disk (or the user chose to leave without them)"""
+        if not self.flush_saves():
+            reply = QMessageBox.question(
+                self, "Unsaved Changes",
+                "Some templates could not be saved. Leave this page anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        self.back_to_home.emit()
     
     def add_master_item(self, item_type):
         """Add a new item to the master list"""
@@ -1453,4 +1470,7 @@ class TemplatesPage(QWidget):
     
     def open_template_overview_page(self, template_name, template_data):
         """Open the template overview page"""
-        self.open_template_overview.emit(template_name, template_data)
\ No newline at end of file
+        # The overview reads the master list from the registry, so it must be saved first
+        self.flush_saves()
+        # The card shows the registry's shared data; the overview edits its own copy
+        self.open_template_overview.emit(template_name, copy.deepcopy(template_data))
\ No newline at end of file
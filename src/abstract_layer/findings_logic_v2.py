@@ -7,6 +7,7 @@ import os
 import json
 from typing import List, Dict, Any, Optional
 from .storage_backend import storage
+from Project.models import point_xy, pos_to_dict, with_points
 
 def get_project_storage_path(project_name: str) -> str:
     """Get the storage path for a project (works with both local and S3)"""
@@ -46,37 +47,19 @@ def load_pins(project_name: str) -> List[Dict[str, Any]]:
         storage.save_json(pins_path, [])
         return []
     
-    # Convert pin positions to QPointF for UI use
-    try:
-        from PySide6.QtCore import QPointF
-        for pin in pins:
-            pos = pin.get('pos')
-            if isinstance(pos, dict) and 'x' in pos and 'y' in pos:
-                pin['pos'] = QPointF(pos['x'], pos['y'])
-    except ImportError:
-        pass
-    
-    return pins
+    return with_points(pins)
 
 def save_pins(pins: List[Dict[str, Any]], project_name: str) -> bool:
     """Save pins to storage (local or S3)"""
     if not project_name or not isinstance(project_name, str):
         raise ValueError("project_name must be a non-empty string.")
     
-    # Convert QPointF to dict for all pins before saving
+    # Store positions (Points, or QPointFs set by the viewer) as {'x', 'y'} dicts
     pins_to_save = []
     for pin in pins:
         pin_copy = pin.copy()
-        pos = pin_copy.get("pos")
-        
-        # Convert QPointF to dict if needed
-        try:
-            from PySide6.QtCore import QPointF
-            if isinstance(pos, QPointF):
-                pin_copy["pos"] = {"x": pos.x(), "y": pos.y()}
-        except ImportError:
-            pass
-        
+        if "pos" in pin_copy:
+            pin_copy["pos"] = pos_to_dict(pin_copy["pos"])
         pins_to_save.append(pin_copy)
     
     pins_path = get_pins_path(project_name)
@@ -114,15 +97,7 @@ def add_pin_to_master_findings(pin: Dict[str, Any], elevation_name: str = None,
     pin_pos = pin.get("pos")
     current_elevation = elevation_name or pin.get("elevation")
     
-    # Convert QPointF to comparable values
-    try:
-        from PySide6.QtCore import QPointF
-        if isinstance(pin_pos, QPointF):
-            pos_x, pos_y = pin_pos.x(), pin_pos.y()
-        else:
-            pos_x, pos_y = pin_pos.get("x", 0), pin_pos.get("y", 0)
-    except ImportError:
-        pos_x, pos_y = pin_pos.get("x", 0), pin_pos.get("y", 0)
+    pos_x, pos_y = point_xy(pin_pos)
     
     # Check for duplicates
     for existing_pin in pins:
@@ -130,11 +105,7 @@ def add_pin_to_master_findings(pin: Dict[str, Any], elevation_name: str = None,
         existing_elevation = existing_pin.get("elevation")
         
         try:
-            if isinstance(existing_pos, dict):
-                ex_x, ex_y = existing_pos.get("x", 0), existing_pos.get("y", 0)
-            else:
-                ex_x, ex_y = existing_pos.x(), existing_pos.y()
-                
+            ex_x, ex_y = point_xy(existing_pos)
             if (abs(ex_x - pos_x) < 1e-6 and abs(ex_y - pos_y) < 1e-6 and 
                 existing_elevation == current_elevation):
                 # Update existing pin
@@ -253,11 +224,10 @@ def migrate_to_s3():
 
 def switch_storage_backend(backend: str):
     """Switch storage backend"""
-    global storage
-    from .storage_backend import STORAGE_CONFIG, get_storage_backend
+    from .storage_backend import STORAGE_CONFIG
     
     STORAGE_CONFIG['backend'] = backend
-    storage = get_storage_backend()
+    storage.reset()
     print(f"Switched to {backend} storage backend")
 
 # Example usage:
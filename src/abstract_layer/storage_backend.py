@@ -5,7 +5,7 @@ Supports both local file storage and S3 (LocalStack/AWS) storage.
 
 import os
 import json
-import boto3
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import date
@@ -56,8 +56,14 @@ class LocalFileStorage(StorageBackend):
                     return [serialize_dates(item) for item in obj]
                 return obj
             
+            serialized = serialize_dates(data)
+            # Lists of records (pins, findings) can be large: write them compactly
+            is_records = isinstance(serialized, list) and all(isinstance(item, dict) for item in serialized)
             with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(serialize_dates(data), f, indent=2)
+                if is_records:
+                    json.dump(serialized, f, separators=(",", ":"))
+                else:
+                    json.dump(serialized, f, indent=2)
             return True
         except Exception as e:
             print(f"[ERROR] Failed to save {path}: {e}")
@@ -121,6 +127,7 @@ class S3Storage(StorageBackend):
                  aws_access_key_id: str = "test",
                  aws_secret_access_key: str = "test",
                  region_name: str = "us-east-1"):
+        import boto3  # imported here: only the S3 backend needs it
         self.bucket_name = bucket_name
         self.s3 = boto3.client(
             "s3",
@@ -258,5 +265,29 @@ def get_storage_backend() -> StorageBackend:
     else:
         raise ValueError(f"Unknown storage backend: {backend_type}")
 
+class _LazyStorage:
+    """
+    Stands in for the configured backend, which is created on first use
+    (the S3 backend checks its bucket over the network when created).
+    """
+    
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> StorageBackend:
+        with self._lock:
+            if self._backend is None:
+                self._backend = get_storage_backend()
+            return self._backend
+    
+    def reset(self):
+        """Drop the backend so the next use creates it from STORAGE_CONFIG again"""
+        with self._lock:
+            self._backend = None
+    
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
 # Global storage instance
-storage = get_storage_backend()
\ No newline at end of file
+storage = _LazyStorage()
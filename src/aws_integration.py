@@ -12,10 +12,12 @@ Provides unified AWS/S3 functionality with support for:
 
 import os
 import json
-import boto3
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Any
-from botocore.exceptions import ClientError, NoCredentialsError
+
+# boto3/botocore are imported when the S3 client is created: they take a
+# noticeable part of startup and most sessions never touch S3.
 
 class AWSManager:
     """Manages AWS S3 operations with environment-aware configuration"""
@@ -69,6 +71,7 @@ class AWSManager:
         env_config = self.config.get(self.current_env, {})
         
         try:
+            import boto3
             # Build S3 client parameters
             client_params = {
                 "aws_access_key_id": env_config.get("aws_access_key_id"),
@@ -99,6 +102,7 @@ class AWSManager:
         """Ensure the configured bucket exists"""
         if not self.s3_client:
             return False
+        from botocore.exceptions import ClientError
         
         try:
             self.s3_client.head_bucket(Bucket=self.bucket_name)
@@ -188,6 +192,7 @@ class AWSManager:
         if not self.s3_client:
             print("[ERROR] S3 client not initialized")
             return False
+        from botocore.exceptions import ClientError
         
         try:
             # Ensure local directory exists
@@ -249,6 +254,7 @@ class AWSManager:
         if not self.s3_client:
             print("[ERROR] S3 client not initialized")
             return None
+        from botocore.exceptions import ClientError
         
         try:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
@@ -265,29 +271,27 @@ class AWSManager:
             print(f"[ERROR] Failed to download JSON: {e}")
             return None
     
-    def list_objects(self, prefix: str = "") -> list:
+    def list_objects(self, prefix: str = "", with_etags: bool = False) -> list:
         """
         List objects in the bucket with optional prefix
         
         Args:
             prefix: Object key prefix to filter by
+            with_etags: Return (key, ETag) tuples instead of keys
             
         Returns:
-            List of object keys
+            List of object keys (all pages, not only the first 1000)
         """
         if not self.s3_client:
             print("[ERROR] S3 client not initialized")
             return []
         
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
+            paginator = self.s3_client.get_paginator('list_objects_v2')
             objects = []
-            if 'Contents' in response:
-                objects = [obj['Key'] for obj in response['Contents']]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    objects.append((obj['Key'], obj['ETag']) if with_etags else obj['Key'])
             
             print(f"[INFO] Found {len(objects)} objects with prefix '{prefix}'")
             return objects
@@ -343,37 +347,55 @@ class AWSManager:
         
         return status
 
-# Global AWS manager instance
-aws_manager = AWSManager()
+# Global AWS manager instance, created on first use (creating it checks the
+# bucket over the network)
+_aws_manager = None
+_aws_manager_lock = threading.Lock()
+
+def get_aws_manager() -> AWSManager:
+    """The shared AWSManager, created on first call"""
+    global _aws_manager
+    with _aws_manager_lock:
+        if _aws_manager is None:
+            _aws_manager = AWSManager()
+        return _aws_manager
+
+def __getattr__(name):
+    # Keeps `from aws_integration import aws_manager` working without
+    # creating the manager at import time
+    if name == "aws_manager":
+        return get_aws_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions
 def upload_master_findings(master_findings_path: str) -> bool:
     """Upload master findings to S3"""
-    return aws_manager.upload_file(master_findings_path, "master_findings.json")
+    return get_aws_manager().upload_file(master_findings_path, "master_findings.json")
 
 def download_master_findings(local_path: str) -> bool:
     """Download master findings from S3"""
-    return aws_manager.download_file("master_findings.json", local_path)
+    return get_aws_manager().download_file("master_findings.json", local_path)
 
 def switch_to_development():
     """Switch to development environment (LocalStack)"""
-    return aws_manager.switch_environment("development")
+    return get_aws_manager().switch_environment("development")
 
 def switch_to_staging():
     """Switch to staging environment"""
-    return aws_manager.switch_environment("staging")
+    return get_aws_manager().switch_environment("staging")
 
 def switch_to_production():
     """Switch to production environment"""
-    return aws_manager.switch_environment("production")
+    return get_aws_manager().switch_environment("production")
 
 def get_aws_status() -> Dict:
     """Get current AWS status"""
-    return aws_manager.get_status()
+    return get_aws_manager().get_status()
 
 if __name__ == "__main__":
     # Test AWS manager
     print("Testing AWS Manager...")
+    aws_manager = get_aws_manager()
     status = get_aws_status()
     for key, value in status.items():
         print(f"  {key}: {value}")
@@ -1,10 +1,10 @@
-import boto3
 import os
 
 def get_s3_client():
     """
     Returns a boto3 S3 client. Uses LocalStack if USE_LOCALSTACK=1 is set in the environment.
     """
+    import boto3  # deferred: boto3 is slow to import and only needed for uploads
     if os.environ.get('USE_LOCALSTACK') == '1':
         return boto3.client(
             's3',
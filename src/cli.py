@@ -0,0 +1,285 @@
+"""
+Command line tools for FacadeInspection projects (no GUI needed).
+
+    python cli.py import-pins <project> pins.csv [--elevation "North Elevation"]
+    python cli.py import-pins <project> pins.json --dry-run
+    python cli.py export-pins <project> pins.csv
+    python cli.py export-findings report.xlsx [--project <project> ...] [--chat] [--photos]
+    python cli.py report <project> report.pdf [--elevation-id <id> ...] [--workers N]
+    python cli.py list [--search text] [--sort open_findings] [--refresh]
+    python cli.py info <project> [--json]
+    python cli.py check (<project> ... | --all) [--jobs N]
+    python cli.py reindex (<project> ... | --all) [--jobs N]
+    python cli.py thumbnails (<project> ... | --all) [--jobs N]
+    python cli.py push (<project> ... | --all) [--force] [--jobs N]
+    python cli.py pull (<project> ... | --all) [--force] [--jobs N]
+
+Commands taking several projects process them in parallel worker processes
+(--jobs, default one per CPU; --jobs 1 to stay in one process). Nothing
+here imports Qt, so it runs on servers without a display.
+
+See Project/bulk_pins.py for the CSV columns / JSON keys.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+
+def cmd_import_pins(args):
+    from Project.Elevations.findings_logic import import_pins_from_file
+    result = import_pins_from_file(
+        args.project, args.file, fmt=args.format,
+        elevation_name=args.elevation, elevation_id=args.elevation_id,
+        create_findings=not args.no_findings, skip_duplicates=not args.allow_duplicates,
+        skip_invalid=args.skip_invalid, dry_run=args.dry_run,
+    )
+    for number, message in result["errors"]:
+        print(f"record {number}: {message}", file=sys.stderr)
+    if result["invalid"] > len(result["errors"]):
+        print(f"... and {result['invalid'] - len(result['errors'])} more invalid records", file=sys.stderr)
+    verb = "Would import" if args.dry_run else "Imported"
+    if result["invalid"] and not args.skip_invalid:
+        print(f"Nothing imported: {result['invalid']} invalid records (use --skip-invalid to import the rest)")
+        return 1
+    print(f"{verb} {result['imported']} pins ({result['skipped']} duplicates skipped, "
+          f"{result['invalid']} invalid)")
+    return 0
+
+
+def cmd_export_pins(args):
+    from Project.Elevations.findings_logic import export_pins_to_file
+    count = export_pins_to_file(args.project, args.file, fmt=args.format)
+    print(f"Exported {count} pins to {args.file}")
+    return 0
+
+
+def cmd_export_findings(args):
+    from Project.findings_export import export_findings
+    projects = args.project[0] if args.project and len(args.project) == 1 else args.project
+    count = export_findings(args.file, projects, fmt=args.format,
+                            include_chat=args.chat, include_photos=args.photos)
+    print(f"Exported {count} findings to {args.file}")
+    return 0
+
+
+def cmd_report(args):
+    from Project.report_generator import generate_report
+    result = generate_report(args.project, args.file, elevation_ids=args.elevation_id,
+                             include_photos=not args.no_photos, workers=args.workers)
+    print(f"Wrote {args.file}: {result['pages']} pages, {result['elevations']} elevations "
+          f"({result['rendered']} rendered, {result['cached']} from cache)")
+    for name in result["failed"]:
+        print(f"Left out elevation {name}: its drawing could not be rendered", file=sys.stderr)
+    return 1 if result["failed"] else 0
+
+
+def cmd_list(args):
+    from Project.portfolio_catalog import list_projects, refresh_catalog
+    if args.refresh:
+        refresh_catalog()
+    projects = list_projects(args.search or "", sort=args.sort, descending=args.sort != "name")
+    if args.json:
+        print(json.dumps(projects, indent=2))
+        return 0
+    for entry in projects:
+        print(f"{os.path.basename(entry['folder'])}\t{entry.get('name', '')}\t"
+              f"{entry.get('elevations', 0)} elevations\t{entry.get('findings', 0)} findings\t"
+              f"{entry.get('open_findings', 0)} open")
+    return 0
+
+
+def cmd_info(args):
+    from Project.maintenance import project_info
+    info = project_info(args.project)
+    if args.json:
+        print(json.dumps(info, indent=2, default=str))
+        return 0
+    print(f"{info['name']} ({args.project})")
+    print(f"  {info['elevations']} elevations, {info['findings']} findings, {info['open_findings']} open")
+    for status, count in sorted(info["by_status"].items()):
+        print(f"    {status}: {count}")
+    for elevation in info["elevation_list"]:
+        missing = "" if elevation["exists"] else "  (drawing missing)"
+        print(f"  elevation {elevation['name']} [{elevation['elevation_id']}]{missing}")
+    chat = info["chat"]
+    print(f"  chat: {chat.get('pins_with_chat', 0)} pins, {chat.get('total_text_messages', 0)} messages, "
+          f"{chat.get('total_photos', 0)} photos")
+    return 0
+
+
+def _projects(args):
+    from Project.maintenance import all_project_names
+    if args.all:
+        return all_project_names()
+    if not args.projects:
+        raise ValueError("Give project folder names or --all")
+    return args.projects
+
+
+def _run(args, func, report, update_catalog=False, **kwargs):
+    """Run func for the projects of args in parallel; report(project, result) returns False on problems"""
+    from Project.maintenance import run_for_projects
+    ok = True
+    for project, result, error in run_for_projects(func, _projects(args), workers=args.jobs,
+                                                   update_catalog=update_catalog, **kwargs):
+        if error is not None:
+            print(f"{project}: failed: {error}", file=sys.stderr)
+            ok = False
+        elif report(project, result) is False:
+            ok = False
+    return 0 if ok else 1
+
+
+def cmd_check(args):
+    from Project.maintenance import check_project
+
+    def report(project, result):
+        for message in result["errors"]:
+            print(f"{project}: error: {message}")
+        if args.warnings:
+            for message in result["warnings"]:
+                print(f"{project}: warning: {message}")
+        print(f"{project}: {len(result['errors'])} errors, {len(result['warnings'])} warnings")
+        return not result["errors"]
+    return _run(args, check_project, report)
+
+
+def cmd_reindex(args):
+    from Project.maintenance import reindex_project
+
+    def report(project, result):
+        print(f"{project}: reindexed {result['pins']} pins, {result['findings']} findings, "
+              f"{result['partitions']} elevation partitions")
+    return _run(args, reindex_project, report, update_catalog=True)
+
+
+def cmd_thumbnails(args):
+    from Project.thumbnails import generate_project_thumbnails
+
+    def report(project, result):
+        print(f"{project}: {result['created']} thumbnails created, {result['cached']} up to date")
+        for path in result["failed"]:
+            print(f"{project}: could not render {path}", file=sys.stderr)
+        return not result["failed"]
+    return _run(args, generate_project_thumbnails, report)
+
+
+def cmd_push(args):
+    from Project.maintenance import push_project
+
+    def report(project, result):
+        print(f"{project}: {result['uploaded']} files uploaded, {result['unchanged']} unchanged")
+        for relpath in result["failed"]:
+            print(f"{project}: could not upload {relpath}", file=sys.stderr)
+        return not result["failed"]
+    return _run(args, push_project, report, force=args.force)
+
+
+def cmd_pull(args):
+    from Project.maintenance import pull_project
+
+    def report(project, result):
+        print(f"{project}: {result['downloaded']} files downloaded, {result['unchanged']} unchanged")
+        for relpath in result["failed"]:
+            print(f"{project}: could not download {relpath}", file=sys.stderr)
+        return not result["failed"]
+    return _run(args, pull_project, report, update_catalog=True, force=args.force)
+
+
+def _add_projects_arguments(p):
+    p.add_argument("projects", nargs="*", help="Project folder names in storage/")
+    p.add_argument("--all", action="store_true", help="Every project in storage/")
+    p.add_argument("--jobs", type=int, help="Worker processes (default: one per CPU)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="FacadeInspection project tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import-pins", help="Import pins (and findings) from a CSV or JSON file")
+    p.add_argument("project", help="Project folder name in storage/")
+    p.add_argument("file", help="CSV, JSON array or JSON Lines file")
+    p.add_argument("--format", choices=("csv", "json"), help="Input format (default: from the file extension)")
+    p.add_argument("--elevation", help="Elevation name for records that do not give one")
+    p.add_argument("--elevation-id", help="Elevation id for records that do not give one")
+    p.add_argument("--no-findings", action="store_true", help="Only create pins, no findings")
+    p.add_argument("--allow-duplicates", action="store_true",
+                   help="Import records at the position of an existing pin")
+    p.add_argument("--skip-invalid", action="store_true", help="Import the valid records even if some are invalid")
+    p.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+    p.set_defaults(func=cmd_import_pins)
+
+    p = commands.add_parser("export-pins", help="Export a project's pins to CSV or JSON Lines")
+    p.add_argument("project", help="Project folder name in storage/")
+    p.add_argument("file", help="Output .csv or .json/.jsonl file")
+    p.add_argument("--format", choices=("csv", "json"), help="Output format (default: from the file extension)")
+    p.set_defaults(func=cmd_export_pins)
+
+    p = commands.add_parser("export-findings", help="Export findings to CSV or XLSX")
+    p.add_argument("file", help="Output .csv or .xlsx file")
+    p.add_argument("--project", action="append",
+                   help="Project folder name (repeat for several; default: every project)")
+    p.add_argument("--format", choices=("csv", "xlsx"), help="Output format (default: from the file extension)")
+    p.add_argument("--chat", action="store_true", help="Add chat message counts and the latest comment")
+    p.add_argument("--photos", action="store_true", help="Add photo references")
+    p.set_defaults(func=cmd_export_findings)
+
+    p = commands.add_parser("report", help="Write the PDF inspection report of a project")
+    p.add_argument("project", help="Project folder name in storage/")
+    p.add_argument("file", help="Output .pdf file")
+    p.add_argument("--elevation-id", action="append", help="Only this elevation (repeat for several)")
+    p.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    p.add_argument("--no-photos", action="store_true", help="Leave out the photo pages")
+    p.set_defaults(func=cmd_report)
+
+    p = commands.add_parser("list", help="List the projects in the portfolio catalog")
+    p.add_argument("--search", help="Only projects whose name or code contains this")
+    p.add_argument("--sort", default="name",
+                   choices=("name", "last_modified", "open_findings", "findings", "elevations"))
+    p.add_argument("--refresh", action="store_true", help="Rescan storage/ first")
+    p.add_argument("--json", action="store_true", help="Print the catalog entries as JSON")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("info", help="Show a project's elevations, finding counts and chat stats")
+    p.add_argument("project", help="Project folder name in storage/")
+    p.add_argument("--json", action="store_true", help="Print as JSON")
+    p.set_defaults(func=cmd_info)
+
+    p = commands.add_parser("check", help="Check projects for broken references")
+    _add_projects_arguments(p)
+    p.add_argument("--warnings", action="store_true", help="Also list warnings (orphaned chat, missing photos)")
+    p.set_defaults(func=cmd_check)
+
+    p = commands.add_parser("reindex", help="Rebuild partitions, counts and search indexes")
+    _add_projects_arguments(p)
+    p.set_defaults(func=cmd_reindex)
+
+    p = commands.add_parser("thumbnails", help="Pre-render elevation and photo thumbnails")
+    _add_projects_arguments(p)
+    p.set_defaults(func=cmd_thumbnails)
+
+    p = commands.add_parser("push", help="Upload projects to S3")
+    _add_projects_arguments(p)
+    p.add_argument("--force", action="store_true", help="Upload every file, not only changed ones")
+    p.set_defaults(func=cmd_push)
+
+    p = commands.add_parser("pull", help="Download projects from S3")
+    _add_projects_arguments(p)
+    p.add_argument("--force", action="store_true", help="Download every file, not only changed ones")
+    p.set_defaults(func=cmd_pull)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError, RuntimeError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
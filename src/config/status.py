@@ -13,5 +13,15 @@ STATUS_COLORS = {
     "Verified": "#81d4fa"                 # Light Blue
 }
 
+# Color of pins whose status is missing or unknown (PDFPinViewer, PDF reports)
+PIN_FALLBACK_COLOR = "#FF4500"  # Orange-red
+
+def get_status_color(status, default=PIN_FALLBACK_COLOR):
+    """Pin color for a status"""
+    return STATUS_COLORS.get(status, default)
+
 # To get a list of all statuses:
 STATUS_OPTIONS = list(STATUS_COLORS.keys())
+
+# Statuses that count as closed; every other status is an open finding
+CLOSED_STATUSES = ["Completed Before Last Week", "Completed Last Week", "Verified"]
@@ -1,6 +1,51 @@
 from PySide6.QtWidgets import QLayout, QSizePolicy, QWidgetItem
 from PySide6.QtCore import Qt, QPoint, QRect, QSize
 
+def flow_geometry(sizes, rect, spacing):
+    """
+    Lay out items of the given sizes left to right, wrapping to a new line when
+    the next item would pass rect's right edge.
+    Returns (list of QRect, height used from rect.y()).
+    """
+    x = rect.x()
+    y = rect.y()
+    lineHeight = 0
+    rects = []
+    for size in sizes:
+        nextX = x + size.width() + spacing
+        if nextX - spacing > rect.right() + 1 and lineHeight > 0:
+            x = rect.x()
+            y = y + lineHeight + spacing
+            nextX = x + size.width() + spacing
+            lineHeight = 0
+        rects.append(QRect(QPoint(x, y), size))
+        x = nextX
+        lineHeight = max(lineHeight, size.height())
+    return rects, y + lineHeight - rect.y()
+
+
+def uniform_flow_columns(width, item_width, spacing):
+    """Items per line when flow_geometry lays out equally sized items in width"""
+    if width < item_width:
+        return 1
+    return (width - item_width) // (item_width + spacing) + 1
+
+
+def uniform_flow_rect(index, columns, item_size, spacing, origin=QPoint(0, 0)):
+    """Rect of item index when flow_geometry lays out equally sized items in columns"""
+    row, col = divmod(index, columns)
+    return QRect(QPoint(origin.x() + col * (item_size.width() + spacing),
+                        origin.y() + row * (item_size.height() + spacing)), item_size)
+
+
+def uniform_flow_height(count, columns, item_height, spacing):
+    """Height flow_geometry uses for count equally sized items in columns"""
+    if count <= 0:
+        return 0
+    rows = (count + columns - 1) // columns
+    return rows * item_height + (rows - 1) * spacing
+
+
 class FlowLayout(QLayout):
     def __init__(self, parent=None, margin=0, spacing=-1):
         super().__init__(parent)
@@ -50,35 +95,23 @@ class FlowLayout(QLayout):
         return size
 
     def doLayout(self, rect, testOnly):
-        x = rect.x()
-        y = rect.y()
-        lineHeight = 0
         left, top, right, bottom = self.getContentsMargins()
         effective_rect = rect.adjusted(+left, +top, -right, -bottom)
-        x = effective_rect.x()
-        y = effective_rect.y()
-        maxWidth = effective_rect.width()
+        space = self.spacing() if self._spacing < 0 else self._spacing
 
+        items = []
         for item in self.itemList:
             wid = item.widget()
             if wid is not None and not wid.isVisible():
                 continue
-            spaceX = self.spacing() if self._spacing < 0 else self._spacing
-            spaceY = self.spacing() if self._spacing < 0 else self._spacing
-            nextX = x + item.sizeHint().width() + spaceX
-            if nextX - spaceX > effective_rect.right() + 1 and lineHeight > 0:
-                x = effective_rect.x()
-                y = y + lineHeight + spaceY
-                nextX = x + item.sizeHint().width() + spaceX
-                lineHeight = 0
-
-            if not testOnly:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
-
-            x = nextX
-            lineHeight = max(lineHeight, item.sizeHint().height())
-
-        return y + lineHeight - rect.y() + bottom
+            items.append(item)
+
+        rects, height = flow_geometry([item.sizeHint() for item in items], effective_rect, space)
+        if not testOnly:
+            for item, item_rect in zip(items, rects):
+                item.setGeometry(item_rect)
+
+        return effective_rect.y() + height - rect.y() + bottom
 
     def addWidget(self, widget):
         self.addItem(QWidgetItem(widget))
\ No newline at end of file
@@ -1,15 +1,22 @@
 
 
 print("[main.py] Top of file reached")
-import boto3
-from botocore.exceptions import NoCredentialsError, ClientError
+import sys
+import threading
+import startup_profile
+
+# Must run before the app modules are imported so their imports are timed
+startup_profile.enable_from_argv(sys.argv)
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from mainwindow import MainWindow
-import sys
 
 # --- LocalStack S3 connection test ---
 def test_localstack_s3():
     print("[main.py] Testing LocalStack S3 connection...")
+    import boto3
+    from botocore.exceptions import NoCredentialsError, ClientError
     s3 = boto3.client('s3', endpoint_url='http://localhost:4566')
     bucket_name = 'test-bucket'
     try:
@@ -31,16 +38,33 @@ def test_localstack_s3():
         print(f"S3 test error: {e}")
 
 
+def run_network_probes():
+    """S3 checks that used to block startup; runs on a background thread"""
+    with startup_profile.phase("LocalStack probe"):
+        test_localstack_s3()
+    with startup_profile.phase("AWS manager"):
+        from aws_integration import get_aws_manager
+        get_aws_manager()
+
+
+def on_first_paint():
+    startup_profile.report()
+    threading.Thread(target=run_network_probes, name="network-probes", daemon=True).start()
+
 
 def main():
     print("[main.py] main() called")
-    test_localstack_s3()  # Test S3 connection to LocalStack
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    with startup_profile.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with startup_profile.phase("MainWindow"):
+        window = MainWindow()
     print("[main.py] MainWindow created")
-    window.show()
+    with startup_profile.phase("show"):
+        window.show()
     print("[main.py] window.show() called")
+    # Queued behind the show/paint events: network checks start once the window is up
+    QTimer.singleShot(0, on_first_paint)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,156 @@
+"""
+Startup timing for the FacadeInspection app.
+
+Run with FACADE_STARTUP_PROFILE=1 (or pass --profile-startup to main.py) to
+print, once the main window has painted, how long each module took to import
+and how long each startup step took:
+
+    [startup] first paint after 412.3 ms
+    [startup] steps:       QApplication 38.1 ms, MainWindow 201.7 ms, ...
+    [startup] imports (self / cumulative ms):
+        HomePageFolder.homepage        4.2   180.9
+        ...
+
+Import times come from a meta path finder that wraps the loader of every
+module imported after enable(); "self" leaves out the time spent importing
+the modules it imports in turn. Steps are timed with `with phase(name):`.
+Both are no-ops unless profiling is enabled.
+"""
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+ENV_VAR = "FACADE_STARTUP_PROFILE"
+CLI_FLAG = "--profile-startup"
+REPORT_LIMIT = 25
+
+_start = time.perf_counter()
+_enabled = False
+_lock = threading.Lock()
+_imports = []  # (module name, cumulative seconds, self seconds)
+_phases = []  # (step name, seconds)
+_local = threading.local()  # per-thread stack of nested import timings
+
+
+def _child_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _TimingLoader:
+    """Wraps a loader to time exec_module; everything else is delegated"""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create is not None else None
+
+    def exec_module(self, module):
+        stack = _child_stack()
+        children = [0.0]
+        stack.append(children)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            with _lock:
+                _imports.append((module.__name__, elapsed, elapsed - children[0]))
+            # Put the real loader back so nothing else sees the wrapper
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder:
+    """Meta path finder that asks the other finders and wraps the loader they return"""
+
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader)
+            return spec
+        return None
+
+
+def enable():
+    """Start timing imports and phases"""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    sys.meta_path.insert(0, _TimingFinder)
+
+
+def enable_from_argv(argv=None) -> bool:
+    """
+    Enable profiling if ENV_VAR is set or CLI_FLAG is in argv (the flag is
+    removed from argv). Returns whether profiling is on.
+    """
+    argv = sys.argv if argv is None else argv
+    if CLI_FLAG in argv:
+        argv.remove(CLI_FLAG)
+        enable()
+    elif os.environ.get(ENV_VAR, "").strip() not in ("", "0"):
+        enable()
+    return _enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def phase(name: str):
+    """Time a startup step (no-op unless enabled)"""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _phases.append((name, time.perf_counter() - start))
+
+
+def report(label: str = "first paint", limit: int = REPORT_LIMIT):
+    """Print the timings collected so far, slowest imports first"""
+    if not _enabled:
+        return
+    with _lock:
+        imports = sorted(_imports, key=lambda item: item[2], reverse=True)
+        phases = list(_phases)
+    print(f"[startup] {label} after {(time.perf_counter() - _start) * 1000:.1f} ms")
+    if phases:
+        steps = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in phases)
+        print(f"[startup] steps: {steps}")
+    if imports:
+        total = sum(item[2] for item in imports)
+        print(f"[startup] {len(imports)} modules imported in {total * 1000:.1f} ms "
+              f"(self / cumulative ms, slowest {min(limit, len(imports))}):")
+        width = max(len(name) for name, _, _ in imports[:limit])
+        for name, cumulative, own in imports[:limit]:
+            print(f"    {name:<{width}} {own * 1000:8.1f} {cumulative * 1000:8.1f}")
@@ -138,6 +138,14 @@ QScrollArea {
 }
 """
 
+FINDINGS_LIST_VIEW_STYLE = """
+QListView {
+    border: none;
+    background-color: transparent;
+    outline: none;
+}
+"""
+
 FINDINGS_NEW_TASK_BTN_STYLE = """
 QPushButton {
     color: #888; 